@@ -0,0 +1,38 @@
+"""
+과거 봉 일괄 다운로드 → data/candles (CandleStore)
+
+    python backfill.py --markets KRW-BTC KRW-ETH --interval minute1 --start 2023-01-01
+    (중단 후 같은 명령을 다시 실행하면 이어서 받고, 이미 있는 구간은 건너뜀)
+"""
+import argparse
+import time
+from utils.backfill import backfill_markets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Download historical Upbit candles into the local candle store")
+    parser.add_argument("--markets", nargs="+", default=["KRW-BTC"])
+    parser.add_argument("--interval", default="minute1")
+    parser.add_argument("--start", required=True, help="KST, e.g. 2023-01-01 or '2023-01-01 09:00'")
+    parser.add_argument("--end", help="KST, default: up to the candle in progress")
+    parser.add_argument("--root", default="data/candles")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent page requests per market")
+    parser.add_argument("--rate", type=float, default=10, help="requests per second")
+    args = parser.parse_args()
+
+    started = time.time()
+
+    def progress(market, interval, state):
+        print(f"\r[{market} {interval}] cursor {time.strftime('%Y-%m-%d %H:%M', time.gmtime(state['cursor']))} UTC",
+              end="", flush=True)
+
+    rows = backfill_markets(args.markets, args.interval, args.start, args.end, root=args.root,
+                            workers=args.workers, rate=args.rate, progress=progress)
+    print()
+    for market, count in rows.items():
+        print(f"{market:<10} {args.interval}: {count:,} candles")
+    print(f"Done in {time.time() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,55 @@
+import numpy as np
 import pandas as pd
 from strategies.base import Strategy
+from utils.ledger import PositionLedger
+import config
+
+ENGINES = ("loop", "vectorized")
 
 class Backtester:
     def __init__(self, strategy: Strategy, df: pd.DataFrame, initial_cash: float = 1_000_000,
-                 fee_rate: float = 0.0005):
+                 fee_rate: float = 0.0005, engine: str = "loop", indicator_cache=None, warmup: int = 0,
+                 copy: bool = True):
+        """
+        engine="loop"은 봉마다 should_buy/should_sell을 호출하고,
+        engine="vectorized"는 strategy.compute_signals()로 신호를 한 번에 계산한 뒤 배열 루프로 체결만 처리한다.
+        indicator_cache(IndicatorCache)는 vectorized 엔진의 지표 계산에 공유된다.
+        warmup: 앞쪽 봉 개수 — 지표 계산에만 쓰고 매매와 성과 지표에서는 제외 (워크포워드 검증 구간 앞에 붙인 학습 구간 등)
+        copy: False면 df를 복사하지 않고 그대로 읽기만 함 (공유 메모리 등 읽기 전용 프레임, 백테스트 중 df를 바꾸지 않아야 함)
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine: {engine}")
+        if not 0 <= warmup < len(df):
+            raise ValueError(f"warmup must be in [0, {len(df)}): {warmup}")
+        self.warmup = warmup
         self.strategy = strategy
-        self.df = df.copy()
+        self.df = df.copy() if copy else df
         self.initial_cash = initial_cash
         self.cash = initial_cash
         self.position = 0.0  # BTC 보유량
+        self.ledger = PositionLedger()
         self.fee_rate = fee_rate
         self.trade_log = []
+        self.engine = engine
+        self.indicator_cache = indicator_cache
+        # 체결이 일어난 봉과 체결 직후의 현금/보유량 (봉별 평가금액 곡선 계산용)
+        self.trade_bars = []
+        self.cash_after = []
+        self.position_after = []
 
     def run(self):
-        for i in range(len(self.df)):
+        if self.engine == "vectorized":
+            return self._run_vectorized()
+        return self._run_loop()
+
+    def _run_loop(self):
+        for i in range(self.warmup, len(self.df)):
             window = self.df.iloc[:i+1]
             current_price = self.df.iloc[i]['close']
 
             context = {
                 "current_price": current_price,
-                "avg_buy_price": self._get_avg_buy_price(),
+                "avg_buy_price": self.ledger.avg_price,
                 "btc_balance": self.position
             }
 
@@ -30,6 +60,7 @@ class Backtester:
                 proceeds = amount_btc * current_price * (1 - self.fee_rate)
                 self.cash += proceeds
                 self.position -= amount_btc
+                self.ledger.sell(current_price, amount_btc, amount_btc * current_price * self.fee_rate)
                 self._log_trade(i, "SELL", current_price, amount_btc, reason)
                 continue
 
@@ -41,19 +72,64 @@ class Backtester:
                 amount_btc = (amount_krw * (1 - self.fee_rate)) / current_price
                 self.cash -= amount_krw
                 self.position += amount_btc
+                self.ledger.buy(current_price, amount_btc, amount_krw * self.fee_rate)
                 self._log_trade(i, "BUY", current_price, amount_btc, "strategy_signal")
 
         return self._summary()
 
-    def _get_avg_buy_price(self):
-        buys = [t for t in self.trade_log if t['type'] == 'BUY']
-        total_cost = sum(t['price'] * t['amount'] for t in buys)
-        total_volume = sum(t['amount'] for t in buys)
-        if total_volume == 0:
-            return 0.0
-        return total_cost / total_volume
+    def _run_vectorized(self):
+        signals = self.strategy.compute_signals(self.df, cache=self.indicator_cache)
+        closes = self.df["close"].to_numpy(dtype=float).tolist()
+        buy = signals["buy"].tolist()
+        buy_strength = signals["buy_strength"].tolist()
+        sell = signals["sell"].tolist()
+        sell_strength = signals["sell_strength"].tolist()
+        stop_loss = signals["stop_loss"].tolist()
+
+        profit_threshold = config.PROFIT_THRESHOLD
+        min_profit = config.MIN_PROFIT_TO_SELL
+        fee_rate = self.fee_rate
+        ledger = self.ledger
+
+        for i in range(self.warmup, len(closes)):
+            current_price = closes[i]
+            # SELL — should_sell과 같은 순서: 익절 → 급락 손절 → 전략 신호
+            if self.position > 0:
+                avg_buy_price = ledger.avg_price
+                profit = ((current_price - avg_buy_price) / avg_buy_price * 100) if avg_buy_price > 0 else 0
+                reason = None
+                if profit >= profit_threshold:
+                    if profit >= min_profit:
+                        reason, strength = "take_profit", 1.0
+                elif stop_loss[i]:
+                    reason, strength = "sharp_decline", 1.0
+                elif sell[i] and profit >= min_profit:
+                    reason, strength = "strategy_signal", sell_strength[i]
+
+                if reason is not None:
+                    amount_btc = self.strategy.sell_amount(self.position, current_price, strength)
+                    self.cash += amount_btc * current_price * (1 - fee_rate)
+                    self.position -= amount_btc
+                    ledger.sell(current_price, amount_btc, amount_btc * current_price * fee_rate)
+                    self._log_trade(i, "SELL", current_price, amount_btc, reason)
+                    continue
+
+            # BUY
+            if buy[i] and self.cash > 0:
+                amount_krw = self.strategy.buy_amount(self.cash, current_price, buy_strength[i])
+                amount_krw = min(amount_krw, self.cash)
+                amount_btc = (amount_krw * (1 - fee_rate)) / current_price
+                self.cash -= amount_krw
+                self.position += amount_btc
+                ledger.buy(current_price, amount_btc, amount_krw * fee_rate)
+                self._log_trade(i, "BUY", current_price, amount_btc, "strategy_signal")
+
+        return self._summary()
 
     def _log_trade(self, idx, trade_type, price, amount, reason):
+        self.trade_bars.append(idx)
+        self.cash_after.append(self.cash)
+        self.position_after.append(self.position)
         self.trade_log.append({
             "timestamp": self.df.index[idx],
             "type": trade_type,
@@ -62,19 +138,41 @@ class Backtester:
             "reason": reason
         })
 
+    def equity_arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        봉 마감 시점의 현금/보유량 배열 (체결이 없는 봉은 직전 값 유지)
+        """
+        n = len(self.df)
+        bars = np.asarray(self.trade_bars, dtype=np.int64)
+        last_trade = np.full(n, -1, dtype=np.int64)
+        last_trade[bars] = np.arange(len(bars))
+        last_trade = np.maximum.accumulate(last_trade)
+
+        cash = np.concatenate(([self.initial_cash], self.cash_after))[last_trade + 1]
+        position = np.concatenate(([0.0], self.position_after))[last_trade + 1]
+        return cash, position
+
     def _summary(self):
-        from backtest.metrics import compute_metrics
+        from backtest.metrics import compute_equity_metrics, infer_periods_per_year
 
         final_price = self.df.iloc[-1]['close']
         total_value = self.cash + self.position * final_price
         profit = total_value - self.initial_cash
         roi = (profit / self.initial_cash) * 100
 
-        metrics = compute_metrics(self.trade_log, self.initial_cash, final_price)
+        # warmup 구간은 매매가 없으므로 평가 구간만 잘라서 계산
+        cash, position = self.equity_arrays()
+        scored = self.df.iloc[self.warmup:]
+        low = scored["low"].to_numpy(dtype=float) if "low" in scored else None
+        metrics = compute_equity_metrics(scored["close"].to_numpy(dtype=float), cash[self.warmup:],
+                                         position[self.warmup:], self.initial_cash, low=low,
+                                         periods_per_year=infer_periods_per_year(scored.index))
         metrics.update({
             "final_value": round(total_value, 2),
             "profit": round(profit, 2),
             "roi_percent": round(roi, 2),
+            "realized_pnl": round(self.ledger.realized_pnl, 2),
+            "fees": round(self.ledger.fees, 2),
             "num_trades": len(self.trade_log),
             "trade_log": self.trade_log
         })
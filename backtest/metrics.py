@@ -1,46 +1,133 @@
+import numpy as np
 import pandas as pd
 
+SECONDS_PER_YEAR = 365 * 24 * 60 * 60  # 코인 시장은 24시간/365일
+
 def compute_metrics(trade_log: list, initial_cash: float, final_price: float):
-    df = pd.DataFrame(trade_log)
-    if df.empty:
+    if len(trade_log) == 0:
         return {
             "mdd_percent": 0.0,
             "win_rate_percent": 0.0
         }
 
-    equity_curve = []
-    cash = initial_cash
-    btc = 0.0
-
-    for _, row in df.iterrows():
-        if row['type'] == 'BUY':
-            cash -= row['price'] * row['amount']
-            btc += row['amount']
-        else:
-            cash += row['price'] * row['amount']
-            btc -= row['amount']
-        total = cash + btc * final_price
-        equity_curve.append(total)
-
-    equity_series = pd.Series(equity_curve)
-    peak = equity_series.cummax()
-    drawdown = (equity_series - peak) / peak
-    mdd = drawdown.min() * 100
-
-    # 승률 계산
-    wins = 0
-    total = 0
-    for i in range(1, len(df)):
-        if df.iloc[i]['type'] == 'SELL' and df.iloc[i - 1]['type'] == 'BUY':
-            buy_price = df.iloc[i - 1]['price']
-            sell_price = df.iloc[i]['price']
-            if sell_price > buy_price:
-                wins += 1
-            total += 1
+    df = pd.DataFrame(trade_log)
+    is_buy = (df['type'] == 'BUY').to_numpy()
+    price = df['price'].to_numpy(dtype=float)
+    amount = df['amount'].to_numpy(dtype=float)
+    notional = price * amount
 
+    # 체결 시점마다의 평가금액 (최종가 기준)
+    cash = np.cumsum(np.concatenate(([initial_cash], np.where(is_buy, -notional, notional))))[1:]
+    btc = np.cumsum(np.where(is_buy, amount, -amount))
+    equity = cash + btc * final_price
+    peak = np.maximum.accumulate(equity)
+    mdd = ((equity - peak) / peak).min() * 100
+
+    # 승률 계산: 바로 앞 체결이 매수인 매도
+    pairs = ~is_buy[1:] & is_buy[:-1]
+    total = int(pairs.sum())
+    wins = int((price[1:][pairs] > price[:-1][pairs]).sum())
     win_rate = (wins / total * 100) if total > 0 else 0.0
 
     return {
         "mdd_percent": round(mdd, 2),
         "win_rate_percent": round(win_rate, 2)
-    }
\ No newline at end of file
+    }
+
+
+def infer_periods_per_year(index) -> float | None:
+    """
+    인덱스 간격(중앙값)으로 연간 봉 개수 추정
+    """
+    if index is None or len(index) < 2:
+        return None
+    steps = np.diff(np.asarray(index, dtype="datetime64[ns]").astype(np.int64))
+    step = float(np.median(steps)) / 1e9
+    return SECONDS_PER_YEAR / step if step > 0 else None
+
+
+def compute_equity_metrics(close, cash, position, initial_cash: float, low=None,
+                           periods_per_year: float | None = None, eps: float = 1e-12) -> dict:
+    """
+    봉마다의 현금/보유량 배열로 평가금액 곡선과 성과 지표를 벡터 연산으로 계산
+    :param close: 봉별 종가
+    :param cash: 봉 마감(체결 반영 후) 현금
+    :param position: 봉 마감(체결 반영 후) 보유 수량
+    :param initial_cash: 시작 현금
+    :param low: 봉별 저가 — 주어지면 봉 중간의 최저 평가금액까지 MDD에 반영
+    :param periods_per_year: 연간 봉 개수 (Sharpe/Sortino 연율화, None이면 연율화하지 않음)
+    """
+    close = np.asarray(close, dtype=float)
+    cash = np.asarray(cash, dtype=float)
+    position = np.asarray(position, dtype=float)
+    if len(close) == 0:
+        return equity_curve_metrics(close, initial_cash, np.zeros(0, dtype=bool), close)
+
+    equity = cash + position * close
+    trough = None
+    if low is not None:
+        # 봉 중간에는 직전 봉 마감 시점의 현금/보유량이 유지됨
+        prev_cash = np.concatenate(([initial_cash], cash[:-1]))
+        prev_position = np.concatenate(([0.0], position[:-1]))
+        trough = prev_cash + prev_position * np.asarray(low, dtype=float)
+    traded = np.abs(np.diff(np.concatenate(([0.0], position)))) * close
+    return equity_curve_metrics(equity, initial_cash, position > eps, traded, trough=trough,
+                                periods_per_year=periods_per_year)
+
+
+def equity_curve_metrics(equity, initial_cash: float, holding, traded, trough=None,
+                         periods_per_year: float | None = None) -> dict:
+    """
+    평가금액 곡선으로 성과 지표 계산 (단일 종목/포트폴리오 공용)
+    :param equity: 봉 마감 평가금액
+    :param holding: 봉 마감 시점 보유 여부 (bool)
+    :param traded: 봉마다 체결된 금액
+    :param trough: 봉 중간 최저 평가금액 (없으면 마감 기준으로만 MDD 계산)
+    """
+    equity = np.asarray(equity, dtype=float)
+    n = len(equity)
+    if n == 0:
+        return {
+            "mdd_percent": 0.0, "sharpe": 0.0, "sortino": 0.0, "exposure_percent": 0.0,
+            "turnover": 0.0, "round_trips": 0, "win_rate_percent": 0.0,
+        }
+
+    peak = np.maximum(np.maximum.accumulate(equity), initial_cash)
+    drawdown = (equity - peak) / peak
+    if trough is not None:
+        prev_peak = np.concatenate(([initial_cash], peak[:-1]))
+        drawdown = np.minimum(drawdown, (np.asarray(trough, dtype=float) - prev_peak) / prev_peak)
+    mdd = min(0.0, drawdown.min()) * 100
+
+    prev_equity = np.concatenate(([initial_cash], equity[:-1]))
+    returns = equity / prev_equity - 1
+    mean = returns.mean()
+    std = returns.std()
+    downside = np.sqrt(np.mean(np.minimum(returns, 0.0) ** 2))
+    scale = np.sqrt(periods_per_year) if periods_per_year else 1.0
+    sharpe = mean / std * scale if std > 0 else 0.0
+    sortino = mean / downside * scale if downside > 0 else 0.0
+
+    exposure = holding.mean() * 100
+    turnover = np.sum(traded) / equity.mean() if equity.mean() > 0 else 0.0
+
+    # 라운드트립: 무포지션 → 보유 → 무포지션, 손익 = 청산 시점 평가금액 - 진입 직전 평가금액
+    was_holding = np.concatenate(([False], holding[:-1]))
+    entries = np.flatnonzero(holding & ~was_holding)
+    exits = np.flatnonzero(~holding & was_holding)
+    closed = len(exits)
+    if closed:
+        pnl = equity[exits] - prev_equity[entries[:closed]]
+        win_rate = (pnl > 0).mean() * 100
+    else:
+        win_rate = 0.0
+
+    return {
+        "mdd_percent": round(float(mdd), 2),
+        "sharpe": round(float(sharpe), 4),
+        "sortino": round(float(sortino), 4),
+        "exposure_percent": round(float(exposure), 2),
+        "turnover": round(float(turnover), 4),
+        "round_trips": int(closed),
+        "win_rate_percent": round(float(win_rate), 2),
+    }
@@ -0,0 +1,160 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from backtest.shared_data import SharedOHLCV
+from backtest.sweep import STRATEGY_CLASSES, config_overrides
+from backtest.backtester import Backtester
+from utils.indicator_cache import IndicatorCache
+from utils.stop_loss import StopLossDetector
+
+METHODS = ("bootstrap", "noise", "offset")
+SUMMARY_KEYS = ("roi_percent", "mdd_percent", "win_rate_percent", "sharpe", "sortino", "exposure_percent",
+                "round_trips", "num_trades")
+
+# 워커 프로세스별 상태 (initializer에서 한 번 설정)
+_worker_data = None
+_worker_source = None
+_worker_cache = None
+
+
+class PathSource:
+    def __init__(self, df: pd.DataFrame):
+        """
+        원본 OHLCV에서 대체 가격 경로를 만드는 데 필요한 배열 (종가 로그수익률, 종가 대비 시/고/저 비율)
+        """
+        self.index = df.index
+        self.close = df["close"].to_numpy(dtype=float)
+        self.returns = np.diff(np.log(self.close))
+        self.return_std = float(self.returns.std()) if len(self.returns) else 0.0
+        self.shape = {c: df[c].to_numpy(dtype=float) / self.close for c in ("open", "high", "low")}
+        self.volume = df["volume"].to_numpy(dtype=float) if "volume" in df else None
+
+    def path(self, seed: int, method: str, path_length: int | None = None, block_size: int = 50,
+             noise_std: float = 0.5) -> pd.DataFrame:
+        """
+        seed로 결정되는 경로 하나 (같은 seed면 같은 경로)
+        - offset: 무작위 시작 위치에서 path_length 봉을 그대로 사용
+        - bootstrap: 봉(수익률과 봉 모양)을 block_size 길이 블록 단위로 복원 추출해 이어 붙임
+        - noise: 원래 순서의 수익률에 수익률 표준편차 × noise_std 크기의 정규 잡음을 더함
+        """
+        if method not in METHODS:
+            raise ValueError(f"Unknown path method: {method}")
+        rng = np.random.default_rng(seed)
+        n = len(self.close)
+        length = min(path_length or n, n)
+        start = int(rng.integers(0, n - length + 1))
+        bars = np.arange(start, start + length)
+
+        if method == "offset":
+            close = self.close[bars]
+        else:
+            if method == "bootstrap":
+                # 블록 시작은 1 이상 (첫 봉에는 직전 수익률이 없음)
+                block_size = max(1, min(block_size, n - 1))
+                starts = rng.integers(1, n - block_size + 1, size=-(-length // block_size))
+                bars = (starts[:, None] + np.arange(block_size)).ravel()[:length]
+                returns = self.returns[bars - 1]
+            else:
+                returns = self.returns[np.maximum(bars - 1, 0)]
+                returns = returns + rng.normal(0.0, noise_std * self.return_std, size=length)
+            returns[0] = 0.0
+            close = self.close[start] * np.exp(np.cumsum(returns))
+
+        data = {c: self.shape[c][bars] * close for c in ("open", "high", "low")}
+        data["close"] = close
+        if self.volume is not None:
+            data["volume"] = self.volume[bars]
+        return pd.DataFrame(data, index=self.index[start:start + length])
+
+
+def _init_worker(spec: dict, candle_interval_minutes: int):
+    global _worker_data, _worker_source, _worker_cache
+    _worker_data = SharedOHLCV.attach(spec)
+    _worker_source = PathSource(_worker_data.to_frame())
+    # 경로마다 내용이 다르므로 캐시는 같은 경로의 중복 지표(손절 마스크 등)만 공유
+    _worker_cache = IndicatorCache(max_entries=32)
+    StopLossDetector.candle_interval_minutes = candle_interval_minutes
+
+
+def run_path(source: PathSource, seed: int, job: dict, cache=None) -> dict:
+    df = source.path(seed, job["method"], job["path_length"], job["block_size"], job["noise_std"])
+    strategy = STRATEGY_CLASSES[job["strategy"]](**job["params"])
+    if job["stop_loss"]:
+        strategy.stop_loss_detector = StopLossDetector(**job["stop_loss"])
+    with config_overrides(job["config"]):
+        result = Backtester(strategy, df, initial_cash=job["initial_cash"], fee_rate=job["fee_rate"],
+                            engine="vectorized", indicator_cache=cache).run()
+    # trade_log는 워커 안에서 버리고 요약 지표만 돌려보냄
+    row = {"seed": seed}
+    row.update({key: result[key] for key in SUMMARY_KEYS if key in result})
+    return row
+
+
+def _run_seeds_in_worker(seeds: list, job: dict) -> list[dict]:
+    return [run_path(_worker_source, seed, job, _worker_cache) for seed in seeds]
+
+
+def run_monte_carlo(df: pd.DataFrame, strategy: str = "rsi", params: dict | None = None, n_paths: int = 1000,
+                    method: str = "bootstrap", path_length: int | None = None, block_size: int = 50,
+                    noise_std: float = 0.5, config: dict | None = None, stop_loss: dict | None = None,
+                    initial_cash: float = 1_000_000, fee_rate: float = 0.0005, seed: int = 0,
+                    max_workers: int | None = None, batch_size: int = 16, on_result=None) -> pd.DataFrame:
+    """
+    원본 OHLCV로 만든 n_paths개의 대체 경로에서 같은 전략을 백테스트해 지표 분포를 반환
+
+    예)
+        results = run_monte_carlo(df, "rsi", {"period": 14}, n_paths=2000, method="bootstrap", block_size=60)
+        summarize(results)
+
+    원본은 공유 메모리로 한 번만 넘기고, 워커는 seed 묶음만 받아 경로를 직접 만든다.
+    :param method: bootstrap / noise / offset (PathSource.path 참고)
+    :param path_length: 경로 길이 (기본 원본 전체, offset은 이보다 짧아야 의미가 있음)
+    :param config: config 값 덮어쓰기 (PROFIT_THRESHOLD 등)
+    :param stop_loss: StopLossDetector 생성자 파라미터
+    :param batch_size: 워커에 한 번에 넘길 경로 수
+    :param on_result: 묶음이 끝날 때마다 on_result(rows) 호출 (진행 상황 표시 등)
+    :return: 경로별 요약 지표 (seed, roi_percent, mdd_percent, win_rate_percent, ...)
+    """
+    if strategy not in STRATEGY_CLASSES:
+        raise ValueError(f"Unknown strategy: {strategy}")
+    if method not in METHODS:
+        raise ValueError(f"Unknown path method: {method}")
+    job = {
+        "strategy": strategy, "params": params or {}, "method": method, "path_length": path_length,
+        "block_size": block_size, "noise_std": noise_std, "config": config or {}, "stop_loss": stop_loss or {},
+        "initial_cash": initial_cash, "fee_rate": fee_rate,
+    }
+    seeds = np.random.SeedSequence(seed).generate_state(n_paths).tolist()
+    batches = [seeds[i:i + batch_size] for i in range(0, n_paths, batch_size)]
+
+    max_workers = max_workers or os.cpu_count() or 1
+    rows = []
+    shared = SharedOHLCV.create(df[["open", "high", "low", "close", "volume"]])
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(shared.spec, StopLossDetector.candle_interval_minutes)) as pool:
+            for batch_rows in pool.map(_run_seeds_in_worker, batches, [job] * len(batches)):
+                rows.extend(batch_rows)
+                if on_result is not None:
+                    on_result(batch_rows)
+    finally:
+        shared.close()
+    return pd.DataFrame(rows)
+
+
+def summarize(results: pd.DataFrame, metrics: tuple = ("roi_percent", "mdd_percent", "win_rate_percent"),
+              percentiles: tuple = (5, 25, 50, 75, 95)) -> pd.DataFrame:
+    """
+    지표별 평균/표준편차/백분위수와 손실 경로 비율
+    """
+    table = {}
+    for metric in metrics:
+        values = results[metric].to_numpy(dtype=float)
+        row = {"mean": values.mean(), "std": values.std()}
+        row.update({f"p{p}": v for p, v in zip(percentiles, np.percentile(values, percentiles))})
+        table[metric] = row
+    summary = pd.DataFrame(table).T
+    if "roi_percent" in results:
+        summary.attrs["loss_probability"] = float((results["roi_percent"] < 0).mean())
+    return summary
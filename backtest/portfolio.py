@@ -0,0 +1,330 @@
+import numpy as np
+import pandas as pd
+from backtest.metrics import equity_curve_metrics, infer_periods_per_year
+from utils.ledger import PositionLedger
+import config
+
+FIELDS = ("open", "high", "low", "close", "volume")
+ALLOCATIONS = ("sequential", "equal")
+NO_EVENT = np.iinfo(np.int64).max
+
+
+class AlignedPanel:
+    def __init__(self, frames: dict, fields: tuple = FIELDS):
+        """
+        여러 마켓의 봉을 하나의 시간축(전체 봉 시각의 합집합)에 맞춘 (봉 수 T, 마켓 수 N) 배열로 보관
+        - valid[t, j]: 마켓 j에 t 시각 봉이 있는지 (거래 없는 봉/상장 전 구간은 False, 값은 NaN)
+        - filled["close"]: 빈 봉은 직전 종가로 채운 값 (평가금액 계산용, 상장 전은 0)
+        :param frames: 마켓 코드 → OHLCV DataFrame
+        """
+        self.markets = list(frames)
+        self.fields = [f for f in fields if all(f in df.columns for df in frames.values())]
+        self.index = pd.DatetimeIndex(np.unique(np.concatenate(
+            [df.index.values.astype("datetime64[ns]") for df in frames.values()])))
+        n_bars, n_markets = len(self.index), len(self.markets)
+        self.valid = np.zeros((n_bars, n_markets), dtype=bool)
+        self.values = {f: np.full((n_bars, n_markets), np.nan) for f in self.fields}
+        for j, df in enumerate(frames.values()):
+            rows = self.index.get_indexer(df.index.values.astype("datetime64[ns]"))
+            self.valid[rows, j] = True
+            for f in self.fields:
+                self.values[f][rows, j] = df[f].to_numpy(dtype=float)
+        self.filled = {f: self._ffill(self.values[f]) for f in ("close", "low") if f in self.values}
+
+    @classmethod
+    def from_store(cls, store, markets: list, interval: str = "minute1", start=None, end=None):
+        return cls({market: store.load(market, interval, start, end) for market in markets})
+
+    @staticmethod
+    def _ffill(values: np.ndarray) -> np.ndarray:
+        rows = np.where(np.isnan(values), -1, np.arange(len(values))[:, None])
+        rows = np.maximum.accumulate(rows, axis=0)
+        filled = np.take_along_axis(values, np.maximum(rows, 0), axis=0)
+        filled[rows < 0] = 0.0
+        return filled
+
+    def __len__(self):
+        return len(self.index)
+
+    def frame(self, j: int) -> pd.DataFrame:
+        """
+        마켓 j의 실제 봉만 모은 DataFrame (전략 신호 계산용)
+        """
+        rows = self.valid[:, j]
+        return pd.DataFrame({f: self.values[f][rows, j] for f in self.fields}, index=self.index[rows])
+
+
+class PortfolioBacktester:
+    def __init__(self, strategy, panel: AlignedPanel, initial_cash: float = 1_000_000, fee_rate: float = 0.0005,
+                 allocation: str = "sequential", indicator_cache=None):
+        """
+        여러 마켓을 하나의 원화 잔고로 함께 운용하는 백테스트 (TradingEngine과 같은 구성)
+        마켓별 신호는 compute_signals()로 한 번에 계산하고, 체결은 이벤트가 있는 봉만 시간순으로 처리한다.
+        보유 중인 마켓의 다음 매도 봉은 평단가가 바뀔 때마다 배열 검색으로 미리 찾아 두므로 이벤트 없는 봉은 건너뛴다.
+        :param strategy: 모든 마켓에 쓸 Strategy, 또는 마켓 코드 → Strategy
+        :param allocation: 같은 봉에 매수 신호가 여럿일 때 원화 배분
+                           "sequential" — 마켓 순서대로 남은 잔고로 buy_amount (라이브 엔진과 같음)
+                           "equal" — 남은 잔고를 신호 개수로 나눈 몫으로 buy_amount
+        """
+        if allocation not in ALLOCATIONS:
+            raise ValueError(f"Unknown allocation: {allocation}")
+        self.panel = panel
+        self.strategies = [strategy[m] if isinstance(strategy, dict) else strategy for m in panel.markets]
+        self.initial_cash = initial_cash
+        self.cash = initial_cash
+        self.fee_rate = fee_rate
+        self.allocation = allocation
+        self.indicator_cache = indicator_cache
+        n_markets = len(panel.markets)
+        self.position = np.zeros(n_markets)
+        self.ledgers = [PositionLedger() for _ in range(n_markets)]
+        self.trade_log = []
+        # 체결 기록 (봉, 마켓, 체결 후 보유량, 체결 후 현금) — 2D 보유량/현금 곡선 계산용
+        self.trade_bars = []
+        self.trade_markets = []
+        self.position_after = []
+        self.cash_after = []
+
+    def _signals(self):
+        """
+        마켓별 신호를 실제 봉 기준 압축 배열로 계산
+        """
+        panel = self.panel
+        self.bars, self.close, self.signals = [], [], []
+        for j, strategy in enumerate(self.strategies):
+            df = panel.frame(j)
+            self.bars.append(np.flatnonzero(panel.valid[:, j]))
+            self.close.append(df["close"].to_numpy(dtype=float))
+            self.signals.append(strategy.compute_signals(df, cache=self.indicator_cache) if len(df) else
+                                {k: np.zeros(0, dtype=bool) for k in ("buy", "sell", "stop_loss")})
+        # 압축 배열 위치 ↔ 전체 봉 위치
+        self.slot = np.full(panel.valid.shape, -1, dtype=np.int64)
+        for j, bars in enumerate(self.bars):
+            self.slot[bars, j] = np.arange(len(bars))
+
+    def _next_sell(self, j: int, start: int) -> int:
+        """
+        마켓 j의 start(압축 위치)부터 Backtester와 같은 매도 조건(익절 → 급락 손절 → 전략 신호)이 처음 성립하는 봉
+        :return: 전체 봉 위치, 없으면 NO_EVENT
+        """
+        avg = self.ledgers[j].avg_price
+        close = self.close[j]
+        signals = self.signals[j]
+        n = len(close)
+        span = 64
+        while start < n:
+            end = min(n, start + span)
+            profit = (close[start:end] - avg) / avg * 100 if avg > 0 else np.zeros(end - start)
+            take_profit = profit >= self.profit_threshold
+            hit = (take_profit & (profit >= self.min_profit)) | (~take_profit & (
+                signals["stop_loss"][start:end] | (signals["sell"][start:end] & (profit >= self.min_profit))))
+            found = np.flatnonzero(hit)
+            if found.size:
+                return int(self.bars[j][start + found[0]])
+            start = end
+            span *= 4
+        return NO_EVENT
+
+    def _schedule(self, j: int, t: int, k: int):
+        # 마켓 j의 평단가/보유량이 t 봉(압축 위치 k)에서 바뀐 뒤 다음 매도 봉 다시 찾기
+        self.next_sell[j] = self._next_sell(j, k + 1) if self.position[j] > 0 else NO_EVENT
+
+    def run(self) -> dict:
+        self.profit_threshold = config.PROFIT_THRESHOLD
+        self.min_profit = config.MIN_PROFIT_TO_SELL
+        self._signals()
+        n_bars, n_markets = self.panel.valid.shape
+
+        buy = np.zeros((n_bars, n_markets), dtype=bool)
+        for j, bars in enumerate(self.bars):
+            buy[bars, j] = self.signals[j]["buy"]
+        # 매수 신호가 있는 봉과 그 봉의 마켓 목록
+        rows, cols = np.nonzero(buy)
+        buy_bars, starts = np.unique(rows, return_index=True)
+        buy_bars, bounds, buy_markets = buy_bars.tolist(), starts.tolist() + [len(cols)], cols.tolist()
+
+        # 체결 처리는 봉 하나씩이므로 스칼라 접근이 빠른 리스트로
+        self.close_list = [c.tolist() for c in self.close]
+        self.stop_list = [s["stop_loss"].tolist() for s in self.signals]
+        self.sell_strength = [s["sell_strength"].tolist() if len(s["buy"]) else [] for s in self.signals]
+        self.buy_strength = [s["buy_strength"].tolist() if len(s["buy"]) else [] for s in self.signals]
+        self.next_sell = [NO_EVENT] * n_markets
+        slot = self.slot
+
+        b = 0
+        while True:
+            tb = buy_bars[b] if b < len(buy_bars) else NO_EVENT
+            ts = min(self.next_sell)
+            t = min(tb, ts)
+            if t == NO_EVENT:
+                break
+
+            sold = [j for j in range(n_markets) if self.next_sell[j] == t] if ts == t else []
+            for j in sold:
+                self._sell(j, t, int(slot[t, j]))
+            if tb == t:
+                candidates = [j for j in buy_markets[bounds[b]:bounds[b + 1]] if j not in sold]
+                b += 1
+                budget = self.cash / len(candidates) if self.allocation == "equal" and candidates else None
+                for j in candidates:
+                    self._buy(j, t, int(slot[t, j]), budget)
+
+        return self._summary()
+
+    def _sell(self, j: int, t: int, k: int):
+        price = self.close_list[j][k]
+        ledger = self.ledgers[j]
+        avg = ledger.avg_price
+        profit = (price - avg) / avg * 100 if avg > 0 else 0.0
+        if profit >= self.profit_threshold:
+            reason, strength = "take_profit", 1.0
+        elif self.stop_list[j][k]:
+            reason, strength = "sharp_decline", 1.0
+        else:
+            reason, strength = "strategy_signal", self.sell_strength[j][k]
+
+        amount = self.strategies[j].sell_amount(self.position[j], price, strength)
+        self.cash += amount * price * (1 - self.fee_rate)
+        self.position[j] -= amount
+        ledger.sell(price, amount, amount * price * self.fee_rate)
+        self._log_trade(t, j, "SELL", price, amount, reason)
+        self._schedule(j, t, k)
+
+    def _buy(self, j: int, t: int, k: int, budget: float | None):
+        if self.cash <= 0:
+            return
+        price = self.close_list[j][k]
+        amount_krw = self.strategies[j].buy_amount(self.cash if budget is None else budget, price,
+                                                   self.buy_strength[j][k])
+        amount_krw = min(amount_krw, self.cash)
+        if amount_krw <= 0:
+            return
+        amount = amount_krw * (1 - self.fee_rate) / price
+        self.cash -= amount_krw
+        self.position[j] += amount
+        self.ledgers[j].buy(price, amount, amount_krw * self.fee_rate)
+        self._log_trade(t, j, "BUY", price, amount, "strategy_signal")
+        self._schedule(j, t, k)
+
+    def _log_trade(self, t, j, trade_type, price, amount, reason):
+        self.trade_bars.append(t)
+        self.trade_markets.append(j)
+        self.position_after.append(self.position[j])
+        self.cash_after.append(self.cash)
+        self.trade_log.append({
+            "timestamp": self.panel.index[t],
+            "market": self.panel.markets[j],
+            "type": trade_type,
+            "price": price,
+            "amount": amount,
+            "reason": reason,
+        })
+
+    def holdings(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        봉 마감 시점의 현금 (T,)과 마켓별 보유량 (T, N) — 체결이 없는 봉은 직전 값 유지
+        """
+        n_bars, n_markets = self.panel.valid.shape
+        bars = np.asarray(self.trade_bars, dtype=np.int64)
+        markets = np.asarray(self.trade_markets, dtype=np.int64)
+        order = np.arange(len(bars))
+
+        last_trade = np.full(n_bars, -1, dtype=np.int64)
+        np.maximum.at(last_trade, bars, order)
+        last_trade = np.maximum.accumulate(last_trade)
+        cash = np.concatenate(([self.initial_cash], self.cash_after))[last_trade + 1]
+
+        # 같은 봉/마켓 체결은 하나뿐이므로 그대로 채운 뒤 시간 방향으로 이어 붙임
+        last = np.full((n_bars, n_markets), -1, dtype=np.int64)
+        last[bars, markets] = order
+        last = np.maximum.accumulate(last, axis=0)
+        position = np.concatenate(([0.0], self.position_after))[last + 1]
+        return cash, position
+
+    def _summary(self) -> dict:
+        panel = self.panel
+        close = panel.filled["close"]
+        cash, position = self.holdings()
+        value = position * close
+        equity = cash + value.sum(axis=1)
+        traded = np.abs(np.diff(np.vstack([np.zeros((1, len(panel.markets))), position]), axis=0)) * close
+
+        trough = None
+        if "low" in panel.filled:
+            prev_cash = np.concatenate(([self.initial_cash], cash[:-1]))
+            prev_position = np.vstack([np.zeros((1, len(panel.markets))), position[:-1]])
+            low = np.where(panel.valid, panel.filled["low"], close)
+            trough = prev_cash + (prev_position * low).sum(axis=1)
+
+        holding = position > 1e-12
+        metrics = equity_curve_metrics(equity, self.initial_cash, holding.any(axis=1), traded.sum(axis=1),
+                                       trough=trough, periods_per_year=infer_periods_per_year(panel.index))
+        # 라운드트립/승률은 마켓별로 세어 합산 (모든 마켓이 동시에 무포지션인 구간만 세지 않도록)
+        round_trips, wins = self._round_trips(holding)
+        metrics["round_trips"] = int(round_trips.sum())
+        metrics["win_rate_percent"] = round(float(wins.sum() / round_trips.sum() * 100), 2) \
+            if round_trips.sum() else 0.0
+
+        final_value = float(equity[-1]) if len(equity) else self.initial_cash
+        profit = final_value - self.initial_cash
+        metrics.update({
+            "final_value": round(final_value, 2),
+            "profit": round(profit, 2),
+            "roi_percent": round(profit / self.initial_cash * 100, 2),
+            "realized_pnl": round(sum(l.realized_pnl for l in self.ledgers), 2),
+            "fees": round(sum(l.fees for l in self.ledgers), 2),
+            "num_trades": len(self.trade_log),
+            "markets": self._market_metrics(position, value, traded, holding, round_trips, wins),
+            "trade_log": self.trade_log,
+        })
+        return metrics
+
+    def _round_trips(self, holding: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        마켓별 라운드트립(무포지션 → 보유 → 무포지션) 수와 이긴 횟수
+        손익 = 진입 봉부터 청산 봉까지 그 마켓 체결로 오간 현금 합 (수수료 포함, 양 끝에서 보유량 0)
+        :return: (라운드트립 수 (N,), 이긴 횟수 (N,))
+        """
+        n_bars, n_markets = holding.shape
+        flow = np.zeros((n_bars, n_markets))
+        if self.trade_bars:
+            cash_flow = np.diff(np.concatenate(([self.initial_cash], self.cash_after)))
+            np.add.at(flow, (np.asarray(self.trade_bars), np.asarray(self.trade_markets)), cash_flow)
+        cum_flow = np.cumsum(flow, axis=0)
+        before = cum_flow - flow  # 각 봉의 체결 직전까지 누적
+
+        was_holding = np.vstack([np.zeros((1, n_markets), dtype=bool), holding[:-1]])
+        round_trips = np.zeros(n_markets, dtype=np.int64)
+        wins = np.zeros(n_markets, dtype=np.int64)
+        for j in range(n_markets):
+            entries = np.flatnonzero(holding[:, j] & ~was_holding[:, j])
+            exits = np.flatnonzero(~holding[:, j] & was_holding[:, j])
+            closed = len(exits)
+            pnl = cum_flow[exits, j] - before[entries[:closed], j]
+            round_trips[j] = closed
+            wins[j] = int((pnl > 0).sum())
+        return round_trips, wins
+
+    def _market_metrics(self, position, value, traded, holding, round_trips, wins) -> pd.DataFrame:
+        """
+        마켓별 지표를 (T, N) 배열에서 한 번에 계산
+        """
+        markets = np.asarray(self.trade_markets, dtype=np.int64)
+        final_value = value[-1] if len(value) else np.zeros(len(self.panel.markets))
+        realized = np.array([l.realized_pnl for l in self.ledgers])
+        cost = np.array([l.cost_basis for l in self.ledgers])
+        return pd.DataFrame({
+            "trades": np.bincount(markets, minlength=len(self.panel.markets)),
+            "round_trips": round_trips,
+            "win_rate_percent": np.round(np.divide(wins * 100.0, round_trips, out=np.zeros(len(wins)),
+                                                   where=round_trips > 0), 2),
+            "exposure_percent": np.round(holding.mean(axis=0) * 100, 2),
+            "traded_krw": np.round(traded.sum(axis=0), 2),
+            "position": position[-1] if len(position) else np.zeros(len(self.panel.markets)),
+            "final_value": np.round(final_value, 2),
+            "realized_pnl": np.round(realized, 2),
+            "unrealized_pnl": np.round(final_value - cost, 2),
+            "pnl": np.round(realized + final_value - cost, 2),
+            "fees": np.round([l.fees for l in self.ledgers], 2),
+            "missing_bars_percent": np.round((~self.panel.valid).mean(axis=0) * 100, 2),
+        }, index=pd.Index(self.panel.markets, name="market"))
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+from multiprocessing import shared_memory
+
+
+class SharedOHLCV:
+    """
+    OHLCV DataFrame을 공유 메모리에 한 번 올려 두고 여러 프로세스에서 복사 없이 읽는다.
+    메모리 배치: [인덱스(int64 ns) n개][값(float64) n x 컬럼 수]
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, length: int, columns: list, owner: bool):
+        self.shm = shm
+        self.length = length
+        self.columns = list(columns)
+        self.owner = owner
+
+    @classmethod
+    def create(cls, df: pd.DataFrame) -> "SharedOHLCV":
+        columns = list(df.columns)
+        length = len(df)
+        nbytes = max(1, length * 8 * (1 + len(columns)))
+        shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        shared = cls(shm, length, columns, owner=True)
+        index, values = shared._arrays()
+        index[:] = pd.DatetimeIndex(df.index).as_unit("ns").asi8
+        values[:] = df.to_numpy(dtype=float)
+        return shared
+
+    @classmethod
+    def attach(cls, spec: dict) -> "SharedOHLCV":
+        shm = shared_memory.SharedMemory(name=spec["name"])
+        return cls(shm, spec["length"], spec["columns"], owner=False)
+
+    @property
+    def spec(self) -> dict:
+        # 워커로 넘기는 것은 이름과 모양뿐 (데이터 자체는 피클하지 않음)
+        return {"name": self.shm.name, "length": self.length, "columns": self.columns}
+
+    def _arrays(self):
+        n = self.length
+        index = np.ndarray((n,), dtype=np.int64, buffer=self.shm.buf, offset=0)
+        values = np.ndarray((n, len(self.columns)), dtype=np.float64, buffer=self.shm.buf, offset=n * 8)
+        return index, values
+
+    def to_frame(self) -> pd.DataFrame:
+        index, values = self._arrays()
+        if not self.owner:
+            values.flags.writeable = False
+        return pd.DataFrame(values, index=pd.DatetimeIndex(index.view("datetime64[ns]")),
+                            columns=self.columns, copy=False)
+
+    def close(self):
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
@@ -0,0 +1,144 @@
+import itertools
+import os
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+import config
+from backtest.backtester import Backtester
+from backtest.shared_data import SharedOHLCV
+from strategies.rsi_strategy import RSIStrategy
+from strategies.sma_crossover import SMACrossoverStrategy
+from utils.indicator_cache import IndicatorCache
+from utils.stop_loss import StopLossDetector
+
+STRATEGY_CLASSES = {
+    "rsi": RSIStrategy,
+    "sma": SMACrossoverStrategy,
+}
+
+# 워커 프로세스별 상태 (initializer에서 한 번 설정)
+_worker_data = None
+_worker_df = None
+_worker_cache = None
+
+
+def expand_grid(grid: dict | None) -> list[dict]:
+    """
+    {"period": [7, 14], "oversold": [25, 30]} → 모든 조합의 dict 목록
+    """
+    if not grid:
+        return [{}]
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def build_tasks(strategy_grids: dict, config_grid: dict | None = None,
+                stop_loss_grid: dict | None = None) -> list[dict]:
+    tasks = []
+    for name, grid in strategy_grids.items():
+        if name not in STRATEGY_CLASSES:
+            raise ValueError(f"Unknown strategy: {name}")
+        for params in expand_grid(grid):
+            if name == "sma" and params.get("short_window", 5) >= params.get("long_window", 20):
+                continue
+            for config_params in expand_grid(config_grid):
+                for stop_loss_params in expand_grid(stop_loss_grid):
+                    tasks.append({
+                        "strategy": name,
+                        "params": params,
+                        "config": config_params,
+                        "stop_loss": stop_loss_params,
+                    })
+    return tasks
+
+
+def _init_worker(spec: dict, candle_interval_minutes: int):
+    global _worker_data, _worker_df, _worker_cache
+    _worker_data = SharedOHLCV.attach(spec)
+    _worker_df = _worker_data.to_frame()
+    _worker_cache = IndicatorCache()
+    StopLossDetector.candle_interval_minutes = candle_interval_minutes
+
+
+@contextmanager
+def config_overrides(values: dict):
+    """
+    익절 기준은 전략이 config 모듈에서 직접 읽으므로 백테스트 동안만 덮어쓰고 되돌린다
+    """
+    previous = {key: getattr(config, key) for key in values if hasattr(config, key)}
+    try:
+        for key, value in values.items():
+            setattr(config, key, value)
+        yield
+    finally:
+        for key in values:
+            if key in previous:
+                setattr(config, key, previous[key])
+            else:
+                delattr(config, key)
+
+
+def build_strategy(task: dict):
+    strategy = STRATEGY_CLASSES[task["strategy"]](**task["params"])
+    if task["stop_loss"]:
+        strategy.stop_loss_detector = StopLossDetector(**task["stop_loss"])
+    return strategy
+
+
+def run_task(task: dict, df: pd.DataFrame, initial_cash: float, fee_rate: float, engine: str,
+             indicator_cache=None, warmup: int = 0, copy: bool = True) -> dict:
+    strategy = build_strategy(task)
+    with config_overrides(task["config"]):
+        result = Backtester(strategy, df, initial_cash=initial_cash, fee_rate=fee_rate, engine=engine,
+                            indicator_cache=indicator_cache, warmup=warmup, copy=copy).run()
+    result.pop("trade_log", None)
+
+    row = {"strategy": task["strategy"]}
+    row.update(task["params"])
+    row.update(task["config"])
+    row.update(task["stop_loss"])
+    row.update(result)
+    return row
+
+
+def _run_task_in_worker(task, initial_cash, fee_rate, engine):
+    # 공유 메모리 프레임(읽기 전용)을 작업마다 복사하지 않고 그대로 백테스트
+    return run_task(task, _worker_df, initial_cash, fee_rate, engine, indicator_cache=_worker_cache, copy=False)
+
+
+def run_sweep(df: pd.DataFrame, strategy_grids: dict, config_grid: dict | None = None,
+              stop_loss_grid: dict | None = None, initial_cash: float = 1_000_000,
+              fee_rate: float = 0.0005, engine: str = "vectorized", max_workers: int | None = None,
+              sort_by: str = "roi_percent", ascending: bool = False) -> pd.DataFrame:
+    """
+    파라미터 조합 전체를 프로세스 풀에서 백테스트하고 compute_metrics 결과를 순위표로 반환
+
+    예)
+        run_sweep(df,
+                  {"rsi": {"period": [7, 14], "oversold": [25, 30], "overbought": [70, 75]},
+                   "sma": {"short_window": [5, 10], "long_window": [20, 60]}},
+                  config_grid={"PROFIT_THRESHOLD": [1.0, 2.0], "MIN_PROFIT_TO_SELL": [0.5]},
+                  stop_loss_grid={"sharp_drop_threshold": [-2.0, -3.0], "lookback_minutes": [15, 30]})
+
+    :param df: OHLCV 데이터 (공유 메모리로 워커에 전달)
+    :param strategy_grids: 전략 이름 → 생성자 파라미터 그리드
+    :param config_grid: config 값 그리드 (PROFIT_THRESHOLD, MIN_PROFIT_TO_SELL)
+    :param stop_loss_grid: StopLossDetector 생성자 파라미터 그리드
+    """
+    tasks = build_tasks(strategy_grids, config_grid, stop_loss_grid)
+    if not tasks:
+        return pd.DataFrame()
+
+    max_workers = max_workers or os.cpu_count() or 1
+    shared = SharedOHLCV.create(df)
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(shared.spec, StopLossDetector.candle_interval_minutes)) as pool:
+            futures = [pool.submit(_run_task_in_worker, task, initial_cash, fee_rate, engine) for task in tasks]
+            rows = [f.result() for f in futures]
+    finally:
+        shared.close()
+
+    table = pd.DataFrame(rows).sort_values(sort_by, ascending=ascending, kind="stable")
+    table.insert(0, "rank", range(1, len(table) + 1))
+    return table.reset_index(drop=True)
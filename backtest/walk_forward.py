@@ -0,0 +1,81 @@
+import pandas as pd
+from backtest.sweep import build_strategy, build_tasks, run_task
+from utils.indicator_cache import IndicatorCache
+
+
+def walk_forward_splits(n: int, train_size: int, test_size: int, step: int | None = None,
+                        anchored: bool = False) -> list[tuple[int, int, int, int]]:
+    """
+    (train_start, train_end, test_start, test_end) 위치 구간 목록 — end는 포함하지 않음
+    :param step: 다음 구간까지 이동할 봉 수 (기본 test_size)
+    :param anchored: True면 학습 구간 시작을 0에 고정하고 끝만 늘림
+    """
+    if train_size <= 0 or test_size <= 0:
+        raise ValueError("train_size and test_size must be positive")
+    step = step or test_size
+    splits = []
+    train_end = train_size
+    while train_end + test_size <= n:
+        train_start = 0 if anchored else train_end - train_size
+        splits.append((train_start, train_end, train_end, train_end + test_size))
+        train_end += step
+    return splits
+
+
+def run_walk_forward(df: pd.DataFrame, strategy_grids: dict, train_size: int, test_size: int,
+                     step: int | None = None, anchored: bool = False, config_grid: dict | None = None,
+                     stop_loss_grid: dict | None = None, initial_cash: float = 1_000_000,
+                     fee_rate: float = 0.0005, sort_by: str = "roi_percent", ascending: bool = False,
+                     cache: IndicatorCache | None = None, warmup: int | None = None) -> pd.DataFrame:
+    """
+    학습 구간마다 모든 파라미터 조합을 백테스트해 sort_by 기준 최고 조합을 고르고, 바로 다음 검증 구간에서 평가
+
+    예)
+        run_walk_forward(df, {"rsi": {"period": [7, 14, 21], "oversold": [25, 30]}},
+                         train_size=5000, test_size=1000, config_grid={"PROFIT_THRESHOLD": [1.0, 2.0]})
+
+    같은 학습 구간의 조합들은 IndicatorCache로 같은 기간의 RSI/SMA와 손절 마스크를 한 번만 계산한다.
+    검증 구간 앞에는 학습 구간 끝의 warmup개 봉을 붙여 지표를 미리 채우고, 매매/평가는 검증 구간에서만 한다.
+    :param warmup: 검증 구간 앞에 붙일 봉 개수 (기본: 조합들이 필요로 하는 지표 기간/손절 lookback 중 최대)
+
+    :return: fold별 한 행 — 선택된 전략/파라미터, is_<지표>(학습 구간), 검증 구간 지표.
+             attrs["cache"]에 캐시 적중 통계
+    """
+    tasks = build_tasks(strategy_grids, config_grid, stop_loss_grid)
+    if not tasks:
+        return pd.DataFrame()
+    cache = cache if cache is not None else IndicatorCache(max_entries=max(256, 4 * len(tasks)))
+    if warmup is None:
+        strategies = [build_strategy(task) for task in tasks]
+        warmup = max(max(s.required_history(), s.stop_loss_detector.compute_lookback()) for s in strategies)
+
+    rows = []
+    for fold, (train_start, train_end, test_start, test_end) in enumerate(
+            walk_forward_splits(len(df), train_size, test_size, step, anchored)):
+        train = df.iloc[train_start:train_end]
+        candidates = [run_task(task, train, initial_cash, fee_rate, "vectorized", indicator_cache=cache)
+                      for task in tasks]
+        ranked = sorted(range(len(tasks)), key=lambda i: candidates[i][sort_by], reverse=not ascending)
+        best_task, best_row = tasks[ranked[0]], candidates[ranked[0]]
+
+        lead = min(warmup, test_start)
+        test = df.iloc[test_start - lead:test_end]
+        result = run_task(best_task, test, initial_cash, fee_rate, "vectorized", indicator_cache=cache,
+                          warmup=lead)
+
+        row = {
+            "fold": fold,
+            "train_start": df.index[train_start],
+            "train_end": df.index[train_end - 1],
+            "test_start": df.index[test_start],
+            "test_end": df.index[test_end - 1],
+        }
+        row.update(result)
+        metric_keys = set(result) - {"strategy"} - set(best_task["params"]) - set(best_task["config"]) \
+            - set(best_task["stop_loss"])
+        row.update({f"is_{key}": best_row[key] for key in sorted(metric_keys)})
+        rows.append(row)
+
+    table = pd.DataFrame(rows)
+    table.attrs["cache"] = cache.stats()
+    return table
@@ -0,0 +1,223 @@
+"""
+오프라인 성능 벤치마크 (네트워크 없이 합성 OHLCV 사용)
+
+    python -m benchmarks.run --sizes 10000 100000 1000000
+    python -m benchmarks.run --compare benchmarks/results/bench-<old>.json
+    python -m benchmarks.run --sizes --traffic logs/api.traffic   # 기록된 API 응답으로 main.py 경로 전체
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import tempfile
+import json
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from backtest.backtester import Backtester
+from backtest.metrics import compute_equity_metrics, compute_metrics
+from benchmarks.synthetic import generate_ohlcv
+from strategies.rsi_strategy import RSIStrategy
+from strategies.sma_crossover import SMACrossoverStrategy
+from utils.stop_loss import StopLossDetector
+
+RESULTS_DIR = Path(__file__).parent / "results"
+STRATEGIES = {
+    "rsi": RSIStrategy,
+    "sma": SMACrossoverStrategy,
+}
+
+
+def measure(fn, repeat: int, number: int = 1) -> dict:
+    """
+    fn을 number번 호출하는 시간을 repeat번 측정 — 호출 1회당 초 단위
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number)
+    return {"seconds": statistics.median(samples), "min": min(samples), "repeat": repeat, "number": number}
+
+
+def tick_replay(strategy_cls, df: pd.DataFrame, streaming: bool, ticks: int, window: int = 1000):
+    """
+    라이브 루프처럼 봉이 하나씩 추가된 window 길이 구간으로 should_buy/should_sell 호출
+    """
+    def run():
+        strategy = strategy_cls(streaming=streaming)
+        start = max(window, len(df) - ticks)
+        for i in range(start, len(df)):
+            frame = df.iloc[i - window:i]
+            price = frame["close"].iloc[-1]
+            strategy.should_buy(frame)
+            strategy.should_sell(frame, {"current_price": price, "avg_buy_price": 0.0, "btc_balance": 0.0})
+    return run
+
+
+def traffic_replay(path: str, strategy_name: str = "rsi") -> dict:
+    """
+    config.API_RECORD로 기록한 API 응답을 대기 없이 재생하며 AsyncRuntime으로 main.py와 같은 경로를 실행
+    입력이 고정되므로 판단이 같으면 기록된 응답을 모두 쓰고 not_recorded 요청이 없어야 함
+    """
+    from engine import AsyncRuntime, TradingEngine
+    from executor.api_traffic import TrafficReplay
+    from executor.mock_executor import MockExecutor
+    from executor.upbit_api import UpbitClient
+    from executor.upbit_executor import UpbitExecutor
+    from strategies import get_strategy
+    from utils.intervals import INTERVAL_MAP
+    from utils.trade_journal import TradeJournal
+
+    replay = TrafficReplay(path)
+    meta = replay.meta
+    client = UpbitClient(replay=replay)
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = TradeJournal(f"{tmp}/trades.db")
+        if meta.get("executor") == "upbit":
+            executor = UpbitExecutor(None, None, journal=journal, client=client)
+        else:
+            executor = MockExecutor(journal=journal, client=client)
+        engine = TradingEngine(executor, meta["markets"], lambda: get_strategy(strategy_name), meta["interval"])
+        runtime = AsyncRuntime(engine, replay.clock(), INTERVAL_MAP[meta["interval"]])
+        ticks = engine.metrics.summary("trading_tick_seconds")
+        before = ticks[0][1] if ticks else 0
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            asyncio.run(runtime.run())
+        elapsed = time.perf_counter() - start
+        engine.close()
+        journal.close()
+    ticks = engine.metrics.summary("trading_tick_seconds")[0][1] - before
+    return {"seconds": elapsed / max(ticks, 1), "ticks": ticks, "served": replay.served, "total": replay.total,
+            "misses": replay.misses}
+
+
+def run_benchmarks(sizes: list, repeat: int, seed: int, loop_max: int, ticks: int) -> list:
+    results = []
+
+    def record(name, size, stats):
+        results.append({"name": name, "size": size, **stats})
+        print(f"{name:<40} n={size:<9} {stats['seconds'] * 1000:>12.3f} ms")
+
+    for size in sizes:
+        df = generate_ohlcv(size, seed=seed)
+        close = df["close"]
+
+        for key, cls in STRATEGIES.items():
+            strategy = cls()
+            record(f"{key}.compute_signals", size, measure(lambda: strategy.compute_signals(df), repeat))
+
+            if size > 1000:
+                n_ticks = min(ticks, size - 1000)
+                for streaming in (True, False):
+                    mode = "streaming" if streaming else "recompute"
+                    stats = measure(tick_replay(cls, df, streaming, n_ticks), repeat)
+                    stats["seconds"] /= n_ticks
+                    stats["min"] /= n_ticks
+                    record(f"{key}.tick_{mode}", size, stats)
+
+            backtest_results = {}
+            for engine in ("vectorized", "loop"):
+                if engine == "loop" and size > loop_max:
+                    continue
+
+                def run_backtest():
+                    backtest_results[engine] = Backtester(cls(), df, engine=engine).run()
+                record(f"{key}.backtest_{engine}", size, measure(run_backtest, repeat))
+
+            trade_log = backtest_results["vectorized"]["trade_log"]
+            final_price = close.iloc[-1]
+            stats = measure(lambda: compute_metrics(trade_log, 1_000_000, final_price), repeat)
+            stats["trades"] = len(trade_log)
+            record(f"{key}.compute_metrics", size, stats)
+
+            bt = Backtester(cls(), df, engine="vectorized")
+            bt.run()
+            cash, position = bt.equity_arrays()
+            values, low = close.to_numpy(), df["low"].to_numpy()
+            record(f"{key}.compute_equity_metrics", size,
+                   measure(lambda: compute_equity_metrics(values, cash, position, 1_000_000, low=low), repeat))
+
+        detector = StopLossDetector()
+        tail = close.tail(10)
+        record("stop_loss.should_stop_loss", size, measure(lambda: detector.should_stop_loss(tail), repeat, number=1000))
+        values = close.to_numpy()
+        record("stop_loss.sharp_decline_mask", size, measure(lambda: detector.sharp_decline_mask(values), repeat))
+
+    return results
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return "unknown"
+
+
+def compare(current: list, baseline_path: str):
+    baseline = json.loads(Path(baseline_path).read_text())
+    previous = {(r["name"], r["size"]): r["seconds"] for r in baseline["results"]}
+    print(f"\nComparison with {baseline_path} ({baseline['meta']['commit']}):")
+    for r in current:
+        old = previous.get((r["name"], r["size"]))
+        if old:
+            print(f"{r['name']:<40} n={r['size']:<9} {old / r['seconds']:>8.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark for strategies, Backtester and metrics")
+    parser.add_argument("--sizes", type=int, nargs="*", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--loop-max", type=int, default=20_000, help="largest size to run the per-bar loop engine on")
+    parser.add_argument("--ticks", type=int, default=500, help="ticks replayed for per-tick latency")
+    parser.add_argument("--candle-minutes", type=int, default=1)
+    parser.add_argument("--output", help="result JSON path (default: benchmarks/results/bench-<commit>-<time>.json)")
+    parser.add_argument("--compare", help="previous result JSON to compare against")
+    parser.add_argument("--traffic", help="API traffic log (config.API_RECORD) to replay through the live path")
+    args = parser.parse_args()
+
+    StopLossDetector.candle_interval_minutes = args.candle_minutes
+    commit = git_commit()
+    results = run_benchmarks(args.sizes, args.repeat, args.seed, args.loop_max, args.ticks)
+    if args.traffic:
+        stats = traffic_replay(args.traffic)
+        results.append({"name": "traffic.tick", "size": stats["ticks"], **stats})
+        print(f"{'traffic.tick':<40} n={stats['ticks']:<9} {stats['seconds'] * 1000:>12.3f} ms "
+              f"(served {stats['served']}/{stats['total']}, not recorded {stats['misses']})")
+
+    output = Path(args.output) if args.output else \
+        RESULTS_DIR / f"bench-{commit}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+            "seed": args.seed,
+            "sizes": args.sizes,
+            "candle_minutes": args.candle_minutes,
+        },
+        "results": results,
+    }, indent=2))
+    print(f"\nSaved: {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
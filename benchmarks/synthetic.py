@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+
+def generate_ohlcv(n: int, seed: int = 42, start_price: float = 50_000_000, drift: float = 0.0,
+                   volatility: float = 0.002, jump_intensity: float = 0.001, jump_mean: float = -0.01,
+                   jump_std: float = 0.02, freq: str = "1min", start: str = "2024-01-01 09:00:00",
+                   tick: float | None = 1000.0) -> pd.DataFrame:
+    """
+    결정적(seed 고정) 합성 OHLCV — 기하 브라운 운동 + 포아송 점프
+    :param n: 봉 개수 (수백만 개까지 가능)
+    :param drift: 봉당 기대 로그수익률
+    :param volatility: 봉당 로그수익률 표준편차
+    :param jump_intensity: 봉당 점프 발생 확률
+    :param jump_mean: 점프 크기(로그수익률) 평균
+    :param jump_std: 점프 크기 표준편차
+    :param freq: 인덱스 간격 (pandas freq)
+    :param tick: 가격 호가 단위로 반올림 (None이면 반올림하지 않음)
+    """
+    rng = np.random.default_rng(seed)
+    log_returns = (drift - 0.5 * volatility ** 2) + volatility * rng.standard_normal(n)
+    jumps = rng.random(n) < jump_intensity
+    log_returns[jumps] += rng.normal(jump_mean, jump_std, jumps.sum())
+
+    close = start_price * np.exp(np.cumsum(log_returns))
+    open_ = np.empty(n)
+    open_[0] = start_price
+    open_[1:] = close[:-1]
+    wick = np.abs(rng.standard_normal((2, n))) * volatility * 0.5
+    high = np.maximum(open_, close) * (1 + wick[0])
+    low = np.minimum(open_, close) * (1 - wick[1])
+
+    if tick:
+        open_, high, low, close = (np.maximum(tick, np.round(x / tick) * tick) for x in (open_, high, low, close))
+
+    volume = rng.lognormal(mean=0.0, sigma=1.0, size=n)
+    index = pd.date_range(start=start, periods=n, freq=freq)
+    return pd.DataFrame({
+        "open": open_,
+        "high": high,
+        "low": low,
+        "close": close,
+        "volume": volume,
+        "value": volume * close,
+    }, index=index)
@@ -0,0 +1,2 @@
+from engine.trading_engine import TradingEngine, MarketState
+from engine.runtime import AsyncRuntime
@@ -0,0 +1,115 @@
+import asyncio
+import inspect
+import os
+import sys
+import threading
+
+
+class AsyncRuntime:
+    def __init__(self, engine, clock, interval_sec: int, on_command=None, on_tick=None, trade_stream=None):
+        """
+        매매 루프, 명령 입력, 실행기 백그라운드 작업(주문 체결 확인), 체결 스트림을 하나의 이벤트 루프에서 함께 돌림
+        :param engine: TradingEngine
+        :param clock: CandleClock
+        :param on_command: on_command(cmd) → False면 종료 (작업 스레드에서 호출)
+        :param on_tick: on_tick() — tick이 끝날 때마다 호출 (스냅샷/지표 파일 저장 등), 코루틴이면 await
+        :param trade_stream: UpbitTradeStream — start() 하지 않은 상태로 넘김
+        """
+        self.engine = engine
+        self.clock = clock
+        self.interval_sec = interval_sec
+        self.on_command = on_command
+        self.on_tick = on_tick
+        self.trade_stream = trade_stream
+        self.loop = None
+        self.stop_event = None
+
+    def stop(self):
+        """
+        다른 스레드에서도 호출 가능
+        """
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.stop_event.set)
+
+    async def _trading_loop(self):
+        executor = self.engine.executor
+        while not self.stop_event.is_set():
+            try:
+                await self.engine.tick_async()
+            except Exception as e:
+                print("[Error occurred]", e)
+            if self.on_tick is not None:
+                result = self.on_tick()
+                if inspect.isawaitable(result):
+                    await result
+            if not await executor.wait_for_candle_close_async(self.clock, self.interval_sec, self.stop_event):
+                break
+
+    async def _input_loop(self):
+        lines = asyncio.Queue()
+        self._attach_stdin(lines)
+        while True:
+            cmd = await lines.get()
+            if cmd is None:
+                return  # 입력 종료 (EOF) — 매매는 계속
+            cmd = cmd.strip().lower()
+            if cmd == "" or self.on_command is None:
+                continue
+            try:
+                keep_running = await asyncio.to_thread(self.on_command, cmd)
+            except Exception as e:
+                print(f"[Command Error] {cmd} — {e}")
+                continue
+            if keep_running is False:
+                self.stop_event.set()
+                return
+
+    def _attach_stdin(self, lines: asyncio.Queue):
+        """
+        표준 입력을 줄 단위로 lines에 넣음 (POSIX는 add_reader, 그 외에는 데몬 스레드)
+        """
+        try:
+            fd = sys.stdin.fileno()
+            buffer = bytearray()
+
+            def on_readable():
+                data = os.read(fd, 4096)
+                if not data:
+                    self.loop.remove_reader(fd)
+                    lines.put_nowait(None)
+                    return
+                buffer.extend(data)
+                while b"\n" in buffer:
+                    line, _, rest = bytes(buffer).partition(b"\n")
+                    buffer[:] = rest
+                    lines.put_nowait(line.decode(errors="replace"))
+
+            self.loop.add_reader(fd, on_readable)
+        except (AttributeError, OSError, NotImplementedError, ValueError):
+            def read_lines():
+                for line in sys.stdin:
+                    self.loop.call_soon_threadsafe(lines.put_nowait, line)
+                self.loop.call_soon_threadsafe(lines.put_nowait, None)
+
+            threading.Thread(target=read_lines, daemon=True).start()
+
+    async def run(self):
+        self.loop = asyncio.get_running_loop()
+        self.stop_event = asyncio.Event()
+        trading = asyncio.create_task(self._trading_loop())
+        background = [asyncio.create_task(self._input_loop())]
+        background += [asyncio.create_task(task) for task in self.engine.executor.background_tasks()]
+        if self.trade_stream is not None:
+            background.append(asyncio.create_task(self.trade_stream.run()))
+
+        try:
+            await trading
+        finally:
+            # 매매 루프가 끝나면 나머지 작업을 취소하고 정리될 때까지 기다림
+            for task in background:
+                task.cancel()
+            await asyncio.gather(*background, return_exceptions=True)
+            try:
+                self.loop.remove_reader(sys.stdin.fileno())
+            except (AttributeError, OSError, NotImplementedError, ValueError):
+                pass
@@ -0,0 +1,197 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from utils.instrumentation import TickProfiler, get_metrics
+from utils.performance import PerformanceTracker
+
+MIN_ORDER_KRW = 5000
+
+
+class MarketState:
+    def __init__(self, ticker: str, strategy):
+        self.ticker = ticker
+        self.currency = ticker.split("-")[1]
+        self.strategy = strategy
+        self.last_candle_time = None
+        self.last_price = None
+
+
+class TradingEngine:
+    def __init__(self, executor, markets: list, strategy_factory, interval: str, max_workers: int = 8,
+                 history: int = 1000, metrics=None, profiler: TickProfiler | None = None,
+                 performance: PerformanceTracker | None = None):
+        """
+        여러 KRW 마켓을 하나의 실행기/잔고로 함께 운용
+        :param executor: 실행기 (mock / upbit)
+        :param markets: 마켓 코드 목록 (예: ["KRW-BTC", "KRW-ETH"])
+        :param strategy_factory: 마켓마다 새 전략 인스턴스를 만드는 함수
+        :param interval: 봉 간격 (INTERVAL_MAP 키)
+        :param max_workers: 봉 조회를 동시에 보낼 최대 수
+        :param history: 전략에 넘길 최대 봉 개수
+        :param metrics: 단계별 지연 시간을 기록할 Metrics (기본 get_metrics())
+        :param profiler: tick 단위 cProfile 측정기 (input_listener의 profile 명령)
+        :param performance: 체결/봉마다 평가금액·손익을 갱신하는 추적기 (실행기에도 연결)
+        """
+        self.executor = executor
+        self.interval = interval
+        self.markets = {ticker: MarketState(ticker, strategy_factory()) for ticker in markets}
+        for state in self.markets.values():
+            base_interval = getattr(state.strategy, "base_interval", interval)
+            if base_interval != interval:
+                raise ValueError(f"{type(state.strategy).__name__} expects {base_interval} candles, "
+                                 f"engine interval is {interval}")
+        # 상위 봉 지표처럼 봉이 많이 필요한 전략은 처음부터 그만큼 받아 둠 (그 전까지는 신호 없음)
+        required = max(state.strategy.required_history() for state in self.markets.values()) if markets else 0
+        self.history = max(history, required)
+        executor.ensure_history(required)
+        self.pool = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(markets))))
+        self.metrics = metrics or get_metrics()
+        self.profiler = profiler or TickProfiler()
+        self.performance = performance or PerformanceTracker()
+        executor.performance = self.performance
+        self.metrics.describe("trading_stage_seconds", "Latency of each trading loop stage")
+        self.metrics.describe("trading_tick_seconds", "Latency of a whole trading loop tick")
+
+    @property
+    def tickers(self) -> list:
+        return list(self.markets)
+
+    def start_performance(self):
+        """
+        현재 잔고/보유 수량/평단가로 성과 추적 시작 (스냅샷에서 복원했으면 그대로 이어감)
+        """
+        if self.performance.started:
+            return
+        holdings = {t: (self.executor.get_coin(t), self.executor.get_avg_buy_price(t)) for t in self.tickers}
+        self.performance.start(self.executor.get_krw(), holdings)
+        for ticker, state in self.markets.items():
+            if state.last_price is not None:
+                self.performance.on_price(ticker, state.last_price)
+
+    def refresh_prices(self) -> dict:
+        """
+        전체 마켓 현재가를 한 번의 요청으로 조회
+        """
+        prices = self.executor.get_current_prices(self.tickers)
+        for ticker, price in prices.items():
+            if ticker in self.markets:
+                self.markets[ticker].last_price = price
+                self.performance.on_price(ticker, price)
+        return prices
+
+    def refresh_candles(self) -> dict:
+        """
+        마켓별 최근 봉을 동시에 갱신 (CandleCache 덕분에 마켓당 작은 요청 하나)
+        """
+        futures = {t: self.pool.submit(self._fetch_ohlcv, t) for t in self.tickers}
+        frames = {}
+        for ticker, future in futures.items():
+            try:
+                frames[ticker] = self._trim(future.result())
+            except Exception as e:
+                print(f"[Candle Error] {ticker} — {e}")
+        return frames
+
+    async def refresh_candles_async(self) -> dict:
+        loop = asyncio.get_running_loop()
+        tickers = self.tickers
+        results = await asyncio.gather(*(loop.run_in_executor(self.pool, self._fetch_ohlcv, t) for t in tickers),
+                                       return_exceptions=True)
+        frames = {}
+        for ticker, result in zip(tickers, results):
+            if isinstance(result, Exception):
+                print(f"[Candle Error] {ticker} — {result}")
+            else:
+                frames[ticker] = self._trim(result)
+        return frames
+
+    def _trim(self, df):
+        return df if len(df) <= self.history else df.tail(self.history)
+
+    def _fetch_ohlcv(self, ticker: str):
+        with self.metrics.timer("trading_stage_seconds", stage="fetch_ohlcv"):
+            return self.executor.fetch_ohlcv(ticker, self.interval)
+
+    def _stage(self, stage: str, fn, *args):
+        with self.metrics.timer("trading_stage_seconds", stage=stage):
+            return fn(*args)
+
+    def tick(self):
+        with self.profiler.tick():
+            start = time.perf_counter()
+            frames = self._stage("refresh_candles", self.refresh_candles)
+            self.process(frames)
+            self.metrics.observe("trading_tick_seconds", time.perf_counter() - start)
+
+    async def tick_async(self):
+        """
+        봉 조회(마켓별)와 잔고 조회를 동시에 보낸 뒤 신호 판단/주문은 작업 스레드에서 처리 (이벤트 루프를 막지 않음)
+        """
+        start = time.perf_counter()
+        with self.metrics.timer("trading_stage_seconds", stage="refresh_candles"):
+            frames, _ = await asyncio.gather(self.refresh_candles_async(), self._prefetch())
+        await asyncio.to_thread(self._process_profiled, frames)
+        self.metrics.observe("trading_tick_seconds", time.perf_counter() - start)
+
+    async def _prefetch(self):
+        try:
+            await asyncio.to_thread(self._stage, "prefetch", self.executor.prefetch)
+        except Exception as e:
+            print(f"[Prefetch Error] {e}")
+
+    def _process_profiled(self, frames: dict):
+        with self.profiler.tick():
+            self.process(frames)
+
+    def process(self, frames: dict):
+        """
+        마켓별 최근 봉으로 매수/매도 판단
+        """
+        quotes = []
+        for ticker, df in frames.items():
+            state = self.markets[ticker]
+            price = df.iloc[-1]['close']
+            state.last_price = price
+            state.last_candle_time = df.index[-1]
+            self.performance.on_price(ticker, price)
+            quotes.append(f"{ticker} {price:,.0f}")
+            try:
+                self.evaluate(state, df, price)
+            except Exception as e:
+                print(f"[Error occurred] {ticker} — {e}")
+        print(f"[{self.executor.now().strftime('%H:%M:%S')}] " + " | ".join(quotes))
+
+    def evaluate(self, state: MarketState, df, price: float):
+        strategy = state.strategy
+        ticker = state.ticker
+
+        # BUY LOGIC
+        should_buy, buy_strength = self._stage("should_buy", strategy.should_buy, df)
+        if should_buy:
+            krw_balance = self._stage("get_krw", self.executor.get_krw)
+            amount_krw = strategy.buy_amount(krw_balance, price, buy_strength)
+            if amount_krw >= MIN_ORDER_KRW:
+                self._stage("buy", self.executor.buy, ticker, amount_krw)
+
+        # SELL LOGIC
+        context = {
+            "current_price": price,
+            "avg_buy_price": self._stage("get_avg_buy_price", self.executor.get_avg_buy_price, ticker),
+            "btc_balance": self._stage("get_coin", self.executor.get_coin, ticker),
+        }
+
+        should_sell, reason, sell_strength = self._stage("should_sell", strategy.should_sell, df, context)
+        if should_sell:
+            amount = strategy.sell_amount(context["btc_balance"], price, sell_strength)
+            if amount * price >= MIN_ORDER_KRW:
+                print(f">> Selling {amount:.8f} {state.currency} due to reason: {reason} (strength: {sell_strength:.2f})")
+                self._stage("sell", self.executor.sell, ticker, amount)
+
+    def close(self):
+        """
+        봉 조회 스레드를 정리하고 실행기의 거래 기록 큐를 마저 써서 닫음 (모든 실행기)
+        """
+        self.pool.shutdown(wait=False)
+        journal = getattr(self.executor, "journal", None)
+        if journal is not None:
+            journal.close()
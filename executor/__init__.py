@@ -2,12 +2,43 @@
 
 from .upbit_executor import UpbitExecutor
 from .mock_executor import MockExecutor
+from .replay_executor import ReplayExecutor
+from .upbit_api import UPBIT_API_URL, UpbitClient
+from .api_traffic import TrafficRecorder, TrafficReplay
+from utils.candle_store import CandleStore
+import config
 from config import API_KEY, SECRET_KEY
 
+def make_client(name: str, access_key=None, secret_key=None) -> UpbitClient:
+    """
+    config.UPBIT_API_URL: 로컬 대체 서버 등으로 REST 주소를 바꿀 때
+    config.API_RECORD: 주고받은 요청/응답을 기록할 파일
+    config.API_REPLAY: 네트워크 대신 응답을 돌려줄 기록 파일 (API_REPLAY_SPEED: None이면 대기 없이, 숫자면 배속)
+    """
+    recorder = replay = None
+    if getattr(config, "API_REPLAY", None):
+        replay = TrafficReplay(config.API_REPLAY, speed=getattr(config, "API_REPLAY_SPEED", None))
+    elif getattr(config, "API_RECORD", None):
+        recorder = TrafficRecorder(config.API_RECORD, meta={
+            "executor": name, "markets": getattr(config, "MARKETS", ["KRW-BTC"]), "interval": config.INTERVAL})
+    return UpbitClient(access_key, secret_key, base_url=getattr(config, "UPBIT_API_URL", UPBIT_API_URL),
+                       recorder=recorder, replay=replay)
+
+
 def get_executor(name: str):
     if name == "upbit":
-        return UpbitExecutor(API_KEY, SECRET_KEY)
+        return UpbitExecutor(API_KEY, SECRET_KEY, client=make_client(name, API_KEY, SECRET_KEY))
     elif name == "mock":
-        return MockExecutor(start_krw=1_000_000)
+        return MockExecutor(start_krw=1_000_000, client=make_client(name))
+    elif name == "replay":
+        options = getattr(config, "REPLAY_OPTIONS", {})
+        if hasattr(config, "REPLAY_DATA"):
+            # config.REPLAY_DATA: 마켓 코드 → 봉 데이터 파일 (csv/parquet/pkl)
+            return ReplayExecutor.from_files(config.REPLAY_DATA, start_krw=1_000_000, interval=config.INTERVAL,
+                                             **options)
+        # 없으면 backfill.py로 받아 둔 로컬 저장소에서 MARKETS를 읽음
+        return ReplayExecutor.from_store(CandleStore(), getattr(config, "MARKETS", ["KRW-BTC"]), config.INTERVAL,
+                                         start=getattr(config, "REPLAY_START", None),
+                                         end=getattr(config, "REPLAY_END", None), start_krw=1_000_000, **options)
     else:
         raise ValueError(f"Unknown executor type: {name}")
\ No newline at end of file
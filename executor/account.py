@@ -0,0 +1,45 @@
+import threading
+import time
+
+
+class AccountSnapshot:
+    def __init__(self, fetch_balances, ttl: float = 5.0, time_fn=time.monotonic):
+        """
+        잔고 조회 결과를 한 번 받아 여러 조회(get_krw/get_btc/get_avg_buy_price)에 재사용
+        :param fetch_balances: 업비트 get_balances()와 같은 형식의 목록을 반환하는 함수
+        :param ttl: 캐시 유효 시간(초) — 체결 확인 시에는 invalidate()로 즉시 만료
+        """
+        self.fetch_balances = fetch_balances
+        self.ttl = ttl
+        self.time_fn = time_fn
+        self.balances = {}
+        self.fetched_at = None
+        self.lock = threading.Lock()
+
+    def invalidate(self):
+        with self.lock:
+            self.fetched_at = None
+
+    def _is_fresh(self) -> bool:
+        return self.fetched_at is not None and self.time_fn() - self.fetched_at < self.ttl
+
+    def get(self) -> dict:
+        """
+        :return: currency -> 잔고 항목 dict
+        """
+        with self.lock:
+            if not self._is_fresh():
+                balances = self.fetch_balances()
+                if not isinstance(balances, list):
+                    raise RuntimeError(f"Unexpected balances response: {balances}")
+                self.balances = {b['currency']: b for b in balances}
+                self.fetched_at = self.time_fn()
+            return self.balances
+
+    def balance(self, currency: str) -> float:
+        entry = self.get().get(currency)
+        return float(entry['balance']) if entry else 0.0
+
+    def avg_buy_price(self, currency: str) -> float:
+        entry = self.get().get(currency)
+        return float(entry['avg_buy_price']) if entry else 0.0
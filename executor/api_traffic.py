@@ -0,0 +1,221 @@
+import asyncio
+import json
+import pickle
+import struct
+import threading
+import time
+import zlib
+from collections import defaultdict, deque
+from pathlib import Path
+from utils.candle_clock import CandleClock
+
+FILE_MAGIC = b"UPBTRAFFIC1\n"
+RECORD_HEADER = struct.Struct("<dfI")  # 요청 시각(epoch 초), 응답까지 걸린 시간(초), 본문 길이
+
+
+def request_key(method: str, path: str, params: dict | None, data: dict | None) -> tuple:
+    # 같은 요청인지 비교할 때 쓰는 키 (값은 문자열로 맞춤, 인증 헤더와 실행마다 새로 만드는 주문 identifier는 포함하지 않음)
+    def normalize(values):
+        return tuple(sorted((k, str(v)) for k, v in (values or {}).items() if k != "identifier"))
+    return method, path, normalize(params), normalize(data)
+
+
+class RecordedResponse:
+    __slots__ = ("status_code", "headers", "content")
+
+    def __init__(self, status_code: int, headers: dict, content: bytes):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class TrafficRecord:
+    __slots__ = ("ts", "elapsed", "kind", "key", "status_code", "headers", "content", "meta")
+
+    def __init__(self, ts, elapsed, kind, key=None, status_code=None, headers=None, content=None, meta=None):
+        self.ts = ts
+        self.elapsed = elapsed
+        self.kind = kind  # "meta" | "http"
+        self.key = key
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.meta = meta
+
+
+def read_traffic(path: str):
+    """
+    기록 파일의 레코드를 순서대로 읽음 (기록 중 종료되어 잘린 마지막 레코드는 무시)
+    """
+    with open(path, "rb") as f:
+        if f.read(len(FILE_MAGIC)) != FILE_MAGIC:
+            raise ValueError(f"Not an API traffic log: {path}")
+        while True:
+            header = f.read(RECORD_HEADER.size)
+            if len(header) < RECORD_HEADER.size:
+                return
+            ts, elapsed, length = RECORD_HEADER.unpack(header)
+            blob = f.read(length)
+            if len(blob) < length:
+                return
+            payload = pickle.loads(zlib.decompress(blob))
+            if payload[0] == "meta":
+                yield TrafficRecord(ts, elapsed, "meta", meta=payload[1])
+            else:
+                _, key, status_code, headers, content = payload
+                yield TrafficRecord(ts, elapsed, "http", key, status_code, headers, content)
+
+
+class TrafficRecorder:
+    def __init__(self, path: str, meta: dict | None = None):
+        """
+        UpbitClient가 주고받은 요청/응답을 추가 전용 바이너리 로그로 기록 (레코드마다 zlib 압축, 쓰기 즉시 flush)
+        :param meta: 세션 시작 레코드로 남길 실행 정보 (마켓, 봉 간격, 실행기 종류 등)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        new_file = not self.path.exists() or self.path.stat().st_size == 0
+        self.file = open(self.path, "ab")
+        if new_file:
+            self.file.write(FILE_MAGIC)
+        self.lock = threading.Lock()
+        self._write(time.time(), 0.0, ("meta", meta or {}))
+
+    def _write(self, ts: float, elapsed: float, payload: tuple):
+        blob = zlib.compress(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+        with self.lock:
+            self.file.write(RECORD_HEADER.pack(ts, elapsed, len(blob)) + blob)
+            self.file.flush()
+
+    def record(self, ts: float, elapsed: float, method: str, path: str, params: dict | None, data: dict | None,
+               resp):
+        headers = {"Remaining-Req": resp.headers.get("Remaining-Req", "")}
+        self._write(ts, elapsed, ("http", request_key(method, path, params, data), resp.status_code, headers,
+                                  resp.content))
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+
+class TrafficReplay:
+    def __init__(self, path: str, speed: float | None = None, session: int = -1):
+        """
+        기록한 응답을 같은 요청에 기록된 순서대로 돌려줌 (네트워크 없음)
+        :param speed: None이면 기다리지 않고 바로 응답하고 시계도 바로 다음 봉으로 넘김,
+                      숫자면 기록된 시각 간격을 speed배 빠르게 재현 (1.0 = 실제 속도)
+        :param session: 재생할 세션 번호 (파일에 여러 번 기록했을 때, 기본은 마지막)
+        """
+        sessions = []
+        for record in read_traffic(path):
+            if record.kind == "meta":
+                sessions.append((record, []))
+            elif sessions:
+                sessions[-1][1].append(record)
+        if not sessions:
+            raise ValueError(f"Empty API traffic log: {path}")
+        meta_record, records = sessions[session]
+        self.meta = meta_record.meta
+        self.speed = speed
+        self.responses = defaultdict(deque)
+        for record in records:
+            self.responses[record.key].append(record)
+        self.total = len(records)
+        self.served = 0
+        self.misses = 0
+        self.start_ts = records[0].ts if records else meta_record.ts
+        self.cursor = self.start_ts  # speed=None일 때의 가상 시각
+        self.real_start = time.monotonic()
+        self.lock = threading.Lock()
+
+    @property
+    def remaining(self) -> int:
+        return self.total - self.served
+
+    def now(self) -> float:
+        """
+        재생 중인 가상 시각 (기록 당시의 epoch 초)
+        """
+        if self.speed is None:
+            return self.cursor
+        return self.start_ts + (time.monotonic() - self.real_start) * self.speed
+
+    def advance(self, seconds: float):
+        # speed=None일 때 대기 대신 가상 시각을 넘김
+        with self.lock:
+            self.cursor += seconds
+
+    def respond(self, method: str, path: str, params: dict | None, data: dict | None) -> RecordedResponse:
+        key = request_key(method, path, params, data)
+        with self.lock:
+            queue = self.responses.get(key)
+            record = queue.popleft() if queue else None
+            if record is None:
+                self.misses += 1
+                first_miss = self.misses == 1
+            else:
+                self.served += 1
+                if self.speed is None:
+                    self.cursor = max(self.cursor, record.ts + record.elapsed)
+        if record is None:
+            if first_miss:
+                print(f"[API Replay Warning] not recorded: {method} {path} {params or data or ''} "
+                      f"— the recorded run made different requests")
+            body = json.dumps({"error": {"name": "not_recorded", "message": f"{method} {path}"}}).encode()
+            return RecordedResponse(404, {}, body)
+        if self.speed is not None:
+            # 기록된 응답 시각까지 기다림
+            delay = (record.ts + record.elapsed - self.now()) / self.speed
+            if delay > 0:
+                time.sleep(delay)
+        return RecordedResponse(record.status_code, record.headers, record.content)
+
+    def clock(self, grace_sec: float = 0.05):
+        return TrafficClock(self, grace_sec)
+
+
+class TrafficClock(CandleClock):
+    def __init__(self, replay: TrafficReplay, grace_sec: float = 0.05):
+        """
+        재생 시각을 따르는 CandleClock — speed=None이면 봉 마감 대기 없이 가상 시각만 넘김
+        """
+        if replay.speed is None:
+            sleep_fn = replay.advance
+        else:
+            sleep_fn = lambda seconds: time.sleep(seconds / replay.speed)
+        super().__init__(grace_sec, time_fn=replay.now, sleep_fn=sleep_fn)
+        self.replay = replay
+
+    def observe_server_time(self, server_ts: float, local_ts: float | None = None):
+        pass  # 기록된 시각을 그대로 씀
+
+    def wait_for_close(self, interval_sec: int, should_stop=None, max_sleep: float = 0.5) -> bool:
+        if self.replay.remaining == 0:
+            return False  # 기록이 끝나면 종료
+        if self.replay.speed is None:
+            if should_stop is not None and should_stop():
+                return False
+            self.replay.advance(self.next_close(interval_sec) + self.grace_sec - self.now())
+            return True
+        return super().wait_for_close(interval_sec, should_stop, max_sleep)
+
+    async def wait_for_close_async(self, interval_sec: int, stop_event: asyncio.Event) -> bool:
+        if self.replay.remaining == 0:
+            return False
+        if self.replay.speed is not None:
+            return await super().wait_for_close_async(interval_sec, stop_event)
+        await asyncio.sleep(0)
+        if stop_event.is_set():
+            return False
+        self.replay.advance(self.next_close(interval_sec) + self.grace_sec - self.now())
+        return True
+
+    def to_real_seconds(self, seconds: float) -> float:
+        return seconds / self.replay.speed
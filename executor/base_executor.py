@@ -1,7 +1,13 @@
+import asyncio
 from abc import ABC, abstractmethod
+from datetime import datetime
 import pandas as pd
+from executor.upbit_api import UpbitClient, get_client
 
 class Executor(ABC):
+    client: UpbitClient | None = None  # 없으면 공유 기본 클라이언트 사용
+    performance = None  # PerformanceTracker — TradingEngine이 연결
+
     @abstractmethod
     def fetch_ohlcv(self, ticker: str, interval: str) -> pd.DataFrame:
         pass
@@ -15,15 +21,76 @@ class Executor(ABC):
         pass
 
     @abstractmethod
+    def get_balance(self, currency: str) -> float:
+        pass
+
     def get_btc(self) -> float:
+        return self.get_balance("BTC")
+
+    def get_coin(self, ticker: str) -> float:
+        # e.g., "ETH" from "KRW-ETH"
+        return self.get_balance(ticker.split("-")[1])
+
+    def get_current_prices(self, tickers: list) -> dict:
+        # 여러 마켓 현재가를 요청 한 번으로 조회
+        prices = (self.client or get_client()).get_current_price(list(tickers))
+        return prices if prices is not None else {}
+
+    def now(self) -> datetime:
+        return datetime.now()
+
+    def wait_for_candle_close(self, clock, interval_sec: int, should_stop=None) -> bool:
+        """
+        다음 봉 마감까지 대기 (ReplayExecutor는 대기 없이 시뮬레이션 시계를 넘김)
+        :return: 계속 진행할 수 있으면 True
+        """
+        return clock.wait_for_close(interval_sec, should_stop=should_stop)
+
+    async def wait_for_candle_close_async(self, clock, interval_sec: int, stop_event: asyncio.Event) -> bool:
+        """
+        wait_for_candle_close의 asyncio 버전 — stop_event가 설정되면 즉시 False
+        """
+        return await clock.wait_for_close_async(interval_sec, stop_event)
+
+    def prefetch(self):
+        """
+        tick 시작 때 봉 조회와 동시에 미리 받아 둘 것 (잔고 등), 기본은 없음
+        """
+
+    def background_tasks(self) -> list:
+        """
+        런타임 이벤트 루프에서 함께 돌릴 코루틴 목록 (주문 체결 확인 등)
+        """
+        return []
+
+    def state_dict(self) -> dict:
+        """
+        재시작 후 이어서 운용하기 위해 저장할 상태 (utils.snapshot), 기본은 없음
+        """
+        return {}
+
+    def load_state(self, state: dict):
         pass
 
+    def ensure_history(self, bars: int):
+        """
+        전략이 신호를 내는 데 필요한 봉 개수 — fetch_ohlcv가 처음부터 그만큼 돌려주도록 준비
+        """
+
+    def record_fill(self, ticker: str, side: str, price: float, amount: float, fee: float = 0.0):
+        """
+        체결을 실시간 성과 추적기에 반영
+        :param fee: 원화 기준 수수료
+        """
+        if self.performance is not None:
+            self.performance.on_fill(ticker, side, price, amount, fee)
+
     @abstractmethod
     def buy(self, ticker: str, amount_krw: float):
         pass
 
     @abstractmethod
-    def sell(self, ticker: str, amount_btc: float):
+    def sell(self, ticker: str, amount: float):
         pass
 
     @abstractmethod
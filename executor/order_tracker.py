@@ -0,0 +1,197 @@
+import asyncio
+import threading
+import time
+from utils.instrumentation import get_metrics
+
+TERMINAL_STATES = ("done", "cancel")
+
+
+def order_vwap(order: dict) -> tuple[float, float]:
+    """
+    주문의 trades 목록으로 거래량 가중 평균 체결가 계산
+    :return: (평균 체결가, 총 체결 수량)
+    """
+    total_price = 0.0
+    total_volume = 0.0
+    for t in order.get('trades', []):
+        volume = float(t['volume'])
+        total_price += float(t['price']) * volume
+        total_volume += volume
+    if total_volume <= 0:
+        return 0.0, 0.0
+    return total_price / total_volume, total_volume
+
+
+class PendingOrder:
+    __slots__ = ("uuid", "trade_type", "ticker", "attempts", "next_check", "submitted_at")
+
+    def __init__(self, uuid, trade_type, ticker, next_check, submitted_at):
+        self.uuid = uuid
+        self.trade_type = trade_type
+        self.ticker = ticker
+        self.attempts = 0
+        self.next_check = next_check
+        self.submitted_at = submitted_at
+
+
+class OrderTracker:
+    def __init__(self, api, on_complete, limiter=None, base_delay: float = 0.3, max_delay: float = 10.0,
+                 batch_size: int = 100, time_fn=time.monotonic, metrics=None):
+        """
+        미체결 주문을 모아 한 번에 조회하고, 끝난 주문만 상세 조회해 on_complete로 넘긴다.
+        :param api: get_orders_by_uuids(uuids) / get_order(uuid) 를 가진 객체 (UpbitClient)
+        :param on_complete: on_complete(order_detail, trade_type, ticker)
+        :param limiter: TokenBucket — 요청 전 acquire(), 응답의 Remaining-Req로 update_remaining()
+                        (None이면 api가 요청 제한을 맡음)
+        :param base_delay: 첫 재조회까지의 대기 시간(초), 이후 주문별로 두 배씩 증가
+        :param max_delay: 재조회 대기 시간 상한(초)
+        :param batch_size: 한 번에 조회할 최대 uuid 수
+        :param metrics: 접수→체결 확인 시간(order_fill_seconds)과 처리 지연을 기록할 Metrics
+        """
+        self.api = api
+        self.on_complete = on_complete
+        self.limiter = limiter
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.batch_size = batch_size
+        self.time_fn = time_fn
+        self.metrics = metrics or get_metrics()
+        self.orders = {}
+        self.cond = threading.Condition()
+        self.running = False
+        self.loop = None
+        self.wakeup = None
+
+    def track(self, trade_type: str, uuid: str, ticker: str):
+        now = self.time_fn()
+        with self.cond:
+            if uuid not in self.orders:
+                self.orders[uuid] = PendingOrder(uuid, trade_type, ticker, now + self.base_delay, now)
+            self.cond.notify()
+            if self.loop is not None:
+                self.loop.call_soon_threadsafe(self.wakeup.set)
+
+    def pending(self) -> list[tuple[str, str, str]]:
+        with self.cond:
+            return [(o.trade_type, o.uuid, o.ticker) for o in self.orders.values()]
+
+    def start(self):
+        self.running = True
+        threading.Thread(target=self._run, daemon=True).start()
+        return self
+
+    def stop(self):
+        with self.cond:
+            self.running = False
+            self.cond.notify()
+            if self.loop is not None:
+                self.loop.call_soon_threadsafe(self.wakeup.set)
+
+    async def run_async(self):
+        """
+        스레드 대신 이벤트 루프에서 동작 (조회 요청만 작업 스레드에서), 취소하면 종료
+        """
+        self.loop = asyncio.get_running_loop()
+        self.wakeup = asyncio.Event()
+        self.running = True
+        try:
+            while self.running:
+                self.wakeup.clear()
+                with self.cond:
+                    due, timeout = self._collect_due(self.time_fn())
+                if due:
+                    try:
+                        await asyncio.to_thread(self.check, due)
+                    except Exception as e:
+                        print(f"[Async Order Check Error] {e}")
+                    continue
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self.running = False
+            self.loop = None
+
+    def _collect_due(self, now: float) -> tuple[list[PendingOrder], float | None]:
+        # cond를 잡은 상태에서 호출: (지금 조회할 주문, 다음 조회까지 남은 시간)
+        due = [o for o in self.orders.values() if o.next_check <= now]
+        if due:
+            due.sort(key=lambda o: o.next_check)
+            return due[:self.batch_size], 0.0
+        if self.orders:
+            return [], min(o.next_check for o in self.orders.values()) - now
+        return [], None
+
+    def _backoff(self, order: PendingOrder, now: float):
+        order.attempts += 1
+        order.next_check = now + min(self.max_delay, self.base_delay * (2 ** order.attempts))
+
+    def _due_orders(self) -> list[PendingOrder]:
+        # 조회할 시각이 된 주문이 생길 때까지 대기
+        with self.cond:
+            while self.running:
+                due, timeout = self._collect_due(self.time_fn())
+                if due:
+                    return due
+                self.cond.wait(timeout)
+            return []
+
+    def _run(self):
+        while self.running:
+            due = self._due_orders()
+            if due:
+                try:
+                    self.check(due)
+                except Exception as e:
+                    print(f"[Async Order Check Error] {e}")
+
+    def _acquire(self):
+        if self.limiter is not None:
+            self.limiter.acquire()
+
+    def _update_remaining(self, remaining):
+        if self.limiter is not None:
+            self.limiter.update_remaining(remaining)
+
+    def check(self, due: list[PendingOrder]):
+        self._acquire()
+        try:
+            orders, remaining = self.api.get_orders_by_uuids([o.uuid for o in due])
+            self._update_remaining(remaining)
+        except Exception as e:
+            self._update_remaining(getattr(e, "remaining", None))
+            now = self.time_fn()
+            with self.cond:
+                for order in due:
+                    self._backoff(order, now)
+            raise
+
+        states = {o['uuid']: o for o in orders}
+        finished = []
+        now = self.time_fn()
+        with self.cond:
+            for order in due:
+                summary = states.get(order.uuid)
+                if summary is not None and summary.get('state') in TERMINAL_STATES:
+                    finished.append(order)
+                else:
+                    self._backoff(order, now)
+
+        for order in finished:
+            # 목록 조회에는 trades가 없으므로 끝난 주문만 상세 조회
+            self._acquire()
+            try:
+                detail, remaining = self.api.get_order(order.uuid)
+                self._update_remaining(remaining)
+            except Exception as e:
+                print(f"[Order Detail Error] UUID: {order.uuid} — {e}")
+                with self.cond:
+                    self._backoff(order, self.time_fn())
+                continue
+
+            with self.cond:
+                self.orders.pop(order.uuid, None)
+            self.metrics.observe("order_fill_seconds", self.time_fn() - order.submitted_at, side=order.trade_type)
+            with self.metrics.timer("trading_stage_seconds", stage="process_order"):
+                self.on_complete(detail, order.trade_type, order.ticker)
@@ -0,0 +1,251 @@
+import asyncio
+import os
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from executor.base_executor import Executor
+from utils.intervals import INTERVAL_MAP
+from utils.ledger import PositionLedger
+from utils.trade_journal import TradeJournal
+
+
+def load_candles(path: str) -> pd.DataFrame:
+    """
+    pyupbit.get_ohlcv 형식(시간 인덱스 + open/high/low/close/volume)의 파일을 읽음
+    """
+    path = Path(path)
+    if path.suffix == ".parquet":
+        df = pd.read_parquet(path)
+    elif path.suffix in (".pkl", ".pickle"):
+        df = pd.read_pickle(path)
+    else:
+        df = pd.read_csv(path, index_col=0, parse_dates=True)
+    return df.sort_index()
+
+
+class ReplayOrder:
+    __slots__ = ("uuid", "ticker", "side", "remaining", "ready_time")
+
+    def __init__(self, uuid, ticker, side, remaining, ready_time):
+        self.uuid = uuid
+        self.ticker = ticker
+        self.side = side
+        self.remaining = remaining  # BUY: 남은 원화 예산, SELL: 남은 수량
+        self.ready_time = ready_time
+
+
+class ReplayExecutor(Executor):
+    def __init__(self, data: dict, start_krw: float = 1_000_000, interval: str = "minute1", warmup: int = 200,
+                 history: int = 1000, latency_sec: float = 0.0, slippage_bps: float = 0.0,
+                 max_participation: float | None = None, fee_rate: float = 0.0005, journal=None):
+        """
+        저장된 봉 데이터를 시뮬레이션 시계에 맞춰 내보내는 실행기 (대기 없이 봉 단위로 진행)
+        시계는 마지막으로 공개된 봉의 마감 시각이며, wait_for_candle_close()가 다음 봉으로 넘긴다.
+        :param data: 마켓 코드 → OHLCV DataFrame
+        :param warmup: 처음부터 공개해 둘 봉 개수 (지표 계산용)
+        :param history: fetch_ohlcv가 돌려줄 최대 봉 개수
+        :param latency_sec: 주문 접수부터 체결 가능 시점까지의 지연. 0이면 현재가로 즉시 체결,
+                            그 외에는 지연이 끝나는 봉의 시가로 체결
+        :param slippage_bps: 체결가 불리 방향 슬리피지 (1bp = 0.01%)
+        :param max_participation: 봉 하나에서 체결할 수 있는 최대 수량 비율 (봉 거래량 대비), 남은 수량은 다음 봉으로
+        :param fee_rate: 업비트 수수료율 (매수는 원화에 더해지고 매도는 대금에서 차감)
+        :param journal: 기본은 실행마다 새 파일 (logs/replay/trades-<시각>-<pid>.db) — 이전 리플레이 기록과 섞이지 않음
+        """
+        self.data = {ticker: df for ticker, df in data.items()}
+        self.times = {ticker: df.index.values.astype("datetime64[ns]") for ticker, df in self.data.items()}
+        self.columns = {ticker: {c: df[c].to_numpy(dtype=float) for c in ("open", "close", "volume")}
+                        for ticker, df in self.data.items()}
+        self.timeline = np.unique(np.concatenate(list(self.times.values())))
+        self.interval_ns = np.timedelta64(INTERVAL_MAP[interval], "s").astype("timedelta64[ns]")
+        self.step = min(max(warmup, 1), len(self.timeline)) - 1
+        self.history = history
+        self.latency = np.timedelta64(int(latency_sec * 1e9), "ns")
+        self.slippage = slippage_bps / 10_000
+        self.max_participation = max_participation
+        self.fee_rate = fee_rate
+
+        self.krw = start_krw
+        self.coins = {}  # currency -> 주문 가능 수량
+        self.ledgers = {}  # ticker -> PositionLedger
+        self.pending = []
+        self.uuid_counter = 0
+        self.journal = journal or TradeJournal(
+            f"logs/replay/trades-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.db")
+
+    @classmethod
+    def from_files(cls, paths: dict, **kwargs):
+        return cls({ticker: load_candles(path) for ticker, path in paths.items()}, **kwargs)
+
+    @classmethod
+    def from_store(cls, store, markets: list, interval: str = "minute1", start=None, end=None, **kwargs):
+        return cls({ticker: store.load(ticker, interval, start, end) for ticker in markets}, interval=interval,
+                   **kwargs)
+
+    # --- 시뮬레이션 시계 ---
+
+    @property
+    def bar_time(self):
+        return self.timeline[self.step]
+
+    @property
+    def finished(self) -> bool:
+        return self.step >= len(self.timeline) - 1
+
+    def now(self) -> datetime:
+        return pd.Timestamp(self.bar_time + self.interval_ns).to_pydatetime()
+
+    def _position(self, ticker) -> int:
+        # ticker에서 현재 시각까지 공개된 봉 개수
+        return int(np.searchsorted(self.times[ticker], self.bar_time, side="right"))
+
+    def wait_for_candle_close(self, clock, interval_sec: int, should_stop=None) -> bool:
+        if self.finished:
+            return False
+        self.step += 1
+        self._fill_pending()
+        return True
+
+    async def wait_for_candle_close_async(self, clock, interval_sec: int, stop_event) -> bool:
+        # 대기 없이 넘기되 명령 입력 등 다른 작업이 돌 수 있도록 한 번 양보
+        await asyncio.sleep(0)
+        if stop_event.is_set():
+            return False
+        return self.wait_for_candle_close(clock, interval_sec)
+
+    # --- 시세 ---
+
+    def ensure_history(self, bars: int):
+        # 매매 시작 전에만 호출 — 공개해 둘 봉(warmup)과 fetch_ohlcv 길이를 늘림
+        self.history = max(self.history, bars)
+        self.step = max(self.step, min(bars, len(self.timeline)) - 1)
+
+    def fetch_ohlcv(self, ticker, interval="minute1"):
+        end = self._position(ticker)
+        return self.data[ticker].iloc[max(0, end - self.history):end]
+
+    def get_current_price(self, ticker):
+        end = self._position(ticker)
+        return self.columns[ticker]["close"][end - 1] if end else None
+
+    def get_current_prices(self, tickers: list) -> dict:
+        return {ticker: self.get_current_price(ticker) for ticker in tickers}
+
+    # --- 잔고 ---
+
+    def get_balance(self, currency):
+        if currency == "KRW":
+            return self.krw
+        return self.coins.get(currency, 0.0)
+
+    def get_krw(self):
+        return self.krw
+
+    def ledger(self, ticker) -> PositionLedger:
+        if ticker not in self.ledgers:
+            self.ledgers[ticker] = PositionLedger()
+        return self.ledgers[ticker]
+
+    def get_avg_buy_price(self, ticker):
+        return self.ledger(ticker).avg_price
+
+    # --- 주문 ---
+
+    def _submit(self, ticker, side, remaining):
+        self.uuid_counter += 1
+        order = ReplayOrder(f"replay-{self.uuid_counter:06d}", ticker, side, remaining,
+                            self.bar_time + self.interval_ns + self.latency)
+        if self.latency == 0:
+            # 지연이 없으면 현재가로 즉시 체결 (참여율 제한을 넘는 수량은 다음 봉으로)
+            end = self._position(ticker)
+            self._fill(order, self.columns[ticker]["close"][end - 1], self.columns[ticker]["volume"][end - 1])
+        if order.remaining > 0:
+            self.pending.append(order)
+        return order.uuid
+
+    def buy(self, ticker, amount_krw):
+        # 첫 봉이 나오기 전인 마켓은 체결할 가격이 없음
+        if self._position(ticker) == 0 or amount_krw > self.krw or amount_krw < 5000:
+            return
+        self.krw -= amount_krw  # 주문 금액 잠금
+        return self._submit(ticker, "BUY", amount_krw)
+
+    def sell(self, ticker, amount):
+        currency = ticker.split("-")[1]
+        price = self.get_current_price(ticker)
+        if price is None or amount > self.coins.get(currency, 0.0) or amount * price < 5000:
+            return
+        self.coins[currency] -= amount  # 주문 수량 잠금
+        return self._submit(ticker, "SELL", amount)
+
+    def _fill_pending(self):
+        bar_time = self.bar_time
+        still_pending = []
+        for order in self.pending:
+            times = self.times[order.ticker]
+            end = self._position(order.ticker)
+            # 지연이 끝나는 시점이 이번 봉 안(또는 이전)이고 그 마켓의 봉이 이번 시각에 존재해야 체결
+            if end and times[end - 1] == bar_time and order.ready_time < bar_time + self.interval_ns:
+                self._fill(order, self.columns[order.ticker]["open"][end - 1],
+                           self.columns[order.ticker]["volume"][end - 1])
+            if order.remaining > 0:
+                still_pending.append(order)
+        self.pending = still_pending
+
+    def _fill(self, order: ReplayOrder, price: float, bar_volume: float):
+        ticker = order.ticker
+        currency = ticker.split("-")[1]
+        ledger = self.ledger(ticker)
+        cap = self.max_participation * bar_volume if self.max_participation is not None else np.inf
+
+        if order.side == "BUY":
+            price *= 1 + self.slippage
+            volume = min(order.remaining / (price * (1 + self.fee_rate)), cap)
+            if volume <= 0:
+                return
+            fee = volume * price * self.fee_rate
+            spent = volume * price + fee
+            order.remaining = max(0.0, order.remaining - spent)
+            if order.remaining < 1e-6:
+                # 반올림 잔액은 체결 완료로 보고 돌려줌
+                self.krw += order.remaining
+                order.remaining = 0.0
+            self.coins[currency] = self.coins.get(currency, 0.0) + volume
+            ledger.buy(price, volume, fee)
+            self.record_fill(ticker, "BUY", price, volume, fee)
+            self.journal.record_trade(ticker, "BUY", price, volume, avg_buy_price=ledger.avg_price,
+                                      total_coin=ledger.position, total_krw=ledger.cost_basis,
+                                      uuid=order.uuid, ts=self.now().timestamp())
+        else:
+            price *= 1 - self.slippage
+            volume = min(order.remaining, cap)
+            if volume <= 0:
+                return
+            avg_price = ledger.avg_price
+            profit = ((price - avg_price) / avg_price) * 100 if avg_price > 0 else 0.0
+            fee = volume * price * self.fee_rate
+            self.krw += volume * price - fee
+            order.remaining -= volume
+            ledger.sell(price, volume, fee)
+            self.record_fill(ticker, "SELL", price, volume, fee)
+            self.journal.record_trade(ticker, "SELL", price, volume, profit=profit, avg_buy_price=ledger.avg_price,
+                                      total_coin=ledger.position, total_krw=ledger.cost_basis,
+                                      uuid=order.uuid, ts=self.now().timestamp())
+
+    def summary(self) -> dict:
+        """
+        현재가 기준 평가금액 (미체결 주문의 잠긴 금액/수량 포함)
+        """
+        locked_krw = sum(o.remaining for o in self.pending if o.side == "BUY")
+        value = self.krw + locked_krw
+        for ticker in self.data:
+            price = self.get_current_price(ticker) or 0.0
+            locked = sum(o.remaining for o in self.pending if o.side == "SELL" and o.ticker == ticker)
+            value += (self.coins.get(ticker.split("-")[1], 0.0) + locked) * price
+        return {
+            "time": self.now(),
+            "krw": self.krw,
+            "total_value": value,
+            "realized_pnl": sum(l.realized_pnl for l in self.ledgers.values()),
+            "pending_orders": len(self.pending),
+        }
@@ -0,0 +1,337 @@
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from urllib.parse import urlencode
+import pandas as pd
+import pyupbit
+import requests
+from requests.adapters import HTTPAdapter
+from utils.instrumentation import get_metrics
+from utils.rate_limit import TokenBucket, parse_remaining_req
+
+UPBIT_API_URL = "https://api.upbit.com"
+# 요청 그룹별 초당 한도 (시세 API는 그룹마다 초당 10회, 주문 생성은 초당 8회, 그 외 거래소 API는 초당 30회)
+GROUP_RATES = {
+    "market": 10,
+    "candles": 10,
+    "trades": 10,
+    "ticker": 10,
+    "orderbook": 10,
+    "order": 8,
+    "default": 30,
+}
+RETRY_STATUS = (429, 500, 502, 503, 504)
+# GET 외 요청(주문 생성 등)은 접수 전에 거절된 것이 확실한 429만 재시도 — 응답 유실/5xx는 중복 주문이 될 수 있음
+UNSENT_STATUS = (429,)
+CANDLE_COLUMNS = {
+    "opening_price": "open",
+    "high_price": "high",
+    "low_price": "low",
+    "trade_price": "close",
+    "candle_acc_trade_volume": "volume",
+    "candle_acc_trade_price": "value",
+}
+
+
+class UpbitAPIError(Exception):
+    def __init__(self, status_code: int, body: str, remaining: dict | None = None):
+        super().__init__(f"HTTP {status_code}: {body}")
+        self.status_code = status_code
+        self.remaining = remaining
+
+
+def candle_path(interval: str) -> str:
+    # pyupbit interval 이름 → 캔들 API 경로
+    if interval.startswith("minute"):
+        return f"/v1/candles/minutes/{interval[len('minute'):]}"
+    if interval in ("day", "week", "month"):
+        return f"/v1/candles/{interval}s"
+    raise ValueError(f"Unknown interval: {interval}")
+
+
+def get_candles(market: str, interval: str, to: str | None = None, count: int = 200, session=None,
+                base_url: str = UPBIT_API_URL, timeout: float = 5.0):
+    """
+    캔들 한 페이지 조회 (pyupbit.get_ohlcv와 같은 형식, 오류를 None으로 숨기지 않음)
+    :param to: 이 시각(UTC, "YYYY-MM-DD HH:MM:SS") 이전 봉부터, None이면 최신
+    :return: (KST 인덱스 오름차순 DataFrame, Remaining-Req)
+    """
+    query = {"market": market, "count": count}
+    if to is not None:
+        query["to"] = to
+    with get_metrics().api_call("/v1/candles"):
+        resp = (session or requests).get(f"{base_url}{candle_path(interval)}", params=query, timeout=timeout)
+        remaining = parse_remaining_req(resp.headers.get("Remaining-Req", ""))
+        if resp.status_code >= 400:
+            raise UpbitAPIError(resp.status_code, resp.text, remaining)
+    return candles_frame(resp.json()), remaining
+
+
+def candles_frame(contents: list) -> pd.DataFrame:
+    index = pd.to_datetime([c["candle_date_time_kst"] for c in contents])
+    df = pd.DataFrame(contents, columns=list(CANDLE_COLUMNS), index=index).rename(columns=CANDLE_COLUMNS)
+    return df.sort_index()
+
+
+def request_group(method: str, path: str) -> str:
+    """
+    요청 경로 → 업비트 요청 그룹 (그룹마다 한도가 따로 계산됨)
+    """
+    if path.startswith("/v1/candles"):
+        return "candles"
+    if path.startswith("/v1/market"):
+        return "market"
+    if path.startswith("/v1/trades"):
+        return "trades"
+    if path.startswith("/v1/ticker"):
+        return "ticker"
+    if path.startswith("/v1/orderbook"):
+        return "orderbook"
+    if path == "/v1/orders" and method == "POST":
+        return "order"
+    return "default"
+
+
+class UpbitClient:
+    def __init__(self, access_key: str | None = None, secret_key: str | None = None,
+                 base_url: str = UPBIT_API_URL, timeout: float = 5.0, pool_size: int = 16, max_retries: int = 3,
+                 backoff: float = 0.2, max_backoff: float = 5.0, rates: dict | None = None, session=None,
+                 recorder=None, replay=None):
+        """
+        모든 실행기가 함께 쓰는 업비트 REST 클라이언트
+        - 연결 풀을 가진 하나의 Session으로 keep-alive 재사용 (매 호출 TLS 핸드셰이크 없음)
+        - 요청 그룹마다 TokenBucket, 응답의 Remaining-Req로 남은 요청 수를 맞춤
+        - 같은 공개 시세 요청이 동시에 나가 있으면 응답 하나를 함께 씀
+        - GET의 429/5xx/연결 오류는 지터를 섞은 지수 백오프로 max_retries번까지 재시도
+          (주문 생성은 429만 재시도, 응답을 못 받으면 identifier로 조회해 확인하고 다시 보내지 않음)
+        :param access_key: 없으면 공개 시세 API만 사용 가능
+        :param base_url: 테스트용 로컬 대체 서버 주소로 바꿀 수 있음
+        :param rates: 그룹 → 초당 한도 (GROUP_RATES 덮어쓰기)
+        :param recorder: TrafficRecorder — 주고받은 요청/응답을 기록
+        :param replay: TrafficReplay — 네트워크 대신 기록된 응답을 돌려줌 (요청 제한/재시도 대기 없음)
+        """
+        self.auth = pyupbit.Upbit(access_key, secret_key) if access_key else None
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.rates = {**GROUP_RATES, **(rates or {})}
+        self.buckets = {}
+        self.inflight = {}
+        self.lock = threading.Lock()
+        self.metrics = get_metrics()
+        self.recorder = recorder
+        self.replay = replay
+        if replay is not None:
+            self.backoff = 0.0
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+
+    def bucket(self, group: str) -> TokenBucket:
+        with self.lock:
+            if group not in self.buckets:
+                self.buckets[group] = TokenBucket(rate=self.rates.get(group, 10))
+            return self.buckets[group]
+
+    # --- 요청 ---
+
+    def _send(self, method: str, path: str, params: dict | None, data: dict | None, private: bool):
+        if self.replay is not None:
+            return self.replay.respond(method, path, params, data)
+        headers = None
+        query_string = urlencode(params or {}, doseq=True).replace("%5B%5D=", "[]=")
+        if private:
+            if self.auth is None:
+                raise RuntimeError(f"API key required: {method} {path}")
+            headers = self.auth._request_headers(data if data is not None else (params or None))
+        url = f"{self.base_url}{path}" + (f"?{query_string}" if query_string else "")
+        sent_at = time.time()
+        resp = self.session.request(method, url, headers=headers, json=data, timeout=self.timeout)
+        if self.recorder is not None:
+            self.recorder.record(sent_at, time.time() - sent_at, method, path, params, data, resp)
+        return resp
+
+    def request(self, method: str, path: str, params: dict | None = None, data: dict | None = None,
+                private: bool = False):
+        """
+        :return: (응답 JSON, Remaining-Req)
+        """
+        # 재생 중에는 기록된 응답을 바로 돌려주므로 요청 제한을 걸지 않음
+        bucket = self.bucket(request_group(method, path)) if self.replay is None else None
+        endpoint = path if not path.startswith("/v1/candles") else "/v1/candles"
+        idempotent = method == "GET"
+        for attempt in range(self.max_retries + 1):
+            if bucket is not None:
+                bucket.acquire()
+            try:
+                with self.metrics.api_call(endpoint):
+                    resp = self._send(method, path, params, data, private)
+                    remaining = parse_remaining_req(resp.headers.get("Remaining-Req", ""))
+                    if bucket is not None:
+                        bucket.update_remaining(remaining)
+                    if resp.status_code >= 400:
+                        raise UpbitAPIError(resp.status_code, resp.text, remaining)
+                    return resp.json(), remaining
+            except UpbitAPIError as e:
+                retry_status = RETRY_STATUS if idempotent else UNSENT_STATUS
+                if e.status_code not in retry_status or attempt == self.max_retries:
+                    raise
+            except (requests.ConnectionError, requests.Timeout):
+                if not idempotent or attempt == self.max_retries:
+                    raise
+            delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+            time.sleep(delay * random.uniform(0.5, 1.0))
+
+    def public(self, path: str, params: dict | None = None):
+        """
+        공개 시세 조회 — 같은 (경로, 파라미터) 요청이 이미 진행 중이면 그 결과를 기다려 함께 씀
+        """
+        key = (path, tuple(sorted((k, str(v)) for k, v in (params or {}).items())))
+        with self.lock:
+            future = self.inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self.inflight[key] = Future()
+        if not owner:
+            return future.result()
+        try:
+            result = self.request("GET", path, params)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                self.inflight.pop(key, None)
+
+    # --- 시세 (pyupbit와 같은 반환 형식) ---
+
+    def get_candles(self, market: str, interval: str, to: str | None = None, count: int = 200):
+        """
+        :return: (KST 인덱스 오름차순 DataFrame, Remaining-Req)
+        """
+        params = {"market": market, "count": count}
+        if to is not None:
+            params["to"] = to
+        contents, remaining = self.public(candle_path(interval), params)
+        return candles_frame(contents), remaining
+
+    def get_ohlcv(self, ticker: str, interval: str = "day", count: int = 200) -> pd.DataFrame | None:
+        """
+        최근 count개 봉 (200개씩 나눠 받음), 실패하면 pyupbit처럼 None
+        """
+        try:
+            frames = []
+            to = None
+            while count > 0:
+                df, _ = self.get_candles(ticker, interval, to=to, count=min(count, 200))
+                if df.empty:
+                    break
+                frames.append(df)
+                count -= len(df)
+                to = (df.index[0] - pd.Timedelta(hours=9)).strftime("%Y-%m-%d %H:%M:%S")
+            if not frames:
+                return None
+            df = pd.concat(frames[::-1])
+            return df[~df.index.duplicated(keep="last")]
+        except (UpbitAPIError, requests.RequestException) as e:
+            print(f"[OHLCV Error] {ticker} {interval} — {e}")
+            return None
+
+    def get_current_price(self, ticker):
+        """
+        :param ticker: 마켓 코드 하나 또는 목록
+        :return: 현재가 (목록이면 마켓 → 현재가 dict), 실패하면 None
+        """
+        tickers = [ticker] if isinstance(ticker, str) else list(ticker)
+        try:
+            contents, _ = self.public("/v1/ticker", {"markets": ",".join(tickers)})
+        except (UpbitAPIError, requests.RequestException) as e:
+            print(f"[Ticker Error] {e}")
+            return None
+        prices = {c["market"]: c["trade_price"] for c in contents}
+        if isinstance(ticker, str):
+            return prices.get(ticker)
+        return prices
+
+    # --- 거래소 ---
+
+    def get_balances(self) -> list:
+        return self.request("GET", "/v1/accounts", private=True)[0]
+
+    def create_order(self, data: dict) -> dict:
+        """
+        주문 생성 — identifier를 붙여 보내고, 응답을 못 받으면(연결 오류/시간 초과/5xx) 다시 보내는 대신
+        identifier로 주문을 조회해 접수 여부를 확인
+        :return: 주문 (접수되지 않았으면 원래 예외를 그대로 올림)
+        """
+        data = {**data, "identifier": data.get("identifier") or str(uuid.uuid4())}
+        try:
+            return self.request("POST", "/v1/orders", data=data, private=True)[0]
+        except UpbitAPIError as e:
+            if e.status_code < 500:
+                raise
+            error = e
+        except (requests.ConnectionError, requests.Timeout) as e:
+            error = e
+        order = self.find_order(data["identifier"])
+        if order is None:
+            raise error
+        return order
+
+    def find_order(self, identifier: str) -> dict | None:
+        """
+        identifier로 주문 조회 — 거래소 반영이 늦을 수 있어 못 찾으면 백오프하며 max_retries번까지 다시 조회
+        :return: 주문, 끝내 없으면 None (접수되지 않은 주문)
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self.request("GET", "/v1/order", {"identifier": identifier}, private=True)[0]
+            except UpbitAPIError as e:
+                if e.status_code != 404:
+                    raise
+            if attempt < self.max_retries:
+                time.sleep(min(self.max_backoff, self.backoff * 2 ** attempt))
+        return None
+
+    def buy_market_order(self, ticker: str, price: float) -> dict:
+        return self.create_order({"market": ticker, "side": "bid", "price": str(price), "ord_type": "price"})
+
+    def sell_market_order(self, ticker: str, volume: float) -> dict:
+        return self.create_order({"market": ticker, "side": "ask", "volume": str(volume), "ord_type": "market"})
+
+    def get_orders_by_uuids(self, uuids: list):
+        """
+        pyupbit에 없는 여러 uuid 한 번 조회
+        :return: (주문 목록 — trades 미포함, Remaining-Req)
+        """
+        return self.request("GET", "/v1/orders/uuids", {"uuids[]": list(uuids)}, private=True)
+
+    def get_order(self, uuid: str):
+        """
+        :return: (주문 상세 — trades 포함, Remaining-Req)
+        """
+        return self.request("GET", "/v1/order", {"uuid": uuid}, private=True)
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_client() -> UpbitClient:
+    """
+    공개 시세 조회에 함께 쓰는 기본 클라이언트 (연결 풀/요청 제한 공유)
+    """
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = UpbitClient()
+        return _default_client
@@ -1,43 +1,41 @@
-import pyupbit
-import time
-import csv
-from datetime import datetime
-from pathlib import Path
 from executor.base_executor import Executor
-import threading
-import queue
+from executor.account import AccountSnapshot
+from executor.order_tracker import OrderTracker, order_vwap
+from executor.upbit_api import UpbitClient
+from utils.candle_buffer import CandleCache
+from utils.trade_journal import get_journal
 
 class UpbitExecutor(Executor):
-    def __init__(self, api_key, secret_key):
-        self.upbit = pyupbit.Upbit(api_key, secret_key)
-        self.order_queue = queue.Queue()
+    def __init__(self, api_key, secret_key, journal=None, client: UpbitClient | None = None):
+        # 시세/잔고/주문 모두 하나의 연결 풀과 그룹별 요청 제한을 나눠 씀
+        self.client = client or UpbitClient(api_key, secret_key)
+        self.journal = journal or get_journal()
         self.checked_uuids = set()
-        self._start_order_checker()
+        self.candles = CandleCache(self.client.get_ohlcv)
+        self.account = AccountSnapshot(self.client.get_balances)
+        # 체결 확인은 런타임 이벤트 루프에서 background_tasks()로 돌림
+        self.order_tracker = OrderTracker(self.client, self._process_order)
+
+    def ensure_history(self, bars: int):
+        self.candles.ensure_warmup(bars)
 
     def fetch_ohlcv(self, ticker, interval="minute1"):
-        df = pyupbit.get_ohlcv(ticker, interval=interval)
-        return df.dropna()
+        return self.candles.get(ticker, interval)
 
     def get_current_price(self, ticker):
-        return pyupbit.get_current_price(ticker)
+        return self.client.get_current_price(ticker)
 
     def get_balance(self, currency):
         try:
-            balances = self.upbit.get_balances()
-            for b in balances:
-                if b['currency'] == currency:
-                    return float(b['balance'])
+            return self.account.balance(currency)
         except Exception as e:
             print(f"[Balance Error] {e}")
         return 0.0
 
     def get_avg_buy_price(self, ticker):
         try:
-            balances = self.upbit.get_balances()
             currency = ticker.split("-")[1]  # e.g., "BTC" from "KRW-BTC"
-            for b in balances:
-                if b['currency'] == currency:
-                    return float(b['avg_buy_price'])
+            return self.account.avg_buy_price(currency)
         except Exception as e:
             print(f"[Avg Buy Price Error] {e}")
         return 0.0
@@ -45,8 +43,12 @@ class UpbitExecutor(Executor):
     def get_krw(self):
         return self.get_balance("KRW")
 
-    def get_btc(self):
-        return self.get_balance("BTC")
+    def prefetch(self):
+        # 이번 tick의 get_krw/get_avg_buy_price/get_coin이 모두 이 잔고 조회 하나를 씀
+        self.account.get()
+
+    def background_tasks(self) -> list:
+        return [self.order_tracker.run_async()]
 
     def buy(self, ticker, amount_krw):
         if amount_krw < 5000:
@@ -54,100 +56,75 @@ class UpbitExecutor(Executor):
             return None
         try:
             print(f"[Buy] {ticker} - {amount_krw:,.0f} KRW")
-            result = self.upbit.buy_market_order(ticker, amount_krw)
+            result = self.client.buy_market_order(ticker, amount_krw)
+            self.account.invalidate()  # 주문 금액이 묶이므로 잔고 다시 조회
             if result and 'uuid' in result:
-                self.order_queue.put(("BUY", result['uuid'], ticker))
+                self.journal.record_order_event(result['uuid'], "submitted", ticker, "BUY",
+                                                state=result.get('state'), price=amount_krw)
+                self.order_tracker.track("BUY", result['uuid'], ticker)
             return result
         except Exception as e:
             print(f"[Buy Error] {e}")
             return None
 
-    def sell(self, ticker, amount_btc):
-        if amount_btc < 0.0001:
-            print(f"[Sell Failed] Minimum order quantity is 0.0001 BTC.")
+    def sell(self, ticker, amount):
+        if amount <= 0:
+            print(f"[Sell Failed] Invalid order quantity: {amount}")
             return None
         try:
-            print(f"[Sell] {ticker} - {amount_btc:.8f} BTC")
-            result = self.upbit.sell_market_order(ticker, amount_btc)
+            print(f"[Sell] {ticker} - {amount:.8f} {ticker.split('-')[1]}")
+            result = self.client.sell_market_order(ticker, amount)
+            self.account.invalidate()
             if result and 'uuid' in result:
-                self.order_queue.put(("SELL", result['uuid'], ticker))
+                self.journal.record_order_event(result['uuid'], "submitted", ticker, "SELL",
+                                                state=result.get('state'), volume=amount)
+                self.order_tracker.track("SELL", result['uuid'], ticker)
             return result
         except Exception as e:
             print(f"[Sell Error] {e}")
             return None
 
-    def _start_order_checker(self):
-        def run():
-            while True:
-                try:
-                    trade_type, uuid, ticker = self.order_queue.get(timeout=1)
-                    self._process_order(uuid, trade_type, ticker)
-                except queue.Empty:
-                    continue
-                except Exception as e:
-                    print(f"[Async Order Check Error] {e}")
-
-        threading.Thread(target=run, daemon=True).start()
-
-    def _process_order(self, uuid, trade_type, ticker):
+    def _process_order(self, order, trade_type, ticker):
+        uuid = order.get('uuid')
         if uuid in self.checked_uuids:
             return
         try:
-            time.sleep(0.3)  # Rate limit
-            order = self.upbit.get_order(uuid)
-            if not order or order.get("state") != "done":
-                self.order_queue.put((trade_type, uuid, ticker))  # Retry later
-                return
-
-            trades = order.get('trades', [])
-            total_price = 0.0
-            total_volume = 0.0
-            for t in trades:
-                price = float(t['price'])
-                volume = float(t['volume'])
-                total_price += price * volume
-                total_volume += volume
-
+            price, total_volume = order_vwap(order)
+            self.journal.record_order_event(uuid, "filled" if total_volume > 0 else "closed", ticker, trade_type,
+                                            state=order.get('state'), price=price, volume=total_volume)
             if total_volume > 0:
+                # 체결로 잔고/평단가가 바뀌었으므로 다음 조회 때 한 번만 다시 받음
+                self.account.invalidate()
+                self.record_fill(ticker, trade_type, price, total_volume, float(order.get('paid_fee') or 0.0))
                 if trade_type == "BUY":
-                    self.log_trade("BUY", price, total_volume)
+                    self.log_trade(ticker, "BUY", price, total_volume, uuid=uuid)
                 elif trade_type == "SELL":
                     avg_price = self.get_avg_buy_price(ticker)
                     profit = ((price - avg_price) / avg_price * 100) if avg_price > 0 else 0.0
-                    self.log_trade("SELL", price, total_volume, profit)
+                    self.log_trade(ticker, "SELL", price, total_volume, profit, uuid=uuid)
 
             self.checked_uuids.add(uuid)
 
         except Exception as e:
             print(f"[Order Process Error] UUID: {uuid}, Type: {trade_type} — {e}")
 
-    def log_trade(self, trade_type, price, amount, profit=None):
-        log_path = Path("logs")
-        log_path.mkdir(exist_ok=True)
-        file = log_path / "trade_log.csv"
-        file_exists = file.exists()
+    def state_dict(self) -> dict:
+        # 잔고는 거래소에서 다시 받으므로 봉과 체결 확인 상태만 저장
+        return {"checked_uuids": set(self.checked_uuids), "pending_orders": self.order_tracker.pending(),
+                "candles": self.candles.state_dict()}
 
-        avg_price = self.get_avg_buy_price("KRW-BTC")
-        total_btc = self.get_btc()
-        total_krw = self.get_krw()
+    def load_state(self, state: dict):
+        self.checked_uuids.update(state["checked_uuids"])
+        for trade_type, uuid, ticker in state["pending_orders"]:
+            # 재시작 중에 체결된 주문도 다음 조회에서 확인됨
+            if uuid not in self.checked_uuids:
+                self.order_tracker.track(trade_type, uuid, ticker)
+        self.candles.load_state(state["candles"])
 
+    def log_trade(self, ticker, trade_type, price, amount, profit=None, uuid=None):
         try:
-            with file.open("a", newline="") as f:
-                writer = csv.writer(f)
-                if not file_exists:
-                    writer.writerow([
-                        "timestamp", "type", "price", "amount",
-                        "profit", "avg_buy_price", "total_btc", "total_krw"
-                    ])
-                writer.writerow([
-                    datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    trade_type,
-                    f"{price:,.0f}",
-                    f"{amount:.8f}",
-                    f"{profit:.2f}%" if profit is not None else "",
-                    f"{avg_price:,.0f}",
-                    f"{total_btc:.8f}",
-                    f"{total_krw:,.0f}"
-                ])
+            self.journal.record_trade(ticker, trade_type, price, amount, profit=profit,
+                                      avg_buy_price=self.get_avg_buy_price(ticker),
+                                      total_coin=self.get_coin(ticker), total_krw=self.get_krw(), uuid=uuid)
         except Exception as e:
             print(f"[Log Write Error] {e}")
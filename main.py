@@ -1,34 +1,59 @@
-import time
-import threading
-from datetime import datetime, timedelta
+import asyncio
+from datetime import datetime
 from executor import get_executor
 from strategies import get_strategy
+from engine import AsyncRuntime, TradingEngine
 from utils.stop_loss import StopLossDetector
+from utils.intervals import INTERVAL_MAP
+from utils.candle_clock import CandleClock
+from utils.trade_stream import UpbitTradeStream
+from utils.instrumentation import get_metrics
+from utils.snapshot import SnapshotManager
 import config
 
-TICKER = "KRW-BTC"
+MARKETS = getattr(config, "MARKETS", ["KRW-BTC"])
 STRATEGY_NAME = "rsi"
-EXECUTOR_TYPE = "mock"
+EXECUTOR_TYPE = getattr(config, "EXECUTOR_TYPE", "mock")
 INTERVAL = config.INTERVAL
+USE_TRADE_STREAM = getattr(config, "USE_TRADE_STREAM", True)
+METRICS_PORT = getattr(config, "METRICS_PORT", None)  # 예: 9108 → http://127.0.0.1:9108/metrics
+# 리플레이(봉/API)는 tick이 빨라 기본으로 지표 파일을 쓰지 않음
+REPLAYING = EXECUTOR_TYPE == "replay" or bool(getattr(config, "API_REPLAY", None))
+METRICS_FILE = getattr(config, "METRICS_FILE", None if REPLAYING else "logs/metrics.prom")
+METRICS_FILE_INTERVAL = getattr(config, "METRICS_FILE_INTERVAL", 15)  # 지표 파일 최소 저장 간격(초, 실제 시간)
+SNAPSHOT_PATH = getattr(config, "SNAPSHOT_PATH", "logs/snapshot.pkl")  # None이면 저장/복원 안 함
+SNAPSHOT_INTERVAL = getattr(config, "SNAPSHOT_INTERVAL", 60)
 
-INTERVAL_MAP = {
-    "minute1": 60,
-    "minute3": 180,
-    "minute5": 300,
-    "minute15": 900,
-    "minute30": 1800,
-    "minute60": 3600,
-    "minute240": 14400,
-    "day": 86400,
-}
 INTERVAL_SECONDS = INTERVAL_MAP[INTERVAL]
 StopLossDetector.candle_interval_minutes = INTERVAL_SECONDS // 60
 
 executor = get_executor(EXECUTOR_TYPE)
-strategy = get_strategy(STRATEGY_NAME)
-
-stop_signal = False
-last_candle_time = None
+engine = TradingEngine(executor, MARKETS, lambda: get_strategy(STRATEGY_NAME), INTERVAL)
+
+# config.API_REPLAY로 기록된 API 응답을 재생할 때는 시계도 기록 시각을 따름
+traffic_replay = getattr(executor.client, "replay", None)
+clock = traffic_replay.clock() if traffic_replay is not None else CandleClock()
+
+# 리플레이는 항상 처음부터 다시 돌리므로 스냅샷을 쓰지 않음
+snapshots = None
+if SNAPSHOT_PATH and EXECUTOR_TYPE != "replay" and traffic_replay is None:
+    snapshots = SnapshotManager(SNAPSHOT_PATH, interval_sec=SNAPSHOT_INTERVAL)
+    restored = snapshots.restore(engine)
+    if restored:
+        print(f"[Snapshot Restored] {', '.join(restored)}")
+# 스냅샷에서 복원하지 않았으면 지금 잔고를 시작점으로 평가금액/낙폭 추적
+engine.start_performance()
+metrics = get_metrics()
+if METRICS_PORT:
+    metrics.serve(METRICS_PORT)
+
+# 체결 스트림이 켜져 있으면 봉을 로컬에서 만들고 REST 조회를 건너뜀
+# API 기록/재생 중에는 끔 — WebSocket 체결은 기록되지 않으므로 봉도 REST로 받아야 재생 때 같은 판단이 나옴
+recording = getattr(executor.client, "recorder", None) is not None
+trade_stream = None
+if USE_TRADE_STREAM and hasattr(executor, "candles") and traffic_replay is None and not recording:
+    trade_stream = UpbitTradeStream(MARKETS, on_trade=executor.candles.apply_trade, clock=clock,
+                                    on_status=executor.candles.set_live)
 
 def print_help():
     print("Available commands:")
@@ -37,87 +62,143 @@ def print_help():
     print(" - help   | h | ?  : Show this help message")
     print(" - current| c      : Show current price")
     print(" - time   | t      : Show current time(Local)")
-
-def input_listener():
-    global stop_signal
-    while True:
-        cmd = input().strip().lower()
-        if cmd == "":
-            continue
-        if cmd in ["exit", "q", "quit"]:
-            stop_signal = True
-            break
-        elif cmd in ["status", "s"]:
-            krw = executor.get_krw()
-            btc = executor.get_btc()
-            avg_price = executor.get_avg_buy_price(TICKER)
-            print("Current Account Status:")
-            print(f" - KRW Balance      : {krw:,.0f} KRW")
-            print(f" - BTC Holdings     : {btc:.8f} BTC")
-            if btc > 0 and avg_price > 0:
-                print(f" - Avg Buy Price    : {avg_price:,.0f} KRW")
-        elif cmd in ["current", "c"]:
-            c_price = executor.get_current_price(TICKER)
-            print(f"[{datetime.now().strftime('%H:%M:%S')}] Current Price: {c_price:,.0f} KRW")
-        elif cmd in ["time", "t"]:
-            print(f"[{datetime.now().strftime('%H:%M:%S')}]")
-        elif cmd in ["help", "h", "?"]:
-            print_help()
-        else:
-            print(f"[Unknown command] '{cmd}' — type 'help' to see available commands.")
-
-
-threading.Thread(target=input_listener, daemon=True).start()
-
-def wait_until_next_interval(interval_sec: int):
-    global last_candle_time
-
-    while not stop_signal:
-        df = executor.fetch_ohlcv(TICKER, interval=INTERVAL).tail(1000)
-        candle_time = df.index[-1]
-
-        if last_candle_time != candle_time:
-            last_candle_time = candle_time
-            break
-
-        time.sleep(1)
-
-
-print(f"[Auto Trading Started] Strategy: {STRATEGY_NAME}, Executor: {EXECUTOR_TYPE}, Interval: {INTERVAL}")
-
-while not stop_signal:
-    try:
-        df = executor.fetch_ohlcv(TICKER, interval=INTERVAL).tail(1000)
-        price = df.iloc[-1]['close']
-        last_candle_time = df.index[-1]
-        print(f"[{datetime.now().strftime('%H:%M:%S')}] Current Price: {price:,.0f} KRW")
-
-        # BUY LOGIC
-        should_buy, buy_strength = strategy.should_buy(df)
-        if should_buy:
-            krw_balance = executor.get_krw()
-            amount_krw = strategy.buy_amount(krw_balance, price, buy_strength)
-            if amount_krw >= 5000:
-                executor.buy(TICKER, amount_krw)
-
-        # SELL LOGIC
-        context = {
-            "current_price": price,
-            "avg_buy_price": executor.get_avg_buy_price(TICKER),
-            "btc_balance": executor.get_btc(),
-        }
-
-        should_sell, reason, sell_strength = strategy.should_sell(df, context)
-        if should_sell:
-            btc_balance = context["btc_balance"]
-            amount_btc = strategy.sell_amount(btc_balance, price, sell_strength)
-            if amount_btc >= 0.0001:
-                print(f">> Selling {amount_btc:.8f} BTC due to reason: {reason} (strength: {sell_strength:.2f})")
-                executor.sell(TICKER, amount_btc)
-
-    except Exception as e:
-        print("[Error occurred]", e)
-
-    wait_until_next_interval(INTERVAL_SECONDS)
+    print(" - trades | l      : Show recent trades")
+    print(" - pnl    | p      : Show equity, drawdown, PnL and win rate")
+    print(" - positions | pos : Show per-market position and PnL")
+    print(" - metrics| m      : Show per-stage / API latency")
+    print(" - profile N       : Profile the next N ticks with cProfile")
+
+def handle_command(cmd: str) -> bool:
+    """
+    명령 하나 처리 (런타임 작업 스레드에서 호출)
+    :return: False면 종료
+    """
+    if cmd in ["exit", "q", "quit"]:
+        return False
+    elif cmd in ["status", "s"]:
+        krw = executor.get_krw()
+        print("Current Account Status:")
+        print(f" - KRW Balance      : {krw:,.0f} KRW")
+        for ticker, state in engine.markets.items():
+            amount = executor.get_coin(ticker)
+            if amount <= 0:
+                continue
+            avg_price = executor.get_avg_buy_price(ticker)
+            line = f" - {state.currency:<5} Holdings : {amount:.8f} {state.currency}"
+            if avg_price > 0:
+                line += f" (Avg Buy Price {avg_price:,.0f} KRW)"
+            print(line)
+        stats = executor.journal.trade_stats()
+        print(f" - Trades           : {stats['trades']} (BUY {stats['buys'] or 0} / SELL {stats['sells'] or 0})")
+        perf = engine.performance.snapshot()
+        print(f" - Equity           : {perf['equity']:,.0f} KRW ({perf['return_percent']:+.2f}%, "
+              f"drawdown {perf['drawdown_percent']:.2f}%)")
+    elif cmd in ["pnl", "p"]:
+        perf = engine.performance.snapshot()
+        win_rate = f"{perf['win_rate_percent']:.1f}%" if perf['win_rate_percent'] is not None else "-"
+        print("Performance:")
+        print(f" - Equity           : {perf['equity']:,.0f} KRW (start {perf['initial_equity']:,.0f} KRW, "
+              f"{perf['return_percent']:+.2f}%)")
+        print(f" - Cash / Holdings  : {perf['cash']:,.0f} / {perf['market_value']:,.0f} KRW")
+        print(f" - Peak             : {perf['peak']:,.0f} KRW")
+        print(f" - Drawdown         : {perf['drawdown_percent']:.2f}% (max {perf['max_drawdown_percent']:.2f}%)")
+        print(f" - Realized PnL     : {perf['realized_pnl']:+,.0f} KRW (fees {perf['fees']:,.0f} KRW)")
+        print(f" - Unrealized PnL   : {perf['unrealized_pnl']:+,.0f} KRW")
+        print(f" - Win Rate         : {win_rate} over {perf['sells']} sells (BUY {perf['buys']})")
+    elif cmd in ["positions", "pos"]:
+        rows = engine.performance.market_snapshot()
+        if not rows:
+            print(" - No positions")
+        for ticker, row in rows.items():
+            unrealized = row.get("unrealized_pnl", 0.0)
+            print(f" - {ticker:<10} {row['position']:.8f} @ {row['avg_price']:,.0f} KRW | "
+                  f"unrealized {unrealized:+,.0f} | realized {row['realized_pnl']:+,.0f} KRW")
+    elif cmd in ["trades", "l"]:
+        for t in executor.journal.recent_trades(limit=10):
+            ts = datetime.fromtimestamp(t['ts']).strftime('%m-%d %H:%M:%S')
+            profit = f" | {t['profit']:.2f}%" if t['profit'] is not None else ""
+            print(f" {ts} {t['market']} {t['side']:<4} {t['amount']:.8f} @ {t['price']:,.0f} KRW{profit}")
+    elif cmd in ["current", "c"]:
+        prices = engine.refresh_prices()
+        print(f"[{executor.now().strftime('%H:%M:%S')}] Current Price:")
+        for ticker, c_price in prices.items():
+            print(f" - {ticker:<10}: {c_price:,.0f} KRW")
+    elif cmd in ["metrics", "m"]:
+        for name in ("trading_tick_seconds", "trading_stage_seconds", "upbit_api_seconds", "order_fill_seconds"):
+            rows = metrics.summary(name)
+            if not rows:
+                continue
+            print(f"{name}:")
+            for label, count, mean, p50, p99 in rows:
+                print(f" - {label or 'all':<28} n={count:<6} avg {mean * 1000:8.1f}ms  p50 <{p50 * 1000:.1f}ms  p99 <{p99 * 1000:.1f}ms")
+        errors = metrics.counters.get("upbit_api_errors_total", {})
+        for key, calls in sorted(metrics.counters.get("upbit_api_calls_total", {}).items()):
+            print(f" - API {dict(key)['endpoint']:<20} calls {calls:g} errors {errors.get(key, 0):g}")
+    elif cmd.startswith("profile"):
+        parts = cmd.split()
+        ticks = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 1
+        engine.profiler.request(ticks)
+        print(f"[Profile] Profiling the next {ticks} tick(s)")
+    elif cmd in ["time", "t"]:
+        print(f"[{executor.now().strftime('%H:%M:%S')}]")
+    elif cmd in ["help", "h", "?"]:
+        print_help()
+    else:
+        print(f"[Unknown command] '{cmd}' — type 'help' to see available commands.")
+
+    return True
+
+def save_state():
+    # 간격이 지났을 때만 실제로 저장 (스냅샷 SNAPSHOT_INTERVAL, 지표 파일 METRICS_FILE_INTERVAL)
+    if snapshots is not None:
+        try:
+            snapshots.maybe_save(engine)
+        except Exception as e:
+            print(f"[Snapshot Save Error] {e}")
+
+    if METRICS_FILE:
+        try:
+            metrics.maybe_write(METRICS_FILE, METRICS_FILE_INTERVAL)
+        except OSError as e:
+            print(f"[Metrics Write Error] {e}")
+
+async def after_tick():
+    # pickle/파일 쓰기가 이벤트 루프(명령 입력, 체결 확인)를 막지 않도록 작업 스레드에서
+    if snapshots is not None or METRICS_FILE:
+        await asyncio.to_thread(save_state)
+
+
+print(f"[Auto Trading Started] Strategy: {STRATEGY_NAME}, Executor: {EXECUTOR_TYPE}, Interval: {INTERVAL}, Markets: {', '.join(MARKETS)}")
+
+# 매매 루프/명령 입력/체결 확인/체결 스트림을 한 이벤트 루프에서 실행, 서버 시각 기준 봉 마감마다 tick
+runtime = AsyncRuntime(engine, clock, INTERVAL_SECONDS, on_command=handle_command, on_tick=after_tick,
+                       trade_stream=trade_stream)
+try:
+    asyncio.run(runtime.run())
+except KeyboardInterrupt:
+    pass
+finally:
+    if snapshots is not None:
+        snapshots.save(engine)
+    if METRICS_FILE:
+        try:
+            metrics.write(METRICS_FILE)
+        except OSError as e:
+            print(f"[Metrics Write Error] {e}")
+    # 거래 기록 쓰기 스레드가 데몬이므로 큐에 남은 기록을 여기서 마저 씀
+    engine.close()
+
+if traffic_replay is not None:
+    print(f"[API Replay] served {traffic_replay.served}/{traffic_replay.total} recorded responses, "
+          f"{traffic_replay.misses} not recorded")
+    if traffic_replay.misses:
+        print(f"[API Replay Warning] {traffic_replay.misses} request(s) were not in the log — "
+              f"decisions may differ from the recorded run")
+
+if EXECUTOR_TYPE == "replay":
+    print("[Replay Summary]")
+    for key, value in executor.summary().items():
+        print(f" - {key:<16}: {value}")
+    print(f" - {'journal':<16}: {executor.journal.path}")
 
 print("[Auto Trading Stopped]")
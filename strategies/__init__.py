@@ -1,12 +1,20 @@
 from strategies.rsi_strategy import RSIStrategy
 from strategies.sma_crossover import SMACrossoverStrategy
+from strategies.ensemble import EnsembleStrategy
+from strategies.multi_timeframe import MultiTimeframeStrategy
 # from strategies.trend_filter import TrendFilterStrategy
+import config
 
 def get_strategy(name: str):
     if name == "sma":
         return SMACrossoverStrategy()
     elif name == "rsi":
         return RSIStrategy()
+    elif name == "ensemble":
+        return EnsembleStrategy([RSIStrategy(), SMACrossoverStrategy()])
+    elif name == "mtf":
+        # 실행 봉 간격(config.INTERVAL) 봉만 받아 minute5 RSI 진입 + minute60 RSI 필터
+        return MultiTimeframeStrategy(base_interval=config.INTERVAL)
     # elif name == "trend":
     #     return TrendFilterStrategy()
     else:
@@ -24,6 +24,25 @@ class Strategy(ABC):
         """
         pass
 
+    def compute_signals(self, df: pd.DataFrame, cache=None) -> dict:
+        """
+        Compute signals for every bar of df in one vectorized pass (used by the vectorized backtester).
+        cache: optional utils.indicator_cache.IndicatorCache shared across parameter sets.
+
+        Returns:
+            dict of numpy arrays with len(df) elements:
+            "buy", "sell", "stop_loss" (bool) and "buy_strength", "sell_strength" (float).
+            "sell" is the raw strategy signal; profit checks are applied by the caller.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support vectorized signals")
+
+    def required_history(self) -> int:
+        """
+        Minimum number of candles should_buy/should_sell need before they can produce signals.
+        Used to size the candle warmup. Default: no requirement.
+        """
+        return 0
+
     def buy_amount(self, krw_balance: float, current_price: float, strength: float = 1.0) -> float:
         """
         Return the amount of KRW to use for buying, scaled by strength.
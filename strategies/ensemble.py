@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+from strategies.base import Strategy
+from strategies.features import FeatureStore, combine_votes
+from utils.stop_loss import StopLossDetector
+import config
+
+
+class EnsembleStrategy(Strategy):
+    def __init__(self, members: list, weights: list | None = None, mode: str = "vote", threshold: float = 0.5,
+                 max_len: int = 1000):
+        """
+        여러 전략의 신호를 투표/가중 평균으로 합친 전략
+        멤버가 선언한 지표(features())는 하나의 FeatureStore에서 봉마다 한 번만 계산되고,
+        익절/손절은 멤버마다가 아니라 앙상블에서 한 번 판단한다.
+        :param members: features()/signals(store)/compute_signals(df, cache)를 가진 전략 목록
+        :param weights: 멤버별 가중치 (기본 모두 1)
+        :param mode: "vote" 또는 "weighted" (strategies.features.combine_votes 참고)
+        :param threshold: vote는 신호를 낸 가중치 비율, weighted는 가중 평균 강도 기준
+        """
+        if not members:
+            raise ValueError("EnsembleStrategy needs at least one member")
+        self.members = members
+        self.weights = np.asarray(weights if weights is not None else [1.0] * len(members), dtype=float)
+        if len(self.weights) != len(members):
+            raise ValueError("weights must match members")
+        self.mode = mode
+        self.threshold = threshold
+        self.max_len = max_len
+        self.last_buy_strength = 0.0
+        self.last_sell_strength = 0.0
+        self.stop_loss_detector = StopLossDetector()
+        self.store = FeatureStore(max_len=max_len)
+        for member in members:
+            for name, *params in member.features():
+                self.store.require(name, *params)
+
+    def required_history(self) -> int:
+        return max((m.required_history() for m in self.members), default=0)
+
+    def _combined(self, df: pd.DataFrame) -> tuple[bool, float, bool, float]:
+        self.store.update(df)
+        votes = np.array([member.signals(self.store) for member in self.members], dtype=float)
+        buy, buy_strength = combine_votes(votes[:, 0].astype(bool), votes[:, 1], self.weights,
+                                          self.mode, self.threshold)
+        sell, sell_strength = combine_votes(votes[:, 2].astype(bool), votes[:, 3], self.weights,
+                                            self.mode, self.threshold)
+        return bool(buy), float(buy_strength), bool(sell), float(sell_strength)
+
+    def should_buy(self, df: pd.DataFrame) -> tuple[bool, float]:
+        if len(df) == 0:
+            return False, 0.0
+        buy, strength, _, _ = self._combined(df)
+        if buy:
+            self.last_buy_strength = strength
+            return True, strength
+        return False, 0.0
+
+    def should_sell(self, df: pd.DataFrame, context: dict) -> tuple[bool, str, float]:
+        current_price = context["current_price"]
+        avg_buy_price = context["avg_buy_price"]
+        profit = ((current_price - avg_buy_price) / avg_buy_price * 100) if avg_buy_price > 0 else 0
+
+        # 익절
+        if profit >= config.PROFIT_THRESHOLD:
+            if profit >= config.MIN_PROFIT_TO_SELL:
+                return True, "take_profit", 1.0
+            return False, "none", 0.0
+
+        if len(df) == 0:
+            return False, "none", 0.0
+
+        # 손절: 멤버들이 공유하는 N봉 하락률
+        self.store.update(df)
+        self.store.require("drop", self.stop_loss_detector.compute_lookback())
+        drop = self.store.get("drop", self.stop_loss_detector.compute_lookback())
+        if drop <= self.stop_loss_detector.sharp_drop_threshold:
+            return True, "sharp_decline", 1.0
+
+        _, _, sell, strength = self._combined(df)
+        if sell and profit >= config.MIN_PROFIT_TO_SELL:
+            self.last_sell_strength = strength
+            return True, "strategy_signal", strength
+        return False, "none", 0.0
+
+    def compute_signals(self, df: pd.DataFrame, cache=None) -> dict:
+        signals = [member.compute_signals(df, cache=cache) for member in self.members]
+        buy, buy_strength = combine_votes(np.stack([s["buy"] for s in signals]),
+                                          np.stack([s["buy_strength"] for s in signals]),
+                                          self.weights, self.mode, self.threshold)
+        sell, sell_strength = combine_votes(np.stack([s["sell"] for s in signals]),
+                                            np.stack([s["sell_strength"] for s in signals]),
+                                            self.weights, self.mode, self.threshold)
+        return {
+            "buy": buy,
+            "buy_strength": buy_strength,
+            "sell": sell,
+            "sell_strength": sell_strength,
+            # should_sell은 최근 max_len 봉으로 손절을 판단한다
+            "stop_loss": self.stop_loss_detector.cached_decline_mask(df["close"].to_numpy(dtype=float),
+                                                                     window=self.max_len, cache=cache),
+        }
+
+    def buy_amount(self, krw_balance: float, current_price: float, strength: float = None) -> float:
+        strength = strength if strength is not None else self.last_buy_strength
+        return min(krw_balance, 30000.0 * strength)
+
+    def sell_amount(self, btc_balance: float, current_price: float, strength: float = None) -> float:
+        strength = strength if strength is not None else self.last_sell_strength
+        return btc_balance * strength
@@ -0,0 +1,115 @@
+import math
+import numpy as np
+import pandas as pd
+from utils.indicators import StreamingRSI, StreamingSMA, IndicatorFeed
+
+# 스트리밍 상태가 필요한 지표: 이름 → 생성자
+STREAMING_FEATURES = {
+    "rsi": StreamingRSI,
+    "sma": StreamingSMA,
+}
+
+
+class FeatureStore:
+    def __init__(self, max_len: int = 1000):
+        """
+        여러 전략이 선언한 지표를 봉마다 한 번만 계산해 공유
+        같은 (이름, 파라미터)는 하나의 스트리밍 상태를 쓰고, 같은 봉 안에서는 계산 결과를 재사용한다.
+        지원 지표:
+        - ("rsi", period), ("sma", window): 진행 중인 마지막 봉 기준 값 (get) / 직전 확정 봉 값 (prev)
+        - ("drop", lookback): 최근 lookback 봉의 첫 종가 대비 마지막 종가 변화율(%)
+        :param max_len: 재동기화 시 반영할 최대 봉 개수
+        """
+        self.max_len = max_len
+        self.indicators = {}  # (name, params) -> 스트리밍 지표
+        self.declared = set()
+        self.feed = IndicatorFeed([], max_len=max_len)
+        self.candle_key = None
+        self.close = None
+        self.closes = None
+        self.values = {}
+        self.computations = 0  # 봉별 실제 계산 횟수 (공유 효과 확인용)
+
+    def require(self, name: str, *params) -> tuple:
+        key = (name, params)
+        if key in self.declared:
+            return key
+        if name in STREAMING_FEATURES:
+            self.indicators[key] = STREAMING_FEATURES[name](*params)
+            # 새 상태는 처음부터 채워야 하므로 다음 update에서 전체 재동기화
+            self.feed = IndicatorFeed(list(self.indicators.values()), max_len=self.max_len)
+            self.candle_key = None
+        elif name != "drop":
+            raise ValueError(f"Unknown feature: {name}")
+        self.declared.add(key)
+        return key
+
+    def update(self, df: pd.DataFrame):
+        """
+        같은 봉(시각과 종가가 같음)이면 아무것도 하지 않음
+        """
+        close_series = df["close"]
+        if len(close_series) == 0:
+            self.candle_key = None
+            self.close = None
+            return
+        key = (len(close_series), close_series.index[-1], close_series.iloc[-1])
+        if key == self.candle_key:
+            return
+        self.close = self.feed.sync(close_series)
+        self.closes = close_series.to_numpy(dtype=float)[-self.max_len:]
+        self.values.clear()
+        self.candle_key = key
+
+    def get(self, name: str, *params) -> float:
+        key = (name, params)
+        value = self.values.get(key)
+        if value is None:
+            value = self._compute(key)
+            self.values[key] = value
+        return value
+
+    def prev(self, name: str, *params) -> float:
+        """
+        직전 확정 봉 기준 값 (스트리밍 지표만)
+        """
+        return self.indicators[(name, params)].value
+
+    def _compute(self, key: tuple) -> float:
+        if self.close is None:
+            return math.nan
+        self.computations += 1
+        name, params = key
+        if name == "drop":
+            lookback = params[0]
+            if len(self.closes) < lookback:
+                return math.nan
+            first = self.closes[-lookback]
+            return (self.closes[-1] - first) / first * 100
+        return self.indicators[key].peek(self.close)
+
+
+def combine_votes(votes: np.ndarray, strengths: np.ndarray, weights: np.ndarray, mode: str,
+                  threshold: float) -> tuple[np.ndarray, np.ndarray]:
+    """
+    멤버별 신호를 합침 (봉 단위 배열이나 스칼라 모두 가능, 첫 축이 멤버)
+    - vote: 신호를 낸 멤버의 가중치 비율이 threshold 이상이면 신호, 강도는 그 멤버들의 가중 평균
+    - weighted: 전체 가중 평균 강도가 threshold 초과면 신호, 강도는 그 평균
+    :return: (신호, 강도)
+    """
+    weights = weights.reshape((-1,) + (1,) * (votes.ndim - 1))
+    total = weights.sum()
+    voted = np.where(votes, weights, 0.0)
+    score = (voted * strengths).sum(axis=0)
+    if mode == "vote":
+        share = voted.sum(axis=0) / total
+        signal = share >= threshold
+        with np.errstate(invalid="ignore", divide="ignore"):
+            strength = np.where(signal, score / voted.sum(axis=0), 0.0)
+    elif mode == "weighted":
+        strength = score / total
+        signal = strength > threshold
+        strength = np.where(signal, strength, 0.0)
+    else:
+        raise ValueError(f"Unknown ensemble mode: {mode}")
+    return signal, strength
@@ -0,0 +1,87 @@
+import pandas as pd
+from strategies.base import Strategy
+from strategies.rsi_strategy import RSIStrategy
+from utils.intervals import INTERVAL_MAP
+from utils.resample import TimeframeAggregator
+from utils.stop_loss import StopLossDetector
+
+
+class MultiTimeframeStrategy(Strategy):
+    def __init__(self, entry: Strategy | None = None, entry_interval: str = "minute5",
+                 gate_interval: str = "minute60", gate_period: int = 14, gate_max_rsi: float = 50.0,
+                 base_interval: str = "minute1", capacity: int = 1000):
+        """
+        하위 봉(base_interval) 하나만 받아 상위 봉을 로컬에서 묶고,
+        entry_interval 봉에서 entry 전략이 매수 신호를 내더라도 gate_interval 봉 RSI가 gate_max_rsi 이하일 때만 매수한다.
+        (예: minute60 RSI가 과열이 아닐 때만 minute5 RSI 과매도 진입) — 추가 시세 조회 없음
+        :param entry: 진입/청산 전략 (기본 RSIStrategy), entry_interval 봉 DataFrame을 받는다
+        :param base_interval: 받는 봉 간격 (엔진 봉 간격과 같아야 함)
+        :param capacity: 간격별로 보관할 최대 봉 개수
+        """
+        for interval in (entry_interval, gate_interval):
+            if INTERVAL_MAP[interval] < INTERVAL_MAP[base_interval] or INTERVAL_MAP[interval] % INTERVAL_MAP[base_interval]:
+                raise ValueError(f"{interval} cannot be built from {base_interval} candles")
+        self.entry = entry or RSIStrategy()
+        self.entry_interval = entry_interval
+        self.gate_interval = gate_interval
+        self.gate_max_rsi = gate_max_rsi
+        self.base_interval = base_interval
+        self.gate = RSIStrategy(period=gate_period)
+        self.aggregator = TimeframeAggregator([entry_interval, gate_interval], capacity=capacity)
+        self.last_gate_rsi = None
+        self.frame_key = None
+        self.last_frames = None
+
+        # 손절 lookback은 StopLossDetector.candle_interval_minutes(하위 봉) 기준 봉 개수로 계산되므로
+        # entry 봉에서도 같은 시간 길이가 되도록 분 단위를 줄여 둔다
+        detector = self.entry.stop_loss_detector
+        scale = INTERVAL_MAP[base_interval] / INTERVAL_MAP[entry_interval]
+        self.entry.stop_loss_detector = StopLossDetector(detector.sharp_drop_threshold,
+                                                         max(1, int(detector.lookback_minutes * scale)))
+
+    def required_history(self) -> int:
+        """
+        상위 봉 지표에 필요한 하위 봉 개수 (처음/마지막 상위 봉이 덜 찬 봉일 수 있어 하나 더)
+        """
+        base = INTERVAL_MAP[self.base_interval]
+        entry = (self.entry.required_history() + 1) * (INTERVAL_MAP[self.entry_interval] // base)
+        gate = (self.gate.required_history() + 1) * (INTERVAL_MAP[self.gate_interval] // base)
+        return max(entry, gate)
+
+    def frames(self, df: pd.DataFrame) -> dict:
+        """
+        df(하위 봉)를 반영한 간격별 봉 DataFrame
+        """
+        # 같은 봉으로 should_buy/should_sell이 연달아 호출되면 이전 결과 재사용
+        key = (len(df), df.index[-1], df["close"].iloc[-1])
+        if key != self.frame_key:
+            self.aggregator.update(df)
+            self.last_frames = {interval: self.aggregator.frame(interval)
+                                for interval in (self.entry_interval, self.gate_interval)}
+            self.frame_key = key
+        return self.last_frames
+
+    def should_buy(self, df: pd.DataFrame) -> tuple[bool, float]:
+        if len(df) == 0:
+            return False, 0.0
+        frames = self.frames(df)
+        should_buy, strength = self.entry.should_buy(frames[self.entry_interval])
+        if not should_buy:
+            return False, 0.0
+        gate_rsi = self.gate.latest_rsi(frames[self.gate_interval])
+        self.last_gate_rsi = gate_rsi
+        if gate_rsi is None or gate_rsi > self.gate_max_rsi:
+            return False, 0.0
+        return True, strength
+
+    def should_sell(self, df: pd.DataFrame, context: dict) -> tuple[bool, str, float]:
+        if len(df) == 0:
+            return False, "none", 0.0
+        frames = self.frames(df)
+        return self.entry.should_sell(frames[self.entry_interval], context)
+
+    def buy_amount(self, krw_balance: float, current_price: float, strength: float = None) -> float:
+        return self.entry.buy_amount(krw_balance, current_price, strength)
+
+    def sell_amount(self, btc_balance: float, current_price: float, strength: float = None) -> float:
+        return self.entry.sell_amount(btc_balance, current_price, strength)
@@ -1,10 +1,13 @@
+import numpy as np
 import pandas as pd
 from strategies.base import Strategy
 from utils.stop_loss import StopLossDetector
+from utils.indicators import StreamingRSI, IndicatorFeed
+from utils.indicator_cache import cached
 import config
 
 class RSIStrategy(Strategy):
-    def __init__(self, period=14, oversold=30, overbought=70, max_len=1000):
+    def __init__(self, period=14, oversold=30, overbought=70, max_len=1000, streaming=True):
         self.period = period
         self.oversold = oversold
         self.overbought = overbought
@@ -13,6 +16,10 @@ class RSIStrategy(Strategy):
         self.last_buy_strength = 0.0
         self.last_sell_strength = 0.0
         self.stop_loss_detector = StopLossDetector()
+        # streaming=False면 매 틱 전체 재계산(safe_rsi) 경로를 사용 — 스트리밍 값 검증용
+        self.streaming = streaming
+        self.rsi_state = StreamingRSI(period)
+        self.feed = IndicatorFeed([self.rsi_state], max_len=max_len)
 
     def compute_rsi(self, series: pd.Series) -> pd.Series:
         delta = series.diff()
@@ -34,9 +41,27 @@ class RSIStrategy(Strategy):
             print(f"[RSI ERROR] {e}")
             return None
 
+    def required_history(self) -> int:
+        return self.period + 1
+
+    def latest_rsi(self, df: pd.DataFrame) -> float | None:
+        if not self.streaming:
+            return self.safe_rsi(df["close"].tail(self.max_len))
+        try:
+            close = self.feed.sync(df["close"])
+            if close is None:
+                return None
+            latest = self.rsi_state.peek(close)
+            if pd.isna(latest):
+                return None
+            self.last_rsi = latest
+            return latest
+        except Exception as e:
+            print(f"[RSI ERROR] {e}")
+            return None
+
     def should_buy(self, df: pd.DataFrame) -> tuple[bool, float]:
-        close_series = df["close"].tail(self.max_len)
-        rsi_value = self.safe_rsi(close_series)
+        rsi_value = self.latest_rsi(df)
         if rsi_value is None:
             return False, 0.0
 
@@ -65,8 +90,7 @@ class RSIStrategy(Strategy):
             return True, "sharp_decline", 1.0
 
         # RSI 기반 전략 매도 (과매수 영역)
-        close_series = df["close"].tail(self.max_len)
-        rsi_value = self.safe_rsi(close_series)
+        rsi_value = self.latest_rsi(df)
         if rsi_value is None:
             return False, "none", 0.0
 
@@ -80,6 +104,38 @@ class RSIStrategy(Strategy):
 
         return False, "none", 0.0
 
+    def compute_signals(self, df: pd.DataFrame, cache=None) -> dict:
+        close = df["close"]
+        values = close.to_numpy(dtype=float)
+        rsi = cached(cache, values, "rsi", (self.period,), lambda: self.compute_rsi(close).to_numpy(dtype=float))
+        with np.errstate(invalid="ignore"):
+            buy = rsi < self.oversold
+            sell = rsi > self.overbought
+        return {
+            "buy": buy,
+            "buy_strength": np.where(buy, np.minimum(1.0, (self.oversold - rsi) / 20), 0.0),
+            "sell": sell,
+            "sell_strength": np.where(sell, np.minimum(1.0, (rsi - self.overbought) / 20), 0.0),
+            # should_sell은 tail(10)만 손절 판단에 넘긴다
+            "stop_loss": self.stop_loss_detector.cached_decline_mask(values, window=10, cache=cache),
+        }
+
+    def features(self) -> list[tuple]:
+        # EnsembleStrategy의 FeatureStore에 등록할 지표
+        return [("rsi", self.period)]
+
+    def signals(self, store) -> tuple[bool, float, bool, float]:
+        """
+        FeatureStore 값으로 (매수, 매수 강도, 매도, 매도 강도) 계산 — 익절/손절 판단은 호출하는 쪽에서
+        """
+        rsi = store.get("rsi", self.period)
+        if pd.isna(rsi):
+            return False, 0.0, False, 0.0
+        buy = rsi < self.oversold
+        sell = rsi > self.overbought
+        return (buy, min(1.0, (self.oversold - rsi) / 20) if buy else 0.0,
+                sell, min(1.0, (rsi - self.overbought) / 20) if sell else 0.0)
+
     def buy_amount(self, krw_balance: float, current_price: float, strength: float = None) -> float:
         strength = strength if strength is not None else self.last_buy_strength
         return min(krw_balance, 30000.0 * strength)
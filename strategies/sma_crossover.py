@@ -1,36 +1,66 @@
+import numpy as np
 import pandas as pd
 from strategies.base import Strategy
 from utils.stop_loss import StopLossDetector
+from utils.indicators import StreamingSMA, IndicatorFeed
+from utils.indicator_cache import cached
 import config
 
 class SMACrossoverStrategy(Strategy):
-    def __init__(self, short_window=5, long_window=20, max_len=1000):
+    def __init__(self, short_window=5, long_window=20, max_len=1000, streaming=True):
         self.short_window = short_window
         self.long_window = long_window
         self.max_len = max_len
         self.last_buy_strength = 0.0
         self.last_sell_strength = 0.0
         self.stop_loss_detector = StopLossDetector()
+        # streaming=False면 매 틱 rolling 전체 재계산 경로를 사용 — 스트리밍 값 검증용
+        self.streaming = streaming
+        self.short_state = StreamingSMA(short_window)
+        self.long_state = StreamingSMA(long_window)
+        self.feed = IndicatorFeed([self.short_state, self.long_state], max_len=max_len)
+
+    def required_history(self) -> int:
+        return self.long_window + 1
 
     def compute_moving_averages(self, close_series: pd.Series):
         short_ma = close_series.rolling(window=self.short_window).mean()
         long_ma = close_series.rolling(window=self.long_window).mean()
         return short_ma, long_ma
 
-    def should_buy(self, df: pd.DataFrame) -> tuple[bool, float]:
-        close = df["close"].tail(self.max_len)
-
-        try:
+    def latest_crosses(self, df: pd.DataFrame):
+        """
+        직전 봉과 마지막 봉의 (short_ma - long_ma) 및 마지막 long_ma 반환
+        데이터가 부족하면 None
+        """
+        if not self.streaming:
+            close = df["close"].tail(self.max_len)
             short_ma, long_ma = self.compute_moving_averages(close)
             if len(short_ma) < 2 or len(long_ma) < 2:
-                return False, 0.0
-
+                return None
             prev_cross = short_ma.iloc[-2] - long_ma.iloc[-2]
             curr_cross = short_ma.iloc[-1] - long_ma.iloc[-1]
+            return prev_cross, curr_cross, long_ma.iloc[-1]
+
+        if len(df) < 2:
+            return None
+        close = self.feed.sync(df["close"])
+        prev_cross = self.short_state.value - self.long_state.value
+        curr_long = self.long_state.peek(close)
+        curr_cross = self.short_state.peek(close) - curr_long
+        return prev_cross, curr_cross, curr_long
+
+    def should_buy(self, df: pd.DataFrame) -> tuple[bool, float]:
+        try:
+            crosses = self.latest_crosses(df)
+            if crosses is None:
+                return False, 0.0
+
+            prev_cross, curr_cross, curr_long = crosses
 
             if prev_cross < 0 and curr_cross > 0:
                 # 강도 계산: 교차 폭 대비 long_ma 기준 상대 비율
-                strength = min(1.0, abs(curr_cross) / long_ma.iloc[-1])
+                strength = min(1.0, abs(curr_cross) / curr_long)
                 self.last_buy_strength = strength
                 return True, strength
 
@@ -59,16 +89,15 @@ class SMACrossoverStrategy(Strategy):
 
         # 3. 데드크로스
         try:
-            short_ma, long_ma = self.compute_moving_averages(close)
-            if len(short_ma) < 2 or len(long_ma) < 2:
+            crosses = self.latest_crosses(df)
+            if crosses is None:
                 return False, "none", 0.0
 
-            prev_cross = short_ma.iloc[-2] - long_ma.iloc[-2]
-            curr_cross = short_ma.iloc[-1] - long_ma.iloc[-1]
+            prev_cross, curr_cross, curr_long = crosses
 
             if prev_cross > 0 and curr_cross < 0:
                 if profit >= config.MIN_PROFIT_TO_SELL:
-                    strength = min(1.0, abs(curr_cross) / long_ma.iloc[-1])
+                    strength = min(1.0, abs(curr_cross) / curr_long)
                     self.last_sell_strength = strength
                     return True, "strategy_signal", strength
 
@@ -77,6 +106,44 @@ class SMACrossoverStrategy(Strategy):
 
         return False, "none", 0.0
 
+    def compute_signals(self, df: pd.DataFrame, cache=None) -> dict:
+        close = df["close"]
+        values = close.to_numpy(dtype=float)
+        # 단기/장기 이동평균을 따로 캐시해 다른 조합과 같은 기간을 공유
+        short_ma = cached(cache, values, "sma", (self.short_window,),
+                          lambda: close.rolling(window=self.short_window).mean().to_numpy(dtype=float))
+        long_ma = cached(cache, values, "sma", (self.long_window,),
+                         lambda: close.rolling(window=self.long_window).mean().to_numpy(dtype=float))
+        cross = short_ma - long_ma
+        prev_cross = np.full_like(cross, np.nan)
+        prev_cross[1:] = cross[:-1]
+        with np.errstate(invalid="ignore"):
+            buy = (prev_cross < 0) & (cross > 0)
+            sell = (prev_cross > 0) & (cross < 0)
+            strength = np.minimum(1.0, np.abs(cross) / long_ma)
+        return {
+            "buy": buy,
+            "buy_strength": np.where(buy, strength, 0.0),
+            "sell": sell,
+            "sell_strength": np.where(sell, strength, 0.0),
+            "stop_loss": self.stop_loss_detector.cached_decline_mask(values, window=self.max_len, cache=cache),
+        }
+
+    def features(self) -> list[tuple]:
+        # EnsembleStrategy의 FeatureStore에 등록할 지표
+        return [("sma", self.short_window), ("sma", self.long_window)]
+
+    def signals(self, store) -> tuple[bool, float, bool, float]:
+        """
+        FeatureStore 값으로 (매수, 매수 강도, 매도, 매도 강도) 계산 — 익절/손절 판단은 호출하는 쪽에서
+        """
+        prev_cross = store.prev("sma", self.short_window) - store.prev("sma", self.long_window)
+        curr_long = store.get("sma", self.long_window)
+        curr_cross = store.get("sma", self.short_window) - curr_long
+        buy = prev_cross < 0 and curr_cross > 0
+        sell = prev_cross > 0 and curr_cross < 0
+        strength = min(1.0, abs(curr_cross) / curr_long) if buy or sell else 0.0
+        return buy, strength if buy else 0.0, sell, strength if sell else 0.0
 
     def buy_amount(self, krw_balance: float, current_price: float, strength: float = None) -> float:
         strength = strength if strength is not None else self.last_buy_strength
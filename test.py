@@ -1,10 +1,16 @@
-import pyupbit
 from strategies import get_strategy
 from backtest.backtester import Backtester
 from utils.stop_loss import StopLossDetector
+from utils.candle_store import CandleStore
+from utils.backfill import backfill_markets
+from utils.resample import load_timeframe
+import pandas as pd
 
-# 1. 데이터 로딩
-df = pyupbit.get_ohlcv("KRW-BTC", interval="minute30", count=1440)
+# 1. 데이터 로딩 (로컬 저장소의 minute1을 minute30으로 묶음, 없으면 최근 30일을 먼저 받음 — 전체 기간은 backfill.py로)
+store = CandleStore()
+if store.info("KRW-BTC", "minute30")["rows"] == 0 and store.info("KRW-BTC", "minute1")["rows"] == 0:
+    backfill_markets(["KRW-BTC"], "minute1", pd.Timestamp.now() - pd.Timedelta(days=30))
+df = load_timeframe(store, "KRW-BTC", "minute30")
 StopLossDetector.candle_interval_minutes = 60
 
 # 2. 전략 + 백테스터 초기화
@@ -0,0 +1,167 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import requests
+from executor.upbit_api import get_candles
+from utils.candle_store import CandleStore
+from utils.intervals import INTERVAL_MAP, KST_OFFSET_SEC, candle_start
+from utils.rate_limit import TokenBucket
+
+PAGE_SIZE = 200  # 캔들 API 한 번에 받을 수 있는 최대 봉 수
+NS = 1_000_000_000
+
+
+def kst_to_epoch(ts) -> int:
+    """
+    KST naive 시각 → UTC epoch 초
+    """
+    return int(pd.Timestamp(ts).as_unit("ns").value // NS) - KST_OFFSET_SEC
+
+
+def epoch_to_utc_string(ts_sec: int) -> str:
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(ts_sec))
+
+
+class Backfill:
+    def __init__(self, store: CandleStore, market: str, interval: str, workers: int = 4,
+                 limiter: TokenBucket | None = None, session=None, fetch_page=None):
+        """
+        과거 봉을 페이지 단위로 거슬러 받아 CandleStore에 채움
+        페이지별 구간(200봉)이 미리 정해지므로 workers개를 동시에 요청하고, 묶음마다 임시 파일과 진행 위치를 남겨
+        중단 후 다시 실행하면 이어서 받는다. 구간을 다 받으면 한 번에 저장소에 합친다.
+        :param limiter: 요청 제한기 (기본: 초당 10회, 업비트 시세 API 캔들 그룹 기준)
+        :param fetch_page: fetch_page(market, interval, to) → (DataFrame, Remaining-Req), 기본 업비트 캔들 API
+        """
+        if interval not in INTERVAL_MAP:
+            raise ValueError(f"Unknown interval: {interval}")
+        self.store = store
+        self.market = market
+        self.interval = interval
+        self.interval_sec = INTERVAL_MAP[interval]
+        self.workers = workers
+        self.limiter = limiter or TokenBucket(rate=10)
+        self.session = session or requests.Session()
+        self.fetch_page = fetch_page or self._fetch_page
+        self.staging = store.path(market, interval) / "backfill"
+        self.state_path = self.staging / "state.json"
+
+    def _fetch_page(self, market, interval, to):
+        return get_candles(market, interval, to=to, count=PAGE_SIZE, session=self.session)
+
+    def _request(self, to_sec: int) -> pd.DataFrame:
+        for attempt in range(5):
+            self.limiter.acquire()
+            try:
+                df, remaining = self.fetch_page(self.market, self.interval, epoch_to_utc_string(to_sec))
+                self.limiter.update_remaining(remaining)
+                return df
+            except Exception as e:
+                self.limiter.update_remaining(getattr(e, "remaining", None))
+                if attempt == 4:
+                    raise
+                time.sleep(0.5 * 2 ** attempt)
+
+    # --- 진행 상태 ---
+
+    def _load_state(self) -> dict | None:
+        if not self.state_path.exists():
+            return None
+        return json.loads(self.state_path.read_text())
+
+    def _save_state(self, state: dict):
+        self.staging.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state))
+        tmp.replace(self.state_path)
+
+    def _save_chunk(self, df: pd.DataFrame, cursor: int):
+        path = self.staging / f"chunk-{cursor}.pkl"
+        df.to_pickle(path.with_suffix(".tmp"))
+        path.with_suffix(".tmp").replace(path)
+
+    def _finish(self, state: dict) -> int:
+        chunks = sorted(self.staging.glob("chunk-*.pkl"))
+        rows = self.store.info(self.market, self.interval)["rows"]
+        if chunks:
+            df = pd.concat([pd.read_pickle(p) for p in chunks])
+            start_kst = pd.Timestamp(np.datetime64((state["start"] + KST_OFFSET_SEC) * NS, "ns"))
+            end_kst = pd.Timestamp(np.datetime64((state["end"] + KST_OFFSET_SEC) * NS, "ns"))
+            df = df[(df.index >= start_kst) & (df.index < end_kst)]
+            rows = self.store.write(self.market, self.interval, df)
+        for p in chunks:
+            p.unlink()
+        self.state_path.unlink(missing_ok=True)
+        return rows
+
+    # --- 실행 ---
+
+    def _fetch_range(self, state: dict, progress=None) -> int:
+        """
+        state["cursor"]부터 state["start"]까지 거슬러 받음 (UTC epoch 초, 구간 [start, end))
+        """
+        step = PAGE_SIZE * self.interval_sec
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while state["cursor"] > state["start"]:
+                targets = [state["cursor"] - k * step for k in range(self.workers)]
+                targets = [to for to in targets if to > state["start"]]
+                frames = list(pool.map(self._request, targets))
+                frames = [f for f in frames if len(f)]
+                next_cursor = targets[-1] - step
+                if frames:
+                    self._save_chunk(pd.concat(frames), state["cursor"])
+                state["cursor"] = next_cursor
+                self._save_state(state)
+                if progress is not None:
+                    progress(self.market, self.interval, state)
+                if not frames:
+                    # 상장 이전 구간 — 더 과거 데이터 없음
+                    break
+        return self._finish(state)
+
+    def run(self, start, end=None, progress=None) -> int:
+        """
+        [start, end) 구간(KST naive)이 저장소에 모두 있도록 빠진 부분만 받음
+        end가 없으면 진행 중인 봉 직전까지
+        :return: 저장소 전체 행 수
+        """
+        state = self._load_state()
+        if state is not None:
+            # 이전 실행이 중단된 구간부터 마저 받음
+            self._fetch_range(state, progress)
+
+        start_sec = kst_to_epoch(start)
+        end_sec = kst_to_epoch(end) if end is not None else candle_start(time.time(), self.interval_sec)
+        info = self.store.info(self.market, self.interval)
+
+        ranges = []
+        if info["rows"] == 0:
+            ranges.append((start_sec, end_sec))
+        else:
+            first_sec = kst_to_epoch(info["first"])
+            last_sec = kst_to_epoch(info["last"]) + self.interval_sec
+            if last_sec < end_sec:
+                ranges.append((last_sec, end_sec))
+            if start_sec < first_sec:
+                ranges.append((start_sec, first_sec))
+
+        rows = info["rows"]
+        for range_start, range_end in ranges:
+            state = {"start": range_start, "end": range_end, "cursor": range_end}
+            self._save_state(state)
+            rows = self._fetch_range(state, progress)
+        return rows
+
+
+def backfill_markets(markets: list, interval: str, start, end=None, root: str = "data/candles",
+                     workers: int = 4, rate: float = 10, progress=None) -> dict:
+    """
+    여러 마켓을 차례로 채움 (요청 제한기는 마켓 사이에 공유)
+    :return: 마켓 → 저장소 행 수
+    """
+    store = CandleStore(root)
+    limiter = TokenBucket(rate=rate)
+    session = requests.Session()
+    return {market: Backfill(store, market, interval, workers=workers, limiter=limiter,
+                             session=session).run(start, end, progress) for market in markets}
@@ -0,0 +1,257 @@
+import threading
+import numpy as np
+import pandas as pd
+from utils.intervals import INTERVAL_MAP, candle_label
+
+
+class CandleBuffer:
+    def __init__(self, columns: list, capacity: int = 1000):
+        """
+        고정 용량 배열 기반 캔들 링 버퍼
+        각 봉을 slot과 slot + capacity 두 곳에 기록해 두어 항상 연속된 구간을 복사 없이 돌려준다.
+        :param columns: 값 컬럼 이름 (예: open, high, low, close, volume, value)
+        :param capacity: 보관할 최대 봉 개수
+        """
+        self.columns = list(columns)
+        self.column_index = {name: i for i, name in enumerate(self.columns)}
+        self.capacity = capacity
+        self.times = np.zeros(2 * capacity, dtype="datetime64[ns]")
+        self.values = np.zeros((2 * capacity, len(self.columns)), dtype=np.float64)
+        self.start = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def last_time(self):
+        if self.size == 0:
+            return None
+        return self.times[self.start + self.size - 1]
+
+    def clear(self):
+        self.start = 0
+        self.size = 0
+
+    def _write(self, slot: int, ts, row):
+        self.times[slot] = ts
+        self.times[slot + self.capacity] = ts
+        self.values[slot] = row
+        self.values[slot + self.capacity] = row
+
+    def append(self, ts, row):
+        if self.size < self.capacity:
+            slot = (self.start + self.size) % self.capacity
+            self.size += 1
+        else:
+            slot = self.start
+            self.start = (self.start + 1) % self.capacity
+        self._write(slot, ts, row)
+
+    def load(self, df: pd.DataFrame):
+        self.clear()
+        self.merge(df.tail(self.capacity))
+
+    def merge(self, df: pd.DataFrame):
+        """
+        새로 받은 봉을 병합: 같은 시각이면 덮어쓰고(진행 중이던 봉 갱신), 더 늦은 시각이면 추가
+        """
+        times = df.index.values.astype("datetime64[ns]")
+        rows = df[self.columns].to_numpy(dtype=np.float64)
+        for ts, row in zip(times, rows):
+            self.upsert(ts, row)
+
+    def upsert(self, ts, row):
+        """
+        봉 하나를 병합 (merge와 같은 규칙)
+        """
+        if self.size == 0 or ts > self.last_time:
+            self.append(ts, row)
+            return
+        if ts == self.last_time:
+            self._write((self.start + self.size - 1) % self.capacity, ts, row)
+            return
+        view = self.times[self.start:self.start + self.size]
+        pos = int(np.searchsorted(view, ts))
+        if pos < self.size and view[pos] == ts:
+            self._write((self.start + pos) % self.capacity, ts, row)
+
+    def apply_trade(self, label, price: float, volume: float):
+        """
+        체결 하나를 label 시각의 봉에 반영 (체결 스트림으로 봉을 직접 만들 때 사용)
+        """
+        if self.size and label < self.last_time:
+            return
+        col = self.column_index
+        if self.size and label == self.last_time:
+            slot = (self.start + self.size - 1) % self.capacity
+            row = self.values[slot].copy()
+            row[col["high"]] = max(row[col["high"]], price)
+            row[col["low"]] = min(row[col["low"]], price)
+            row[col["close"]] = price
+        else:
+            slot = None
+            row = np.zeros(len(self.columns), dtype=np.float64)
+            for name in ("open", "high", "low", "close"):
+                row[col[name]] = price
+        if "volume" in col:
+            row[col["volume"]] += volume
+        if "value" in col:
+            row[col["value"]] += price * volume
+
+        if slot is None:
+            self.append(label, row)
+        else:
+            self._write(slot, label, row)
+
+    def state_dict(self) -> dict:
+        """
+        스냅샷용: 보관 중인 봉만 연속 배열로 복사
+        """
+        end = self.start + self.size
+        return {"columns": self.columns, "capacity": self.capacity,
+                "times": self.times[self.start:end].copy(), "values": self.values[self.start:end].copy()}
+
+    @classmethod
+    def from_state(cls, state: dict):
+        buffer = cls(state["columns"], state["capacity"])
+        for ts, row in zip(state["times"], state["values"]):
+            buffer.append(ts, row)
+        return buffer
+
+    def view(self) -> pd.DataFrame:
+        """
+        버퍼 내용을 복사 없이 DataFrame으로 반환 (읽기 전용, 다음 merge/apply_trade 전까지만 유효)
+        — 다른 스레드가 계속 쓰는 버퍼는 snapshot()을 사용
+        """
+        end = self.start + self.size
+        values = self.values[self.start:end]
+        values.flags.writeable = False
+        index = pd.DatetimeIndex(self.times[self.start:end])
+        return pd.DataFrame(values, index=index, columns=self.columns, copy=False)
+
+    def snapshot(self) -> pd.DataFrame:
+        """
+        버퍼 내용을 연속 배열 한 번 복사로 DataFrame으로 반환 (이후 병합/체결 반영과 무관)
+        """
+        end = self.start + self.size
+        values = self.values[self.start:end].copy()
+        values.flags.writeable = False
+        index = pd.DatetimeIndex(self.times[self.start:end].copy())
+        return pd.DataFrame(values, index=index, columns=self.columns, copy=False)
+
+
+class CandleCache:
+    def __init__(self, loader, capacity: int = 1000, warmup_count: int = 200, delta_count: int = 2):
+        """
+        (ticker, interval)별 CandleBuffer를 관리하며 처음 한 번만 전체를 받고 이후에는 최근 몇 개 봉만 받는다.
+        체결 스트림이 버퍼를 계속 갱신하므로 get()은 잠금 안에서 복사한 스냅샷을 돌려준다.
+        :param loader: loader(ticker, interval, count) -> DataFrame | None
+        :param capacity: 버퍼당 최대 봉 개수
+        :param warmup_count: 처음 불러올 봉 개수
+        :param delta_count: 이후 매번 불러올 최근 봉 개수
+        """
+        self.loader = loader
+        self.capacity = capacity
+        self.warmup_count = warmup_count
+        self.delta_count = delta_count
+        self.buffers = {}
+        self.live_tickers = set()
+        self.lock = threading.Lock()
+
+    def ensure_warmup(self, count: int):
+        """
+        처음 불러올 봉 개수를 최소 count로 (용량도 함께 늘림), 이미 가진 버퍼가 더 짧으면 다음 get()에서 다시 받음
+        """
+        with self.lock:
+            if count <= self.warmup_count and count <= self.capacity:
+                return
+            self.warmup_count = max(self.warmup_count, count)
+            self.capacity = max(self.capacity, count)
+            self.buffers = {key: buffer for key, buffer in self.buffers.items() if len(buffer) >= count}
+
+    def set_live(self, ticker: str, live: bool):
+        """
+        체결 스트림이 ticker의 봉을 갱신하고 있으면 REST 조회를 건너뛴다
+        """
+        with self.lock:
+            if live:
+                self.live_tickers.add(ticker)
+            else:
+                self.live_tickers.discard(ticker)
+
+    def apply_trade(self, ticker: str, ts_ms: int, price: float, volume: float):
+        with self.lock:
+            for (code, interval), buffer in self.buffers.items():
+                if code == ticker and len(buffer):
+                    label = candle_label(ts_ms / 1000, INTERVAL_MAP[interval])
+                    buffer.apply_trade(label, price, volume)
+
+    def state_dict(self) -> dict:
+        with self.lock:
+            return {key: buffer.state_dict() for key, buffer in self.buffers.items() if len(buffer)}
+
+    def load_state(self, state: dict):
+        """
+        스냅샷의 버퍼를 복원 — 다음 get()은 빠진 봉만 받아 이어 붙인다
+        """
+        with self.lock:
+            for key, buffer_state in state.items():
+                if buffer_state["capacity"] == self.capacity:
+                    self.buffers[key] = CandleBuffer.from_state(buffer_state)
+
+    def _fetch_full(self, ticker: str, interval: str) -> CandleBuffer:
+        # 네트워크 조회와 버퍼 생성은 잠금 밖에서 — 잠금은 결과를 바꿔 넣을 때만
+        df = self.loader(ticker, interval, self.warmup_count)
+        if df is None or df.empty:
+            raise RuntimeError(f"Failed to load candles: {ticker} {interval}")
+        df = df.dropna()
+        buffer = CandleBuffer(df.columns, capacity=self.capacity)
+        buffer.load(df)
+        return buffer
+
+    def get(self, ticker: str, interval: str) -> pd.DataFrame:
+        """
+        잠금은 버퍼를 읽고 병합할 때만 잡고 REST 조회 중에는 풀어 둔다
+        (같은 잠금을 쓰는 apply_trade/set_live가 이벤트 루프에서 호출되므로 조회 동안 루프를 막지 않도록)
+        """
+        key = (ticker, interval)
+        with self.lock:
+            buffer = self.buffers.get(key)
+            if buffer is not None and len(buffer) and ticker in self.live_tickers:
+                return buffer.snapshot()
+            last_time = buffer.last_time if buffer is not None else None
+
+        if last_time is None:
+            buffer = self._fetch_full(ticker, interval)
+            with self.lock:
+                self.buffers[key] = buffer
+                return buffer.snapshot()
+
+        recent = self.loader(ticker, interval, self.delta_count)
+        if recent is None or recent.empty:
+            # 조회 실패 시 마지막으로 가진 데이터를 그대로 사용
+            with self.lock:
+                return self.buffers[key].snapshot()
+
+        recent = recent.dropna()
+        fresh = None
+        if len(recent) and recent.index.values.astype("datetime64[ns]")[0] > last_time:
+            # 받은 구간과 버퍼 사이에 빈 봉이 있음 (재시작 등) — 빠진 만큼만 다시 받고, 너무 많으면 전체를 받음
+            interval_ns = np.timedelta64(INTERVAL_MAP[interval], "s").astype("timedelta64[ns]")
+            missing = int((recent.index.values.astype("datetime64[ns]")[-1] - last_time) // interval_ns)
+            gap = None
+            if missing < self.warmup_count:
+                gap = self.loader(ticker, interval, missing + 1)
+            if gap is not None and len(gap) and gap.index.values.astype("datetime64[ns]")[0] <= last_time:
+                recent = gap.dropna()
+            else:
+                fresh = self._fetch_full(ticker, interval)
+
+        with self.lock:
+            if fresh is not None:
+                self.buffers[key] = fresh
+                return fresh.snapshot()
+            buffer = self.buffers[key]
+            buffer.merge(recent)
+            return buffer.snapshot()
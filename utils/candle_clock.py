@@ -0,0 +1,69 @@
+import asyncio
+import time
+from collections import deque
+from utils.intervals import candle_start
+
+
+class CandleClock:
+    def __init__(self, grace_sec: float = 0.05, time_fn=time.time, sleep_fn=time.sleep):
+        """
+        봉 경계(INTERVAL_MAP 간격)에 맞춰 깨어나는 스케줄러
+        :param grace_sec: 경계 직후 마지막 체결이 도착할 때까지 기다리는 시간
+        :param time_fn: 현재 시각 함수 (로컬, epoch 초)
+        :param sleep_fn: 대기 함수
+        """
+        self.grace_sec = grace_sec
+        self.time_fn = time_fn
+        self.sleep_fn = sleep_fn
+        self.offset_samples = deque(maxlen=100)
+        self.server_offset = 0.0
+
+    def observe_server_time(self, server_ts: float, local_ts: float | None = None):
+        """
+        서버 타임스탬프 관측값으로 (서버 - 로컬) 시각 차이를 보정
+        네트워크 지연만큼 관측값이 항상 작게 나오므로 최근 관측값 중 최댓값을 사용
+        """
+        local_ts = self.time_fn() if local_ts is None else local_ts
+        self.offset_samples.append(server_ts - local_ts)
+        self.server_offset = max(self.offset_samples)
+
+    def now(self) -> float:
+        return self.time_fn() + self.server_offset
+
+    def next_close(self, interval_sec: int, now: float | None = None) -> float:
+        now = self.now() if now is None else now
+        return candle_start(now, interval_sec) + interval_sec
+
+    def wait_for_close(self, interval_sec: int, should_stop=None, max_sleep: float = 0.5) -> bool:
+        """
+        다음 봉 마감 시각(+grace)까지 대기
+        :param should_stop: True를 반환하면 대기를 중단하는 함수
+        :return: 봉 마감까지 기다렸으면 True, 중단되었으면 False
+        """
+        target = self.next_close(interval_sec) + self.grace_sec
+        while True:
+            if should_stop is not None and should_stop():
+                return False
+            remaining = target - self.now()
+            if remaining <= 0:
+                return True
+            self.sleep_fn(min(remaining, max_sleep))
+
+    def to_real_seconds(self, seconds: float) -> float:
+        # 시계 기준 시간 → 실제로 기다릴 시간 (재생 시계는 배속만큼 줄어듦)
+        return seconds
+
+    async def wait_for_close_async(self, interval_sec: int, stop_event: asyncio.Event) -> bool:
+        """
+        wait_for_close의 asyncio 버전 — 폴링 없이 stop_event를 기다리다 시간이 되면 True
+        """
+        target = self.next_close(interval_sec) + self.grace_sec
+        while not stop_event.is_set():
+            remaining = target - self.now()
+            if remaining <= 0:
+                return True
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=self.to_real_seconds(remaining))
+            except asyncio.TimeoutError:
+                pass
+        return False
@@ -0,0 +1,114 @@
+import json
+import os
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+DEFAULT_COLUMNS = ("open", "high", "low", "close", "volume", "value")
+
+
+class CandleStore:
+    def __init__(self, root: str = "data/candles"):
+        """
+        (마켓, 봉 간격)별 디렉터리에 컬럼마다 고정 폭 바이너리 파일을 두는 봉 저장소
+        - time.bin: int64 (KST naive, ns), <컬럼>.bin: float64
+        - meta.json의 rows가 유효한 행 수 (쓰다가 중단되어 파일 끝에 남은 바이트는 무시하고 다음 쓰기에서 덮어씀)
+        읽기는 np.memmap이라 데이터 크기와 무관하게 바로 열린다.
+        """
+        self.root = Path(root)
+
+    def path(self, market: str, interval: str) -> Path:
+        return self.root / market / interval
+
+    def _meta(self, market: str, interval: str) -> dict | None:
+        meta_path = self.path(market, interval) / "meta.json"
+        if not meta_path.exists():
+            return None
+        return json.loads(meta_path.read_text())
+
+    def _write_meta(self, directory: Path, meta: dict):
+        tmp = directory / "meta.json.tmp"
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, directory / "meta.json")
+
+    def _memmap(self, directory: Path, name: str, dtype, rows: int):
+        if rows == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(directory / f"{name}.bin", dtype=dtype, mode="r", shape=(rows,))
+
+    def info(self, market: str, interval: str) -> dict:
+        meta = self._meta(market, interval)
+        if not meta or meta["rows"] == 0:
+            return {"rows": 0, "first": None, "last": None}
+        times = self.times(market, interval)
+        return {"rows": meta["rows"], "first": pd.Timestamp(times[0]), "last": pd.Timestamp(times[-1])}
+
+    def times(self, market: str, interval: str) -> np.ndarray:
+        meta = self._meta(market, interval)
+        rows = meta["rows"] if meta else 0
+        return self._memmap(self.path(market, interval), "time", np.int64, rows).view("datetime64[ns]")
+
+    def load(self, market: str, interval: str, start=None, end=None) -> pd.DataFrame:
+        """
+        [start, end] 구간 봉 (KST naive 시각), 복사 없이 memmap 위에 만든 읽기 전용 DataFrame
+        """
+        meta = self._meta(market, interval)
+        if not meta:
+            return pd.DataFrame(columns=list(DEFAULT_COLUMNS), index=pd.DatetimeIndex([]), dtype=float)
+        directory = self.path(market, interval)
+        rows = meta["rows"]
+        times = self._memmap(directory, "time", np.int64, rows).view("datetime64[ns]")
+        lo = 0 if start is None else int(np.searchsorted(times, np.datetime64(pd.Timestamp(start), "ns"), "left"))
+        hi = rows if end is None else int(np.searchsorted(times, np.datetime64(pd.Timestamp(end), "ns"), "right"))
+        data = {c: self._memmap(directory, c, np.float64, rows)[lo:hi] for c in meta["columns"]}
+        return pd.DataFrame(data, index=pd.DatetimeIndex(times[lo:hi]), copy=False)
+
+    def write(self, market: str, interval: str, df: pd.DataFrame) -> int:
+        """
+        봉을 저장소에 합침 — 모두 마지막 봉 이후면 파일 끝에 추가, 아니면 합쳐서 다시 씀 (같은 시각은 새 값 우선)
+        :return: 저장 후 전체 행 수
+        """
+        if len(df) == 0:
+            return self.info(market, interval)["rows"]
+        directory = self.path(market, interval)
+        directory.mkdir(parents=True, exist_ok=True)
+        meta = self._meta(market, interval) or {"columns": list(DEFAULT_COLUMNS), "rows": 0}
+        columns = meta["columns"]
+
+        df = df[~df.index.duplicated(keep="last")].sort_index()
+        new_times = pd.DatetimeIndex(df.index).as_unit("ns").asi8
+        rows = meta["rows"]
+        if rows:
+            last = int(self._memmap(directory, "time", np.int64, rows)[-1])
+            if new_times[0] <= last:
+                existing = self.load(market, interval)
+                merged = pd.concat([existing[~existing.index.isin(df.index)], df[columns]]).sort_index()
+                return self._rewrite(directory, meta, merged)
+
+        offset = rows * 8
+        self._write_column(directory, "time", new_times.astype(np.int64), offset)
+        for c in columns:
+            self._write_column(directory, c, df[c].to_numpy(dtype=np.float64), offset)
+        meta["rows"] = rows + len(df)
+        self._write_meta(directory, meta)
+        return meta["rows"]
+
+    def _write_column(self, directory: Path, name: str, values: np.ndarray, offset: int):
+        path = directory / f"{name}.bin"
+        with open(path, "r+b" if path.exists() else "wb") as f:
+            f.seek(offset)
+            f.write(values.tobytes())
+            f.truncate()
+
+    def _rewrite(self, directory: Path, meta: dict, df: pd.DataFrame) -> int:
+        # 새 파일을 다 쓴 뒤 교체 (memmap으로 열려 있는 기존 파일은 그대로 유지됨)
+        columns = meta["columns"]
+        arrays = {"time": pd.DatetimeIndex(df.index).as_unit("ns").asi8.astype(np.int64)}
+        arrays.update({c: df[c].to_numpy(dtype=np.float64) for c in columns})
+        for name, values in arrays.items():
+            tmp = directory / f"{name}.bin.tmp"
+            values.tofile(tmp)
+            os.replace(tmp, directory / f"{name}.bin")
+        meta["rows"] = len(df)
+        self._write_meta(directory, meta)
+        return meta["rows"]
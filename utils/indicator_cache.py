@@ -0,0 +1,86 @@
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+
+
+class IndicatorCache:
+    def __init__(self, max_entries: int = 256):
+        """
+        (시계열 내용 해시, 지표 이름, 파라미터) → 계산 결과 배열을 LRU로 보관
+        같은 종가 구간에 같은 기간의 RSI/SMA를 다시 계산하지 않도록 파라미터 탐색/워크포워드에서 공유한다.
+        :param max_entries: 보관할 최대 결과 수 (초과 시 가장 오래 안 쓴 것부터 제거)
+        """
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._last_key = None  # (배열, 해시) — 같은 배열 객체를 연달아 조회할 때 재해싱 방지
+
+    def __len__(self):
+        return len(self.entries)
+
+    def key(self, values: np.ndarray) -> str:
+        # 해싱은 잠금 밖에서, 직전 키 메모만 잠금 안에서 읽고 씀
+        with self.lock:
+            last = self._last_key
+        if last is not None and last[0] is values:
+            return last[1]
+        data = np.ascontiguousarray(values, dtype=np.float64)
+        digest = hashlib.blake2b(data.view(np.uint8), digest_size=16)
+        digest.update(str(len(data)).encode())
+        key = digest.hexdigest()
+        with self.lock:
+            self._last_key = (values, key)
+        return key
+
+    def get(self, values: np.ndarray, name: str, params: tuple, compute) -> np.ndarray:
+        """
+        캐시에 있으면 그대로, 없으면 compute()로 계산해 저장
+        반환 배열은 여러 호출자가 공유하므로 읽기 전용으로 표시한다.
+        """
+        entry_key = (self.key(values), name, params)
+        with self.lock:
+            result = self.entries.get(entry_key)
+            if result is not None:
+                self.entries.move_to_end(entry_key)
+                self.hits += 1
+                return result
+            self.misses += 1
+
+        result = np.asarray(compute())
+        result.flags.writeable = False
+        with self.lock:
+            self.entries[entry_key] = result
+            self.entries.move_to_end(entry_key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return result
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self._last_key = None
+
+    def stats(self) -> dict:
+        with self.lock:
+            hits, misses, entries = self.hits, self.misses, len(self.entries)
+        total = hits + misses
+        return {
+            "entries": entries,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate_percent": round(hits / total * 100, 2) if total else 0.0,
+        }
+
+
+def cached(cache: IndicatorCache | None, values: np.ndarray, name: str, params: tuple, compute) -> np.ndarray:
+    """
+    cache가 None이면 바로 계산
+    """
+    if cache is None:
+        return np.asarray(compute())
+    return cache.get(values, name, params, compute)
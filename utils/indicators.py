@@ -0,0 +1,154 @@
+import math
+from collections import deque
+import pandas as pd
+
+
+class RollingWindow:
+    def __init__(self, window: int):
+        """
+        고정 길이 윈도우의 합을 봉 하나당 O(1)로 유지
+        :param window: 윈도우 길이 (봉 개수)
+        """
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.total = 0.0
+
+    def reset(self):
+        self.values.clear()
+        self.total = 0.0
+
+    def push(self, value: float):
+        if len(self.values) == self.window:
+            self.total -= self.values[0]
+        self.values.append(value)
+        self.total += value
+
+    def mean(self) -> float:
+        if len(self.values) < self.window:
+            return math.nan
+        return self.total / self.window
+
+    def mean_with(self, value: float) -> float:
+        """
+        value를 추가했다고 가정했을 때의 평균 (상태는 변경하지 않음)
+        """
+        if len(self.values) + 1 < self.window:
+            return math.nan
+        dropped = self.values[0] if len(self.values) == self.window else 0.0
+        return (self.total - dropped + value) / self.window
+
+
+class StreamingSMA:
+    def __init__(self, window: int):
+        self.window = window
+        self.sums = RollingWindow(window)
+
+    def reset(self):
+        self.sums.reset()
+
+    def update(self, close: float):
+        self.sums.push(close)
+
+    @property
+    def value(self) -> float:
+        return self.sums.mean()
+
+    def peek(self, close: float) -> float:
+        return self.sums.mean_with(close)
+
+
+class StreamingRSI:
+    def __init__(self, period: int = 14):
+        """
+        rolling().mean() 기반 RSI(compute_rsi)와 같은 값을 봉 단위로 갱신
+        :param period: RSI 기간
+        """
+        self.period = period
+        self.gains = RollingWindow(period)
+        self.losses = RollingWindow(period)
+        self.prev_close = None
+
+    def reset(self):
+        self.gains.reset()
+        self.losses.reset()
+        self.prev_close = None
+
+    def update(self, close: float):
+        if self.prev_close is None:
+            # compute_rsi처럼 첫 봉의 diff(NaN)는 상승/하락 0으로 채움
+            delta = 0.0
+        else:
+            delta = close - self.prev_close
+        self.gains.push(delta if delta > 0 else 0.0)
+        self.losses.push(-delta if delta < 0 else 0.0)
+        self.prev_close = close
+
+    @property
+    def value(self) -> float:
+        return self._rsi(self.gains.mean(), self.losses.mean())
+
+    def peek(self, close: float) -> float:
+        if self.prev_close is None:
+            return math.nan
+        delta = close - self.prev_close
+        gain = self.gains.mean_with(delta if delta > 0 else 0.0)
+        loss = self.losses.mean_with(-delta if delta < 0 else 0.0)
+        return self._rsi(gain, loss)
+
+    @staticmethod
+    def _rsi(gain: float, loss: float) -> float:
+        # pandas 계산과 동일하게: loss=0이면 gain>0일 때 100, 둘 다 0이면 NaN
+        if math.isnan(gain) or math.isnan(loss):
+            return math.nan
+        if loss == 0:
+            return 100.0 if gain > 0 else math.nan
+        return 100 - (100 / (1 + gain / loss))
+
+
+class IndicatorFeed:
+    def __init__(self, indicators: list, max_len: int = 1000):
+        """
+        DataFrame 종가를 스트리밍 지표에 반영한다.
+        마지막 봉은 진행 중인 봉으로 보고 확정하지 않으며, 다음 봉이 나타날 때 확정한다.
+        :param indicators: update()/reset()을 가진 지표 목록
+        :param max_len: 재동기화 시 반영할 최대 봉 개수
+        """
+        self.indicators = indicators
+        self.max_len = max_len
+        self.last_closed_time = None
+
+    def reset(self):
+        for indicator in self.indicators:
+            indicator.reset()
+        self.last_closed_time = None
+
+    def sync(self, close_series: pd.Series) -> float | None:
+        """
+        새로 확정된 봉만 지표에 반영
+        :param close_series: 종가 시계열 (시간순 정렬)
+        :return: 진행 중인 마지막 봉의 종가
+        """
+        n = len(close_series)
+        if n == 0:
+            return None
+
+        index = close_series.index
+        start = None
+        if self.last_closed_time is not None:
+            pos = index.searchsorted(self.last_closed_time, side="right")
+            if 0 < pos <= n and index[pos - 1] == self.last_closed_time and n - 1 - pos <= self.max_len:
+                start = pos
+
+        if start is None:
+            # 처음 호출이거나 이전 봉을 찾을 수 없으면 최근 max_len 봉으로 다시 채움
+            self.reset()
+            start = max(0, n - self.max_len)
+
+        if start < n - 1:
+            values = close_series.iloc[start:n - 1].to_numpy(dtype=float)
+            for value in values:
+                for indicator in self.indicators:
+                    indicator.update(value)
+            self.last_closed_time = index[n - 2]
+
+        return float(close_series.iloc[-1])
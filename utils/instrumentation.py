@@ -0,0 +1,250 @@
+import bisect
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# 초 단위 지연 시간 버킷 (Prometheus 기본값에 1ms 이하 구간을 추가)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # 마지막 칸은 +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """
+        버킷 상한 기준 근사 분위수
+        """
+        if self.count == 0:
+            return 0.0
+        target = q * self.count
+        cumulative = 0
+        for i, c in enumerate(self.counts):
+            cumulative += c
+            if cumulative >= target:
+                return self.buckets[i] if i < len(self.buckets) else float("inf")
+        return float("inf")
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(key: tuple, extra: tuple = ()) -> str:
+    items = key + extra
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in items) + "}"
+
+
+class Metrics:
+    def __init__(self):
+        """
+        지연 시간 히스토그램과 카운터를 모아 Prometheus 텍스트 형식으로 내보냄
+        이름과 라벨 조합마다 하나씩 만들어지며 여러 스레드에서 동시에 기록할 수 있다.
+        """
+        self.histograms = {}  # name -> {label key: Histogram}
+        self.counters = {}  # name -> {label key: float}
+        self.help = {}
+        self.lock = threading.Lock()
+        self.last_written = None
+
+    def describe(self, name: str, text: str):
+        self.help[name] = text
+
+    def observe(self, name: str, value: float, **labels):
+        key = _label_key(labels)
+        with self.lock:
+            series = self.histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(value)
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = _label_key(labels)
+        with self.lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    @contextmanager
+    def api_call(self, endpoint: str):
+        """
+        외부 API 호출 하나: 호출 수/오류 수/지연 시간 기록 (예외는 그대로 전달)
+        """
+        self.inc("upbit_api_calls_total", endpoint=endpoint)
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.inc("upbit_api_errors_total", endpoint=endpoint)
+            raise
+        finally:
+            self.observe("upbit_api_seconds", time.perf_counter() - start, endpoint=endpoint)
+
+    def call(self, endpoint: str, fn, *args, **kwargs):
+        """
+        pyupbit처럼 실패를 None(또는 {"error": ...} 응답)으로 돌려주는 함수도 오류로 집계
+        """
+        with self.api_call(endpoint):
+            result = fn(*args, **kwargs)
+        if result is None or (isinstance(result, dict) and "error" in result):
+            self.inc("upbit_api_errors_total", endpoint=endpoint)
+        return result
+
+    def render(self) -> str:
+        lines = []
+        with self.lock:
+            for name in sorted(self.counters):
+                if name in self.help:
+                    lines.append(f"# HELP {name} {self.help[name]}")
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(self.counters[name].items()):
+                    lines.append(f"{name}{_format_labels(key)} {value:g}")
+            for name in sorted(self.histograms):
+                if name in self.help:
+                    lines.append(f"# HELP {name} {self.help[name]}")
+                lines.append(f"# TYPE {name} histogram")
+                for key, h in sorted(self.histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip(h.buckets + (float("inf"),), h.counts):
+                        cumulative += count
+                        le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                        lines.append(f"{name}_bucket{_format_labels(key, (('le', le),))} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {h.sum:.6f}")
+                    lines.append(f"{name}_count{_format_labels(key)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self, name: str) -> list[tuple[str, int, float, float, float]]:
+        """
+        콘솔 출력용: (라벨, 횟수, 평균, p50, p99) 목록
+        """
+        with self.lock:
+            series = dict(self.histograms.get(name, {}))
+        rows = []
+        for key, h in sorted(series.items()):
+            label = ",".join(f"{k}={v}" for k, v in key)
+            rows.append((label, h.count, h.sum / h.count if h.count else 0.0, h.quantile(0.5), h.quantile(0.99)))
+        return rows
+
+    def write(self, path: str):
+        """
+        node_exporter textfile collector 등에서 읽을 수 있도록 파일로 (원자적으로) 저장
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(self.render())
+        os.replace(tmp, path)
+        self.last_written = time.monotonic()
+
+    def maybe_write(self, path: str, interval_sec: float = 15.0) -> bool:
+        """
+        마지막 저장 후 interval_sec(실제 시간)이 지났을 때만 write()
+        """
+        if self.last_written is not None and time.monotonic() - self.last_written < interval_sec:
+            return False
+        self.write(path)
+        return True
+
+    def serve(self, port: int = 9108, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """
+        http://host:port/metrics 로 노출 (데몬 스레드)
+        """
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+class TickProfiler:
+    def __init__(self, output_dir: str = "logs", top: int = 25):
+        """
+        request(n) 이후 n번의 tick을 cProfile로 측정하고 끝나면 결과를 출력/저장
+        """
+        self.output_dir = Path(output_dir)
+        self.top = top
+        self.remaining = 0
+        self.profile = None
+        self.lock = threading.Lock()
+
+    def request(self, ticks: int):
+        with self.lock:
+            self.remaining = max(0, ticks)
+            self.profile = cProfile.Profile() if ticks > 0 else None
+
+    @contextmanager
+    def tick(self):
+        with self.lock:
+            profile = self.profile if self.remaining > 0 else None
+        if profile is None:
+            yield
+            return
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            with self.lock:
+                self.remaining -= 1
+                done = self.remaining <= 0
+                if done:
+                    self.profile = None
+            if done:
+                self._report(profile)
+
+    def _report(self, profile: cProfile.Profile):
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        path = self.output_dir / f"profile-{time.strftime('%Y%m%d-%H%M%S')}.prof"
+        profile.dump_stats(path)
+        out = io.StringIO()
+        pstats.Stats(profile, stream=out).sort_stats("cumulative").print_stats(self.top)
+        print(out.getvalue())
+        print(f"[Profile Saved] {path}")
+
+
+_default_metrics = Metrics()
+
+
+def get_metrics() -> Metrics:
+    """
+    프로세스에서 함께 쓰는 기본 지표 모음
+    """
+    return _default_metrics
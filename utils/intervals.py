@@ -0,0 +1,31 @@
+import numpy as np
+
+INTERVAL_MAP = {
+    "minute1": 60,
+    "minute3": 180,
+    "minute5": 300,
+    "minute15": 900,
+    "minute30": 1800,
+    "minute60": 3600,
+    "minute240": 14400,
+    "day": 86400,
+}
+
+# pyupbit 캔들 인덱스는 KST(UTC+9) 기준 naive datetime
+KST_OFFSET_SEC = 9 * 3600
+
+
+def candle_start(ts_sec: float, interval_sec: int) -> int:
+    """
+    주어진 시각(UTC epoch 초)이 속한 봉의 시작 시각
+    업비트 봉 경계는 UTC 기준으로 나누어 떨어지므로 (일봉 = KST 09:00) 단순 내림으로 계산
+    """
+    return int(ts_sec // interval_sec) * interval_sec
+
+
+def candle_label(ts_sec: float, interval_sec: int) -> np.datetime64:
+    """
+    주어진 시각이 속한 봉의 인덱스 값 (pyupbit와 같은 KST naive datetime)
+    """
+    start = candle_start(ts_sec, interval_sec) + KST_OFFSET_SEC
+    return np.datetime64(start * 1_000_000_000, "ns")
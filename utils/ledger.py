@@ -0,0 +1,93 @@
+from collections import deque
+
+
+class Lot:
+    __slots__ = ("price", "amount")
+
+    def __init__(self, price: float, amount: float):
+        self.price = price
+        self.amount = amount
+
+
+class PositionLedger:
+    __slots__ = ("lots", "position", "cost_basis", "avg_cost", "realized_pnl", "fees", "eps")
+
+    def __init__(self, eps: float = 1e-12):
+        """
+        한 종목의 보유 수량/매수 원가를 FIFO 로트로 관리 (체결당 상각 O(1))
+        - avg_price: 매수 때만 바뀌는 가중 평균 매수가 (수수료 제외, 업비트 avg_buy_price와 같은 기준 — 매도해도 그대로)
+        - cost_basis: 남아 있는 FIFO 로트의 매수가 × 수량 합 (부분 매도 후에는 avg_price × 수량과 다를 수 있음)
+        - realized_pnl: 매도로 확정된 손익 (FIFO, 수수료 차감)
+        :param eps: 이보다 작은 잔량은 0으로 보고 로트를 비움
+        """
+        self.lots = deque()
+        self.position = 0.0
+        self.cost_basis = 0.0
+        self.avg_cost = 0.0
+        self.realized_pnl = 0.0
+        self.fees = 0.0
+        self.eps = eps
+
+    @property
+    def avg_price(self) -> float:
+        # 매수/매도 판단용 — 부분 매도 뒤에도 실거래(업비트)와 같은 값
+        return self.avg_cost if self.position > self.eps else 0.0
+
+    def buy(self, price: float, amount: float, fee: float = 0.0):
+        """
+        :param fee: 원화 기준 수수료
+        """
+        self.lots.append(Lot(price, amount))
+        held = self.position if self.position > self.eps else 0.0
+        if held + amount > 0:
+            self.avg_cost = (self.avg_cost * held + price * amount) / (held + amount)
+        self.position += amount
+        self.cost_basis += price * amount
+        self.fees += fee
+        self.realized_pnl -= fee
+
+    def sell(self, price: float, amount: float, fee: float = 0.0) -> float:
+        """
+        앞선 로트부터 차감
+        :param fee: 원화 기준 수수료
+        :return: 이번 매도로 확정된 손익
+        """
+        remaining = amount
+        pnl = -fee
+        lots = self.lots
+        while remaining > self.eps and lots:
+            lot = lots[0]
+            used = min(lot.amount, remaining)
+            pnl += (price - lot.price) * used
+            self.cost_basis -= lot.price * used
+            lot.amount -= used
+            remaining -= used
+            if lot.amount <= self.eps:
+                lots.popleft()
+
+        self.position -= amount
+        if self.position <= self.eps or not lots:
+            # 부동소수 오차로 남은 잔량 정리
+            lots.clear()
+            self.position = max(self.position, 0.0)
+            self.cost_basis = 0.0
+            self.avg_cost = 0.0
+        self.fees += fee
+        self.realized_pnl += pnl
+        return pnl
+
+    def unrealized_pnl(self, price: float) -> float:
+        return price * self.position - self.cost_basis
+
+    def snapshot(self, price: float | None = None) -> dict:
+        result = {
+            "position": self.position,
+            "avg_price": self.avg_price,
+            "cost_basis": self.cost_basis,
+            "realized_pnl": self.realized_pnl,
+            "fees": self.fees,
+            "lots": len(self.lots),
+        }
+        if price is not None:
+            result["unrealized_pnl"] = self.unrealized_pnl(price)
+        return result
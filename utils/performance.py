@@ -0,0 +1,168 @@
+import copy
+import threading
+import time
+from utils.ledger import PositionLedger
+
+
+class PerformanceTracker:
+    def __init__(self):
+        """
+        체결과 봉 종가가 들어올 때마다 평가금액/고점/최대 낙폭/실현·미실현 손익/승률을 O(1)로 갱신
+        (거래 기록 파일을 다시 읽거나 API를 추가로 호출하지 않음)
+        - 현금은 시작 잔고에서 체결 금액과 수수료만 반영 (입출금은 반영하지 않음)
+        - 평가금액 = 현금 + Σ 보유 수량 × 마지막 가격
+        """
+        self.lock = threading.Lock()
+        self.started = False
+        self.started_at = None
+        self.initial_equity = 0.0
+        self.cash = 0.0
+        self.ledgers = {}  # ticker -> PositionLedger
+        self.prices = {}  # ticker -> 마지막 가격
+        self.market_value = 0.0  # Σ 보유 수량 × 마지막 가격
+        self.cost_basis = 0.0  # Σ ledger.cost_basis
+        self.realized_pnl = 0.0
+        self.fees = 0.0
+        self.peak = 0.0
+        self.max_drawdown = 0.0  # 비율 (0.1 = 10%)
+        self.wins = 0
+        self.losses = 0
+        self.buys = 0
+        self.sells = 0
+
+    def start(self, cash: float, holdings: dict | None = None):
+        """
+        추적 시작 시점의 잔고로 초기화
+        :param holdings: 마켓 코드 → (보유 수량, 평단가) — 첫 가격을 받기 전까지는 평단가로 평가
+        """
+        with self.lock:
+            self.cash = float(cash)
+            self.ledgers = {}
+            self.prices = {}
+            self.market_value = self.cost_basis = 0.0
+            for ticker, (amount, avg_price) in (holdings or {}).items():
+                if amount <= 0:
+                    continue
+                ledger = self._ledger(ticker)
+                ledger.buy(avg_price, amount)
+                self.prices[ticker] = avg_price
+                self.market_value += amount * avg_price
+                self.cost_basis += ledger.cost_basis
+            self.realized_pnl = self.fees = 0.0
+            self.wins = self.losses = self.buys = self.sells = 0
+            self.initial_equity = self.peak = self.cash + self.market_value
+            self.max_drawdown = 0.0
+            self.started = True
+            self.started_at = time.time()
+
+    def _ledger(self, ticker: str) -> PositionLedger:
+        if ticker not in self.ledgers:
+            self.ledgers[ticker] = PositionLedger()
+        return self.ledgers[ticker]
+
+    @property
+    def equity(self) -> float:
+        return self.cash + self.market_value
+
+    @property
+    def unrealized_pnl(self) -> float:
+        return self.market_value - self.cost_basis
+
+    @property
+    def drawdown(self) -> float:
+        return (self.peak - self.equity) / self.peak if self.peak > 0 else 0.0
+
+    @property
+    def win_rate(self) -> float | None:
+        closed = self.wins + self.losses
+        return self.wins / closed if closed else None
+
+    def _mark(self):
+        equity = self.cash + self.market_value
+        if equity > self.peak:
+            self.peak = equity
+        elif self.peak > 0:
+            self.max_drawdown = max(self.max_drawdown, (self.peak - equity) / self.peak)
+
+    def on_fill(self, ticker: str, side: str, price: float, amount: float, fee: float = 0.0):
+        """
+        체결 하나 반영
+        :param side: "BUY" | "SELL"
+        :param fee: 원화 기준 수수료
+        """
+        price, amount, fee = float(price), float(amount), float(fee)
+        with self.lock:
+            ledger = self._ledger(ticker)
+            before_position, before_cost = ledger.position, ledger.cost_basis
+            last = self.prices.get(ticker, price)
+            if side == "BUY":
+                ledger.buy(price, amount, fee)
+                self.cash -= price * amount + fee
+                self.realized_pnl -= fee
+                self.buys += 1
+            else:
+                pnl = ledger.sell(price, amount, fee)
+                self.cash += price * amount - fee
+                self.realized_pnl += pnl
+                self.sells += 1
+                if pnl > 0:
+                    self.wins += 1
+                else:
+                    self.losses += 1
+            self.fees += fee
+            # 체결가를 이 마켓의 마지막 가격으로 보고 보유 평가액을 다시 맞춤
+            self.prices[ticker] = price
+            self.market_value += ledger.position * price - before_position * last
+            self.cost_basis += ledger.cost_basis - before_cost
+            self._mark()
+
+    def on_price(self, ticker: str, price: float):
+        """
+        봉 종가/현재가 반영
+        """
+        price = float(price)
+        with self.lock:
+            ledger = self.ledgers.get(ticker)
+            if ledger is not None and ledger.position > 0:
+                self.market_value += ledger.position * (price - self.prices.get(ticker, price))
+            self.prices[ticker] = price
+            self._mark()
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            equity = self.equity
+            return {
+                "equity": equity,
+                "cash": self.cash,
+                "market_value": self.market_value,
+                "initial_equity": self.initial_equity,
+                "return_percent": (equity / self.initial_equity - 1) * 100 if self.initial_equity > 0 else 0.0,
+                "peak": self.peak,
+                "drawdown_percent": self.drawdown * 100,
+                "max_drawdown_percent": self.max_drawdown * 100,
+                "realized_pnl": self.realized_pnl,
+                "unrealized_pnl": self.unrealized_pnl,
+                "fees": self.fees,
+                "buys": self.buys,
+                "sells": self.sells,
+                "win_rate_percent": self.win_rate * 100 if self.win_rate is not None else None,
+            }
+
+    def market_snapshot(self) -> dict:
+        """
+        :return: 마켓 코드 → PositionLedger.snapshot(마지막 가격)
+        """
+        with self.lock:
+            return {ticker: ledger.snapshot(self.prices.get(ticker))
+                    for ticker, ledger in self.ledgers.items() if ledger.position > 0 or ledger.realized_pnl}
+
+    def state_dict(self) -> dict:
+        """
+        스냅샷용 — 잠금 안에서 로트까지 깊은 복사 (저장하는 동안 체결이 들어와도 일관된 상태)
+        """
+        with self.lock:
+            return copy.deepcopy({k: v for k, v in self.__dict__.items() if k != "lock"})
+
+    def load_state(self, state: dict):
+        with self.lock:
+            self.__dict__.update(state)
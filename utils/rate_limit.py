@@ -0,0 +1,72 @@
+import re
+import threading
+import time
+
+REMAINING_REQ_PATTERN = re.compile(r"group=([a-z\-]+); min=([0-9]+); sec=([0-9]+)")
+
+
+def parse_remaining_req(header: str) -> dict | None:
+    """
+    업비트 Remaining-Req 헤더 파싱
+    예) "group=default; min=1799; sec=29" → {"group": "default", "min": 1799, "sec": 29}
+    """
+    matched = REMAINING_REQ_PATTERN.search(header or "")
+    if matched is None:
+        return None
+    return {"group": matched.group(1), "min": int(matched.group(2)), "sec": int(matched.group(3))}
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float | None = None, time_fn=time.monotonic, sleep_fn=time.sleep):
+        """
+        토큰 버킷 요청 제한기
+        :param rate: 초당 충전되는 토큰 수
+        :param capacity: 최대 토큰 수 (기본값: rate)
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.tokens = self.capacity
+        self.time_fn = time_fn
+        self.sleep_fn = sleep_fn
+        self.updated_at = time_fn()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def try_acquire(self, tokens: float = 1) -> float:
+        """
+        :return: 0이면 획득 성공, 아니면 다시 시도하기까지 기다려야 할 시간(초)
+        """
+        with self.lock:
+            now = self.time_fn()
+            if now < self.blocked_until:
+                return self.blocked_until - now
+            self._refill(now)
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return 0.0
+            return (tokens - self.tokens) / self.rate
+
+    def acquire(self, tokens: float = 1):
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                return
+            self.sleep_fn(wait)
+
+    def update_remaining(self, remaining: dict | None):
+        """
+        서버가 알려준 남은 요청 수(Remaining-Req의 sec)로 토큰 수를 맞춤
+        남은 요청이 없으면 다음 1초 구간까지 막음
+        """
+        if not remaining:
+            return
+        with self.lock:
+            now = self.time_fn()
+            self._refill(now)
+            self.tokens = min(self.tokens, remaining["sec"])
+            if remaining["sec"] <= 0:
+                self.blocked_until = now + 1.0
@@ -0,0 +1,150 @@
+import numpy as np
+import pandas as pd
+from utils.candle_buffer import CandleBuffer
+from utils.intervals import INTERVAL_MAP, KST_OFFSET_SEC
+
+NS = 1_000_000_000
+# 컬럼별 집계 방법 (없는 컬럼은 건너뜀)
+AGGREGATIONS = {
+    "open": "first",
+    "high": "max",
+    "low": "min",
+    "close": "last",
+    "volume": "sum",
+    "value": "sum",
+}
+
+
+def bucket_labels(times, interval_sec: int) -> np.ndarray:
+    """
+    KST naive 봉 시각 → 상위 봉 시각 (업비트 봉 경계는 UTC 기준, 일봉은 KST 09:00 시작)
+    """
+    ns = np.asarray(times, dtype="datetime64[ns]").astype(np.int64)
+    step = interval_sec * NS
+    offset = KST_OFFSET_SEC * NS
+    return ((ns - offset) // step * step + offset).astype("datetime64[ns]")
+
+
+def resample_ohlcv(df: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """
+    하위 봉(예: minute1)을 interval 봉으로 한 번에 묶음 — 마지막 봉은 진행 중인 부분 봉일 수 있음
+    """
+    columns = [c for c in df.columns if c in AGGREGATIONS]
+    if len(df) == 0:
+        return df[columns].copy()
+    labels = bucket_labels(df.index.values, INTERVAL_MAP[interval])
+    starts = np.flatnonzero(np.concatenate(([True], labels[1:] != labels[:-1])))
+    ends = np.concatenate((starts[1:], [len(df)])) - 1
+    data = {}
+    for c in columns:
+        values = df[c].to_numpy(dtype=np.float64)
+        how = AGGREGATIONS[c]
+        if how == "first":
+            data[c] = values[starts]
+        elif how == "last":
+            data[c] = values[ends]
+        elif how == "max":
+            data[c] = np.maximum.reduceat(values, starts)
+        elif how == "min":
+            data[c] = np.minimum.reduceat(values, starts)
+        else:
+            data[c] = np.add.reduceat(values, starts)
+    return pd.DataFrame(data, index=pd.DatetimeIndex(labels[starts]))
+
+
+def load_timeframe(store, market: str, interval: str, start=None, end=None, base_interval: str = "minute1"):
+    """
+    저장소에 interval 봉이 있으면 그대로, 없으면 base_interval 봉을 묶어서 반환 (추가 다운로드 없음)
+    """
+    if store.info(market, interval)["rows"]:
+        return store.load(market, interval, start, end)
+    return resample_ohlcv(store.load(market, base_interval, start, end), interval)
+
+
+def _combine(columns: list, row: np.ndarray, other: np.ndarray) -> np.ndarray:
+    combined = row.copy()
+    for i, c in enumerate(columns):
+        how = AGGREGATIONS[c]
+        if how == "last":
+            combined[i] = other[i]
+        elif how == "max":
+            combined[i] = max(row[i], other[i])
+        elif how == "min":
+            combined[i] = min(row[i], other[i])
+        elif how == "sum":
+            combined[i] = row[i] + other[i]
+    return combined
+
+
+class TimeframeAggregator:
+    def __init__(self, intervals: list, columns: list | None = None, capacity: int = 1000):
+        """
+        하위 봉 스트림(예: minute1 DataFrame)에서 여러 상위 봉을 봉 하나당 O(1)로 갱신
+        IndicatorFeed처럼 마지막 봉은 진행 중인 봉으로 보고, 확정된 봉만 누적한 뒤 진행 중인 봉을 얹어서 보여준다.
+        :param intervals: 만들 봉 간격 목록 (INTERVAL_MAP 키)
+        :param columns: 집계할 컬럼 (기본: 첫 update의 컬럼 중 AGGREGATIONS에 있는 것)
+        :param capacity: 간격별로 보관할 최대 봉 개수
+        """
+        for interval in intervals:
+            if interval not in INTERVAL_MAP:
+                raise ValueError(f"Unknown interval: {interval}")
+        self.intervals = list(intervals)
+        self.columns = list(columns) if columns is not None else None
+        self.capacity = capacity
+        self.buffers = {}
+        self.partials = {}  # interval -> (봉 시각, 확정된 하위 봉만 묶은 값)
+        self.last_closed_time = None
+
+    def reset(self):
+        self.buffers = {interval: CandleBuffer(self.columns, self.capacity) for interval in self.intervals}
+        self.partials = {}
+        self.last_closed_time = None
+
+    def _fold(self, interval: str, label, row: np.ndarray, closed: bool):
+        partial = self.partials.get(interval)
+        if partial is not None and partial[0] == label:
+            row = _combine(self.columns, partial[1], row)
+        if closed:
+            self.partials[interval] = (label, row)
+        self.buffers[interval].upsert(label, row)
+
+    def update(self, df: pd.DataFrame):
+        """
+        새로 확정된 하위 봉과 진행 중인 마지막 봉을 반영
+        """
+        n = len(df)
+        if n == 0:
+            return
+        if self.columns is None:
+            self.columns = [c for c in df.columns if c in AGGREGATIONS]
+        if not self.buffers:
+            self.reset()
+
+        index = df.index
+        start = None
+        if self.last_closed_time is not None:
+            pos = index.searchsorted(self.last_closed_time, side="right")
+            if 0 < pos <= n and index[pos - 1] == self.last_closed_time:
+                start = pos
+        if start is None:
+            # 처음이거나 이전 봉을 찾을 수 없으면 받은 구간 전체로 다시 만듦
+            self.reset()
+            start = 0
+
+        # 단일 블록 프레임(CandleBuffer.view 등)은 복사 없이 배열로 변환됨
+        positions = [df.columns.get_loc(c) for c in self.columns]
+        rows = df.to_numpy(dtype=np.float64)[start:, positions]
+        times = index.values[start:]
+        labels = {interval: bucket_labels(times, INTERVAL_MAP[interval]) for interval in self.intervals}
+        last = len(rows) - 1
+        for i, row in enumerate(rows):
+            for interval in self.intervals:
+                self._fold(interval, labels[interval][i], row, i < last)
+        if n >= 2:
+            self.last_closed_time = index[n - 2]
+
+    def frame(self, interval: str) -> pd.DataFrame:
+        """
+        interval 봉 DataFrame (복사 없는 읽기 전용 view, 다음 update 전까지만 유효)
+        """
+        return self.buffers[interval].view()
@@ -0,0 +1,92 @@
+import os
+import pickle
+import time
+from pathlib import Path
+
+SNAPSHOT_VERSION = 2  # 2: PositionLedger.avg_cost 추가
+
+
+def capture(engine) -> dict:
+    """
+    엔진의 마켓별 전략(지표 상태 포함)과 실행기 상태(봉 버퍼, 잔고/로트, 미체결 주문),
+    실시간 성과 추적기(고점/최대 낙폭 등)를 모음
+    """
+    return {
+        "version": SNAPSHOT_VERSION,
+        "saved_at": time.time(),
+        "interval": engine.interval,
+        "executor": type(engine.executor).__name__,
+        "markets": {ticker: {"strategy": state.strategy, "last_candle_time": state.last_candle_time,
+                             "last_price": state.last_price}
+                    for ticker, state in engine.markets.items()},
+        "executor_state": engine.executor.state_dict(),
+        "performance": engine.performance.state_dict(),
+    }
+
+
+def restore(engine, snapshot: dict) -> list:
+    """
+    capture()로 만든 상태를 엔진에 반영 (봉 간격이 다르면 무시, 실행기/전략은 같은 종류일 때만)
+    :return: 전략 상태를 복원한 마켓 목록
+    """
+    if snapshot.get("version") != SNAPSHOT_VERSION or snapshot.get("interval") != engine.interval:
+        return []
+    if snapshot.get("executor") == type(engine.executor).__name__:
+        engine.executor.load_state(snapshot["executor_state"])
+        if "performance" in snapshot:
+            engine.performance.load_state(snapshot["performance"])
+    restored = []
+    for ticker, saved in snapshot["markets"].items():
+        state = engine.markets.get(ticker)
+        if state is None or type(saved["strategy"]) is not type(state.strategy):
+            continue
+        state.strategy = saved["strategy"]
+        state.last_candle_time = saved["last_candle_time"]
+        state.last_price = saved["last_price"]
+        restored.append(ticker)
+    return restored
+
+
+class SnapshotManager:
+    def __init__(self, path: str = "logs/snapshot.pkl", interval_sec: float = 60.0, time_fn=time.monotonic):
+        """
+        엔진 상태를 주기적으로 파일에 저장하고 시작할 때 복원 (pickle, 임시 파일에 쓴 뒤 교체)
+        :param path: 스냅샷 파일 경로
+        :param interval_sec: maybe_save()가 실제로 저장하는 최소 간격(초)
+        """
+        self.path = Path(path)
+        self.interval_sec = interval_sec
+        self.time_fn = time_fn
+        self.last_saved = None
+
+    def save(self, engine) -> Path:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(capture(engine), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self.path)
+        self.last_saved = self.time_fn()
+        return self.path
+
+    def maybe_save(self, engine) -> bool:
+        if self.last_saved is not None and self.time_fn() - self.last_saved < self.interval_sec:
+            return False
+        self.save(engine)
+        return True
+
+    def load(self) -> dict | None:
+        if not self.path.exists():
+            return None
+        try:
+            with open(self.path, "rb") as f:
+                return pickle.load(f)
+        except Exception as e:
+            # 코드가 바뀌어 읽을 수 없는 스냅샷은 버리고 처음부터 시작
+            print(f"[Snapshot Load Error] {e}")
+            return None
+
+    def restore(self, engine) -> list:
+        snapshot = self.load()
+        if snapshot is None:
+            return []
+        return restore(engine, snapshot)
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import config
 
@@ -40,3 +41,31 @@ class StopLossDetector:
         :return: 손절 여부
         """
         return self.is_sharp_decline(close_series)
+
+
+    def sharp_decline_mask(self, close: np.ndarray, window: int | None = None) -> np.ndarray:
+        """
+        모든 봉에 대해 is_sharp_decline 결과를 한 번에 계산
+        :param close: 종가 배열
+        :param window: 봉마다 전달되던 종가 개수 (예: tail(10)); lookback보다 작으면 항상 False
+        :return: 봉별 급락 여부 배열
+        """
+        close = np.asarray(close, dtype=float)
+        lookback = self.compute_lookback()
+        mask = np.zeros(len(close), dtype=bool)
+        if (window is not None and window < lookback) or len(close) < lookback:
+            return mask
+
+        start = close[:len(close) - lookback + 1]
+        end = close[lookback - 1:]
+        drop_pct = (end - start) / start * 100
+        mask[lookback - 1:] = drop_pct <= self.sharp_drop_threshold
+        return mask
+
+    def cached_decline_mask(self, close: np.ndarray, window: int | None = None, cache=None) -> np.ndarray:
+        """
+        sharp_decline_mask를 IndicatorCache에 (임계치, lookback, window) 키로 보관
+        """
+        from utils.indicator_cache import cached
+        params = (self.sharp_drop_threshold, self.compute_lookback(), window)
+        return cached(cache, close, "sharp_decline", params, lambda: self.sharp_decline_mask(close, window=window))
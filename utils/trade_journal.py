@@ -0,0 +1,203 @@
+import csv
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trades (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    market TEXT NOT NULL,
+    side TEXT NOT NULL,
+    price REAL NOT NULL,
+    amount REAL NOT NULL,
+    profit REAL,
+    avg_buy_price REAL,
+    total_coin REAL,
+    total_krw REAL,
+    uuid TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_trades_market_ts ON trades (market, ts);
+CREATE INDEX IF NOT EXISTS idx_trades_ts ON trades (ts);
+CREATE TABLE IF NOT EXISTS order_events (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    uuid TEXT NOT NULL,
+    market TEXT,
+    side TEXT,
+    event TEXT NOT NULL,
+    state TEXT,
+    price REAL,
+    volume REAL
+);
+CREATE INDEX IF NOT EXISTS idx_order_events_uuid ON order_events (uuid);
+CREATE INDEX IF NOT EXISTS idx_order_events_ts ON order_events (ts);
+"""
+
+TRADE_COLUMNS = ("ts", "market", "side", "price", "amount", "profit", "avg_buy_price", "total_coin", "total_krw", "uuid")
+ORDER_EVENT_COLUMNS = ("ts", "uuid", "market", "side", "event", "state", "price", "volume")
+
+
+class TradeJournal:
+    def __init__(self, path: str = "logs/trades.db", batch_size: int = 200, flush_interval: float = 0.5):
+        """
+        체결/주문 이벤트 기록을 큐에 넣고 백그라운드 스레드가 SQLite(WAL)에 묶어서 커밋한다.
+        :param path: 데이터베이스 파일 경로
+        :param batch_size: 한 번에 커밋할 최대 레코드 수
+        :param flush_interval: 레코드가 적을 때 커밋을 미루는 최대 시간(초)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue()
+
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        conn.close()
+
+        self._thread = threading.Thread(target=self._writer, daemon=True)
+        self._thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # --- 기록 (매매 스레드에서 호출, 블로킹 없음) ---
+
+    def record_trade(self, market: str, side: str, price: float, amount: float, profit: float | None = None,
+                     avg_buy_price: float | None = None, total_coin: float | None = None,
+                     total_krw: float | None = None, uuid: str | None = None, ts: float | None = None):
+        ts = time.time() if ts is None else ts
+        self.queue.put(("trades", (ts, market, side, price, amount, profit, avg_buy_price, total_coin, total_krw, uuid)))
+
+    def record_order_event(self, uuid: str, event: str, market: str | None = None, side: str | None = None,
+                           state: str | None = None, price: float | None = None, volume: float | None = None,
+                           ts: float | None = None):
+        ts = time.time() if ts is None else ts
+        self.queue.put(("order_events", (ts, uuid, market, side, event, state, price, volume)))
+
+    def flush(self):
+        """
+        큐에 쌓인 레코드가 모두 커밋될 때까지 대기
+        """
+        self.queue.join()
+
+    def close(self):
+        """
+        큐에 남은 기록을 모두 커밋하고 쓰기 스레드 종료 (여러 번 호출해도 됨)
+        """
+        if not self._thread.is_alive():
+            return
+        self.queue.put(None)
+        self._thread.join()
+
+    def _writer(self):
+        conn = self._connect()
+        statements = {
+            "trades": f"INSERT INTO trades ({', '.join(TRADE_COLUMNS)}) VALUES ({', '.join('?' * len(TRADE_COLUMNS))})",
+            "order_events": f"INSERT INTO order_events ({', '.join(ORDER_EVENT_COLUMNS)}) "
+                            f"VALUES ({', '.join('?' * len(ORDER_EVENT_COLUMNS))})",
+        }
+        stop = False
+        while not stop:
+            item = self.queue.get()
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and item is not None:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self.queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                batch.append(item)
+
+            rows = {"trades": [], "order_events": []}
+            for entry in batch:
+                if entry is None:
+                    stop = True
+                else:
+                    rows[entry[0]].append(entry[1])
+            try:
+                with conn:
+                    for table, values in rows.items():
+                        if values:
+                            conn.executemany(statements[table], values)
+            except Exception as e:
+                print(f"[Journal Write Error] {e}")
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+        conn.close()
+
+    # --- 조회 (읽기 전용 연결, 쓰기 스레드와 동시에 가능) ---
+
+    def _query(self, sql: str, params: tuple = ()) -> list[dict]:
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        try:
+            return [dict(row) for row in conn.execute(sql, params)]
+        finally:
+            conn.close()
+
+    def recent_trades(self, limit: int = 20, market: str | None = None) -> list[dict]:
+        if market is None:
+            return self._query("SELECT * FROM trades ORDER BY ts DESC LIMIT ?", (limit,))
+        return self._query("SELECT * FROM trades WHERE market = ? ORDER BY ts DESC LIMIT ?", (market, limit))
+
+    def trade_stats(self, market: str | None = None, since: float | None = None) -> dict:
+        where, params = [], []
+        if market is not None:
+            where.append("market = ?")
+            params.append(market)
+        if since is not None:
+            where.append("ts >= ?")
+            params.append(since)
+        clause = f"WHERE {' AND '.join(where)}" if where else ""
+        return self._query(
+            "SELECT COUNT(*) AS trades, "
+            "SUM(side = 'BUY') AS buys, SUM(side = 'SELL') AS sells, "
+            "SUM(CASE WHEN side = 'BUY' THEN price * amount ELSE 0 END) AS bought_krw, "
+            "SUM(CASE WHEN side = 'SELL' THEN price * amount ELSE 0 END) AS sold_krw, "
+            f"MAX(ts) AS last_ts FROM trades {clause}", tuple(params))[0]
+
+    def order_events(self, uuid: str) -> list[dict]:
+        return self._query("SELECT * FROM order_events WHERE uuid = ? ORDER BY ts", (uuid,))
+
+    def export_csv(self, path: str, market: str | None = None) -> int:
+        """
+        체결 기록을 CSV로 내보냄
+        :return: 내보낸 행 수
+        """
+        if market is None:
+            rows = self._query("SELECT * FROM trades ORDER BY ts")
+        else:
+            rows = self._query("SELECT * FROM trades WHERE market = ? ORDER BY ts", (market,))
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(("timestamp",) + TRADE_COLUMNS[1:])
+            for row in rows:
+                writer.writerow([time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(row["ts"]))] +
+                                [row[c] for c in TRADE_COLUMNS[1:]])
+        return len(rows)
+
+
+_default_journal = None
+_default_lock = threading.Lock()
+
+
+def get_journal() -> TradeJournal:
+    """
+    프로세스에서 함께 쓰는 기본 저널 (logs/trades.db)
+    """
+    global _default_journal
+    with _default_lock:
+        if _default_journal is None:
+            _default_journal = TradeJournal()
+        return _default_journal
@@ -0,0 +1,107 @@
+import asyncio
+import json
+import threading
+import time
+import websockets
+
+
+def load_trades(path: str) -> list[dict]:
+    """
+    JSONL 파일(한 줄에 업비트 trade 메시지 하나)에서 체결 기록을 읽음
+    """
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def record_trades(codes: list, path: str, seconds: float, url: str | None = None):
+    """
+    실제 체결 스트림을 seconds 동안 JSONL로 기록 (TradeReplayServer 입력용)
+    """
+    from utils.trade_stream import UpbitTradeStream, UPBIT_WEBSOCKET_URL
+
+    with open(path, "a", encoding="utf-8") as f:
+        def on_trade(code, ts_ms, price, volume):
+            f.write(json.dumps({
+                "type": "trade", "code": code, "timestamp": ts_ms,
+                "trade_timestamp": ts_ms, "trade_price": price, "trade_volume": volume,
+            }) + "\n")
+
+        stream = UpbitTradeStream(codes, on_trade, url=url or UPBIT_WEBSOCKET_URL).start()
+        time.sleep(seconds)
+        stream.stop()
+
+
+class TradeReplayServer:
+    def __init__(self, trades: list[dict], host: str = "127.0.0.1", port: int = 0, speed: float = 1.0,
+                 rebase_time: bool = True):
+        """
+        기록된 체결을 업비트 WebSocket과 같은 형식으로 재생하는 로컬 서버 (테스트용 대체 서버)
+        :param trades: 업비트 trade 메시지 dict 목록 (trade_timestamp 순)
+        :param port: 0이면 빈 포트를 자동 할당
+        :param speed: 재생 배속 (0이면 대기 없이 바로 전송)
+        :param rebase_time: 첫 체결이 접속 시각이 되도록 타임스탬프를 옮김 (CandleClock 시각 보정이 어긋나지 않도록)
+        """
+        self.trades = trades
+        self.host = host
+        self.port = port
+        self.speed = speed
+        self.rebase_time = rebase_time
+        self._ready = threading.Event()
+        self._thread = None
+        self._loop = None
+        self._stop_future = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait(5)
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        if self._loop is not None and self._stop_future is not None:
+            self._loop.call_soon_threadsafe(lambda: self._stop_future.done() or self._stop_future.set_result(None))
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._serve())
+        finally:
+            self._loop.close()
+
+    async def _serve(self):
+        self._stop_future = self._loop.create_future()
+        async with websockets.serve(self._handle, self.host, self.port) as server:
+            self.port = server.sockets[0].getsockname()[1]
+            self._ready.set()
+            await self._stop_future
+
+    async def _handle(self, ws, path=None):
+        request = json.loads(await ws.recv())
+        codes = set()
+        for item in request:
+            if item.get("type") == "trade":
+                codes.update(item.get("codes", []))
+
+        shift = 0
+        if self.rebase_time and self.trades:
+            shift = int(time.time() * 1000) - self.trades[0]["trade_timestamp"]
+
+        prev_ts = None
+        for trade in self.trades:
+            if codes and trade["code"] not in codes:
+                continue
+            ts = trade["trade_timestamp"]
+            if self.speed > 0 and prev_ts is not None and ts > prev_ts:
+                await asyncio.sleep((ts - prev_ts) / 1000 / self.speed)
+            prev_ts = ts
+            if shift:
+                trade = dict(trade, trade_timestamp=ts + shift, timestamp=trade.get("timestamp", ts) + shift)
+            # 업비트는 바이너리 프레임으로 JSON을 보냄
+            await ws.send(json.dumps(trade).encode("utf-8"))
+        await ws.wait_closed()
@@ -0,0 +1,106 @@
+import asyncio
+import json
+import threading
+import time
+import websockets
+import uuid
+
+UPBIT_WEBSOCKET_URL = "wss://api.upbit.com/websocket/v1"
+
+
+class UpbitTradeStream:
+    def __init__(self, codes: list, on_trade, url: str = UPBIT_WEBSOCKET_URL, clock=None,
+                 on_status=None, reconnect_delay: float = 1.0, max_reconnect_delay: float = 30.0):
+        """
+        업비트 WebSocket 체결(trade) 스트림 클라이언트 — 별도 스레드의 이벤트 루프에서 동작
+        :param codes: 구독할 마켓 코드 목록 (예: ["KRW-BTC"])
+        :param on_trade: on_trade(code, trade_timestamp_ms, price, volume)
+        :param url: WebSocket 주소 (로컬 재생 서버로 바꿔 테스트 가능)
+        :param clock: CandleClock — 메시지의 서버 타임스탬프로 시각 차이를 보정
+        :param on_status: on_status(code, connected: bool) — 연결 상태 변경 알림
+        """
+        self.codes = list(codes)
+        self.on_trade = on_trade
+        self.url = url
+        self.clock = clock
+        self.on_status = on_status
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.connected = False
+        self.last_message_time = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._loop = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(lambda: None)
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    async def run(self):
+        """
+        호출한 쪽 이벤트 루프에서 실행 (start() 대신), 취소하면 연결을 닫고 종료
+        """
+        self._stop.clear()
+        await self._run_forever()
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._run_forever())
+        finally:
+            self._loop.close()
+
+    def _set_connected(self, connected: bool):
+        if self.connected == connected:
+            return
+        self.connected = connected
+        if self.on_status is not None:
+            for code in self.codes:
+                self.on_status(code, connected)
+
+    async def _run_forever(self):
+        delay = self.reconnect_delay
+        while not self._stop.is_set():
+            try:
+                async with websockets.connect(self.url, ping_interval=30) as ws:
+                    await ws.send(json.dumps([
+                        {"ticket": str(uuid.uuid4())},
+                        {"type": "trade", "codes": self.codes, "isOnlyRealtime": True},
+                    ]))
+                    self._set_connected(True)
+                    delay = self.reconnect_delay
+                    while not self._stop.is_set():
+                        try:
+                            message = await asyncio.wait_for(ws.recv(), timeout=1.0)
+                        except asyncio.TimeoutError:
+                            continue
+                        self._handle_message(message)
+            except Exception as e:
+                if not self._stop.is_set():
+                    print(f"[Trade Stream Error] {e} — reconnecting in {delay:.0f}s")
+            finally:
+                self._set_connected(False)
+
+            if self._stop.is_set():
+                break
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def _handle_message(self, message):
+        received = time.time()
+        data = json.loads(message)
+        if data.get("type") != "trade":
+            return
+        self.last_message_time = received
+        if self.clock is not None and "timestamp" in data:
+            self.clock.observe_server_time(data["timestamp"] / 1000, received)
+        self.on_trade(data["code"], int(data["trade_timestamp"]),
+                      float(data["trade_price"]), float(data["trade_volume"]))